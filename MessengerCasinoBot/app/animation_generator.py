@@ -1,13 +1,30 @@
 import os
-from typing import Dict, List, Tuple, Optional
-from PIL import Image, ImageDraw, ImageFont, ImageSequence
-from dataclasses import dataclass, field
+from typing import Dict, List, Tuple, Optional, Sequence
+from PIL import Image, ImageDraw, ImageFont
+from dataclasses import dataclass, field, replace
 from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import glob
 import hashlib
+import multiprocessing
+import threading
 from logger import logger
+from media_encoder import save_image, save_animation
+from resource_cache import FrameCache
 import time
 import uuid
 
+USE_RENDER_POOL = True
+RENDER_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+FRAME_CACHE_MB = 256
+BACKGROUND_LAYER_CACHE_SIZE = 16
+# Glob patterns relative to app/assets, e.g. os.path.join("roulette", "roulette_results", "*.webp")
+PRELOAD_ANIMATION_PATTERNS = [
+    os.path.join("crash", "crash_animation.webp"),
+]
+
 @dataclass
 class GenerationOptions:
     animated: bool = False
@@ -15,7 +32,7 @@ class GenerationOptions:
     font_scale: float = 1.0
     show_win_text: bool = True
     output_format: str = "WEBP"
-    quality: int = 90
+    quality: Optional[int] = None
     frame_duration: int = 100
     last_frame_multiplier: float = 1.0
     show_bet_amount: bool = True
@@ -24,6 +41,8 @@ class GenerationOptions:
     final_frames_start_index: int = -1
     win_text_scale: int = -1
     overlay_position: str = 'bottom'
+    frame_limit: int = -1
+    use_source_durations: bool = False
     
     @classmethod
     def from_kwargs(cls, **kwargs) -> 'GenerationOptions':
@@ -67,6 +86,7 @@ class GenerationRequest:
     game_name: str = "Game"
     output_path: Optional[str] = None
     cache_path: Optional[str] = None
+    base_frames: Optional[Sequence[Image.Image]] = None
     options: GenerationOptions = field(default_factory=GenerationOptions)
     timestamp: datetime = field(default_factory=datetime.now)
     request_id: str = field(default_factory=lambda: hashlib.md5(
@@ -104,7 +124,10 @@ class GenerationRequest:
         return os.path.join(default_dir, filename)
     
     def validate(self) -> Tuple[bool, Optional[str]]:
-        if not os.path.exists(self.animation_path):
+        if self.base_frames is not None:
+            if len(self.base_frames) == 0:
+                return False, "No base frames"
+        elif not os.path.exists(self.animation_path):
             return False, f"Animation path not found: {self.animation_path}"
         if not os.path.exists(self.background_path):
             return False, f"Background path not found: {self.background_path}"
@@ -236,7 +259,24 @@ class AnimationGenerator:
             }
             self.custom_overlay_providers: Dict[str, callable] = {}
             self.results_folder = None
+            self.frame_cache = FrameCache(max_size_mb=FRAME_CACHE_MB)
+            self.background_layers = OrderedDict()
+            self.background_lock = threading.Lock()
             AnimationGenerator._initialized = True
+            if not USE_RENDER_POOL:
+                self.preload_animations()
+
+    def preload_animations(self, patterns: Optional[List[str]] = None) -> int:
+        patterns = PRELOAD_ANIMATION_PATTERNS if patterns is None else patterns
+        if not patterns:
+            return 0
+
+        assets_path = os.path.join(os.path.dirname(__file__), "assets")
+        paths = []
+        for pattern in patterns:
+            paths.extend(sorted(glob.glob(os.path.join(assets_path, pattern))))
+
+        return self.frame_cache.preload(paths)
     
     def register_custom_overlay_provider(self, game_name: str, provider_func: callable):
         self.custom_overlay_providers[game_name] = provider_func
@@ -246,10 +286,74 @@ class AnimationGenerator:
             is_valid, error_msg = request.validate()
             if not is_valid:
                 return None, f"Invalid request: {error_msg}"
-            
-            base_frames = self._load_animation_frames(request.animation_path)
+
+            custom_overlay_dict = self._build_custom_overlay(request)
+
+            if USE_RENDER_POOL and request.base_frames is None:
+                result = RenderService.get_instance().render(request, custom_overlay_dict, self.results_folder)
+                if result is not None:
+                    return result
+
+            return self.render(request, custom_overlay_dict)
+        except Exception as e:
+            return None, f"Animation generation error: {str(e)}"
+
+    def generate_async(self, request: GenerationRequest) -> Future:
+        try:
+            is_valid, error_msg = request.validate()
+            if not is_valid:
+                return self._completed_future((None, f"Invalid request: {error_msg}"))
+
+            custom_overlay_dict = self._build_custom_overlay(request)
+
+            if USE_RENDER_POOL and request.base_frames is None:
+                future = RenderService.get_instance().submit(request, custom_overlay_dict, self.results_folder)
+                if future:
+                    return future
+
+            return self._completed_future(self.render(request, custom_overlay_dict))
+        except Exception as e:
+            return self._completed_future((None, f"Animation generation error: {str(e)}"))
+
+    def _completed_future(self, result) -> Future:
+        future = Future()
+        future.set_result(result)
+        return future
+
+    def _probe_animation(self, request: GenerationRequest) -> Tuple[int, int]:
+        if request.base_frames is not None:
+            return len(request.base_frames), request.base_frames[0].width
+        with Image.open(request.animation_path) as img:
+            return getattr(img, 'n_frames', 1), img.width
+
+    def _build_custom_overlay(self, request: GenerationRequest) -> Optional[Dict]:
+        if request.game_name not in self.custom_overlay_providers:
+            return None
+
+        total_frames, frame_width = self._probe_animation(request)
+        if request.options.frame_limit > 0:
+            total_frames = min(total_frames, request.options.frame_limit)
+        frame_count = len(self._get_frame_indices(total_frames, request.options.animated))
+
+        custom_kwargs = request.options.custom_overlay_kwargs or {}
+        custom_kwargs.update({
+            'total_frames': frame_count,
+            'frame_width': frame_width,
+            'request': request
+        })
+
+        return self.custom_overlay_providers[request.game_name](**custom_kwargs)
+
+    def render(self, request: GenerationRequest, custom_overlay_dict: Optional[Dict] = None) -> Tuple[Optional[str], Optional[str]]:
+        try:
+            base_frames = request.base_frames
+            if base_frames is None:
+                base_frames = self._load_animation_frames(request.animation_path)
             if not base_frames:
                 return None, "Can not load animation frames"
+
+            if request.options.frame_limit > 0:
+                base_frames = base_frames[:request.options.frame_limit]
             
             frame_width = base_frames[0].width if base_frames else 400
 
@@ -264,8 +368,6 @@ class AnimationGenerator:
                 (options.avatar_size, options.avatar_size)
             )
             
-            bg_img = self._load_image(request.background_path)
-            
             colors = self._calculate_colors(request)
             
             win_text_img = None
@@ -280,70 +382,80 @@ class AnimationGenerator:
                 request.user_after, avatar_img, options, frame_width
             ) if avatar_img else None
             
-            custom_overlay_dict = None
-            if request.game_name in self.custom_overlay_providers:
-                custom_kwargs = options.custom_overlay_kwargs or {}
-                custom_kwargs.update({
-                    'total_frames': len(frame_indices),
-                    'frame_width': frame_width,
-                    'request': request
-                })
-                
-                custom_overlay_dict = self.custom_overlay_providers[request.game_name](**custom_kwargs)
+            top_layers = {}
+            frame_repeats = []
+            final_index = len(frame_indices) - 1
             
-            processed_frames = []
-            
-            for i, frame_idx in enumerate(frame_indices):
-                frame = base_frames[frame_idx]
+            for i in range(len(frame_indices)):
+                repeat = 1
+                if options.animated and options.last_frame_multiplier > 1:
+                    if options.final_frames_start_index == -1:
+                        if i == final_index:
+                            repeat = int(options.last_frame_multiplier)
+                    elif i >= options.final_frames_start_index:
+                        repeat = int(options.last_frame_multiplier)
+                frame_repeats.append(max(1, repeat))
+
+            if options.animated and options.use_source_durations:
+                frame_indices, frame_repeats = self._apply_source_durations(
+                    base_frames, frame_indices, frame_repeats
+                )
+                final_index = len(frame_indices) - 1
+
+            def render_frame(i: int) -> Image.Image:
+                frame = base_frames[frame_indices[i]]
                 
-                if options.animated:
-                    if i < len(frame_indices) - 1:
-                        user_overlay = user_overlay_before
-                        show_win_text = False
-                        custom_overlay = custom_overlay_dict.get('before') if custom_overlay_dict else None
-                    else:
-                        user_overlay = user_overlay_after
-                        show_win_text = True
-                        custom_overlay = custom_overlay_dict.get('after') if custom_overlay_dict else None
+                if options.animated and i < final_index:
+                    layer_state = 'before'
+                    user_overlay = user_overlay_before
+                    show_win_text = False
+                    custom_overlay = custom_overlay_dict.get('before') if custom_overlay_dict else None
                 else:
+                    layer_state = 'after'
                     user_overlay = user_overlay_after
                     show_win_text = True
                     custom_overlay = custom_overlay_dict.get('after') if custom_overlay_dict else None
+
+                layer_key = (layer_state, frame.size)
+                if layer_key not in top_layers:
+                    top_layers[layer_key] = self._build_top_layer(
+                        size=frame.size,
+                        user_overlay=user_overlay,
+                        win_text=win_text_img if show_win_text else None,
+                        custom_overlay=custom_overlay,
+                        options=options
+                    )
                 
-                processed_frame = self._process_single_frame(
+                return self._process_single_frame(
                     frame=frame,
-                    user_overlay=user_overlay,
-                    win_text=win_text_img if show_win_text else None,
-                    bg_img=bg_img,
-                    custom_overlay=custom_overlay,
-                    options=options
+                    bg_layer=self._get_background_layer(request.background_path, frame.size),
+                    top_layer=top_layers[layer_key]
                 )
-                
-                processed_frames.append(processed_frame)
-                
-                if options.animated and options.last_frame_multiplier > 1:
-                    if options.final_frames_start_index == -1:
-                        if i == len(frame_indices) - 1:
-                            for _ in range(int(options.last_frame_multiplier) - 1):
-                                processed_frames.append(processed_frame.copy())
-                    else:
-                        if i >= options.final_frames_start_index:
-                            for _ in range(int(options.last_frame_multiplier) - 1):
-                                processed_frames.append(processed_frame.copy())
             
             output_dir = self.results_folder
             
             output_path = request.get_effective_output_path(output_dir)
             
             if options.animated:
-                success = self._save_animation(processed_frames, output_path, options)
+                success = self._save_animation(
+                    FrameStream(len(frame_indices), render_frame),
+                    frame_repeats,
+                    output_path,
+                    options
+                )
             else:
                 success = self._save_static(
-                    processed_frames[-1] if processed_frames else None,
+                    render_frame(final_index) if frame_indices else None,
                     output_path,
                     options
                 )
             
+            cache_stats = self.frame_cache.get_stats()
+            logger.debug(
+                f"[AnimationGenerator] frame_cache hit_rate={cache_stats['hit_rate']:.2f} "
+                f"items={cache_stats['items']} size_mb={cache_stats['size_mb']:.1f}"
+            )
+
             if success:
                 return output_path, None
             else:
@@ -369,20 +481,35 @@ class AnimationGenerator:
         return img
     
     def _load_animation_frames(self, anim_path: str) -> List[Image.Image]:
-        try:
-            frames = []
-            with Image.open(anim_path) as img:
-                if hasattr(img, 'n_frames') and img.n_frames > 1:
-                    for frame in ImageSequence.Iterator(img):
-                        frames.append(frame.copy().convert("RGBA"))
-                else:
-                    frames.append(img.copy().convert("RGBA"))
-            
-            return frames
-        except Exception as e:
-            print(f"Error loading animation {anim_path}: {e}")
-            return []
+        """Returns shared, cached frames; callers must copy a frame before drawing on it."""
+        return self.frame_cache.get_frames(anim_path)
     
+    def _get_source_weights(self, frames: List[Image.Image]) -> List[int]:
+        durations = [frame.info.get('duration') or 0 for frame in frames]
+        step = min((d for d in durations if d > 0), default=0)
+        if not step:
+            return [1] * len(frames)
+        return [max(1, round(d / step)) if d > 0 else 1 for d in durations]
+
+    def _apply_source_durations(self, base_frames: List[Image.Image], frame_indices: List[int],
+                                frame_repeats: List[int]) -> Tuple[List[int], List[int]]:
+        """Spreads held source frames over output steps; a held final frame switches overlay only at its end."""
+        weights = self._get_source_weights(base_frames)
+        indices = []
+        repeats = []
+        final_index = len(frame_indices) - 1
+
+        for i, (index, repeat) in enumerate(zip(frame_indices, frame_repeats)):
+            weight = weights[index]
+            if i == final_index and weight > 1:
+                indices.extend([index, index])
+                repeats.extend([weight - 1, repeat])
+            else:
+                indices.append(index)
+                repeats.append(weight - 1 + repeat)
+
+        return indices, repeats
+
     def _get_frame_indices(self, total_frames: int, animated: bool) -> List[int]:
         if total_frames == 0:
             return []
@@ -666,40 +793,59 @@ class AnimationGenerator:
             shadow_offset=(2, 2)
         )
 
-    def _process_single_frame(self, frame: Image.Image, user_overlay: Optional[Dict],
-                            win_text: Optional[Image.Image], bg_img: Optional[Image.Image],
-                            custom_overlay: Optional[Dict], options: GenerationOptions) -> Image.Image:
-        result = frame.copy()
-        
-        if bg_img:
-            try:
-                bg_resized = bg_img.resize(result.size, Image.Resampling.LANCZOS)
-                result = Image.alpha_composite(bg_resized.convert("RGBA"), result)
-            except Exception as e:
-                print(f"Error applying background: {e}")
+    def _get_background_layer(self, bg_path: str, size: Tuple[int, int]) -> Optional[Image.Image]:
+        if not bg_path or not os.path.exists(bg_path):
+            return None
+
+        key = (os.path.abspath(bg_path), os.stat(bg_path).st_mtime, size)
+        with self.background_lock:
+            if key in self.background_layers:
+                self.background_layers.move_to_end(key)
+                return self.background_layers[key]
+
+        bg_img = self._load_image(bg_path)
+        if not bg_img:
+            return None
+
+        try:
+            bg_layer = bg_img.resize(size, Image.Resampling.LANCZOS)
+        except Exception as e:
+            logger.error(f"Error applying background: {e}")
+            return None
+
+        with self.background_lock:
+            self.background_layers[key] = bg_layer
+            while len(self.background_layers) > BACKGROUND_LAYER_CACHE_SIZE:
+                self.background_layers.popitem(last=False)
+        return bg_layer
+
+    def _build_top_layer(self, size: Tuple[int, int], user_overlay: Optional[Dict],
+                         win_text: Optional[Image.Image], custom_overlay: Optional[Dict],
+                         options: GenerationOptions) -> Optional[Tuple[Image.Image, Tuple[int, int]]]:
+        layer = Image.new('RGBA', size, (0, 0, 0, 0))
         
         if custom_overlay and custom_overlay.get('image'):
             custom_img = custom_overlay['image']
             custom_pos = custom_overlay.get('position', (0, 0))
             
             if custom_overlay.get('per_frame', True) or options.animated:
-                result.alpha_composite(custom_img, custom_pos)
+                layer.alpha_composite(custom_img, custom_pos)
         
         if win_text:
-            win_x = (result.width - win_text.width) // 2
+            win_x = (layer.width - win_text.width) // 2
             if options.win_text_height > 0:
                 win_y = options.win_text_height
             else:
                 win_y = 20
             
-            result.alpha_composite(win_text, (win_x, win_y))
+            layer.alpha_composite(win_text, (win_x, win_y))
         
         if user_overlay and user_overlay.get('image'):
             overlay_img = user_overlay['image']
             
-            if overlay_img.width != result.width:
-                scale_factor = result.width / overlay_img.width
-                new_width = result.width
+            if overlay_img.width != layer.width:
+                scale_factor = layer.width / overlay_img.width
+                new_width = layer.width
                 new_height = int(overlay_img.height * scale_factor)
                 overlay_img = overlay_img.resize((new_width, new_height), Image.Resampling.LANCZOS)
             
@@ -708,55 +854,82 @@ class AnimationGenerator:
             if options.overlay_position == 'top':
                 overlay_y = 0
             else:
-                overlay_y = result.height - overlay_img.height
+                overlay_y = layer.height - overlay_img.height
             
-            result.alpha_composite(overlay_img, (overlay_x, overlay_y))
+            layer.alpha_composite(overlay_img, (overlay_x, overlay_y))
+
+        bbox = layer.getchannel('A').getbbox()
+        if not bbox:
+            return None
+        return layer.crop(bbox), (bbox[0], bbox[1])
+
+    def _process_single_frame(self, frame: Image.Image, bg_layer: Optional[Image.Image],
+                              top_layer: Optional[Tuple[Image.Image, Tuple[int, int]]]) -> Image.Image:
+        if bg_layer:
+            result = Image.alpha_composite(bg_layer, frame)
+        else:
+            result = frame.copy()
+        
+        if top_layer:
+            top_img, top_pos = top_layer
+            result.alpha_composite(top_img, top_pos)
         
         return result
-    def _save_animation(self, frames: List[Image.Image], output_path: str,
-                    options: GenerationOptions) -> bool:
-        if not frames:
-            return False
+
+    def _get_frame_durations(self, frame_count: int, options: GenerationOptions) -> List[int]:
+        durations_to_use = []
         
-        try:
-            durations_to_use = []
-            
-            if options.last_frame_multiplier <= 1:
-                durations_to_use = [options.frame_duration] * len(frames)
+        if options.last_frame_multiplier <= 1:
+            durations_to_use = [options.frame_duration] * frame_count
+        else:
+            if options.final_frames_start_index == -1:
+                for i in range(frame_count):
+                    if i == frame_count - 1:
+                        durations_to_use.append(int(options.frame_duration * options.last_frame_multiplier))
+                    else:
+                        durations_to_use.append(options.frame_duration)
             else:
-                if options.final_frames_start_index == -1:
-                    for i in range(len(frames)):
-                        if i == len(frames) - 1:
-                            durations_to_use.append(int(options.frame_duration * options.last_frame_multiplier))
-                        else:
-                            durations_to_use.append(options.frame_duration)
-                else:
+                
+                multiplier = int(options.last_frame_multiplier)
+                start_index = options.final_frames_start_index
+                
+                if start_index >= frame_count:
+                    start_index = frame_count - 1
+                
+                for i in range(frame_count):
+                    duration = options.frame_duration
                     
-                    multiplier = int(options.last_frame_multiplier)
-                    start_index = options.final_frames_start_index
+                    if i >= start_index:
+                        pos_in_final = i - start_index
+                        
+                        if pos_in_final % multiplier == 0:
+                            duration = int(options.frame_duration * options.last_frame_multiplier)
                     
-                    if start_index >= len(frames):
-                        start_index = len(frames) - 1
+                    if i == frame_count - 1:
+                        duration = int(options.frame_duration * 10 * options.last_frame_multiplier)
                     
-                    for i in range(len(frames)):
-                        duration = options.frame_duration
-                        
-                        if i >= start_index:
-                            pos_in_final = i - start_index
-                            
-                            if pos_in_final % multiplier == 0:
-                                duration = int(options.frame_duration * options.last_frame_multiplier)
-                        
-                        if i == len(frames) - 1:
-                            duration = int(options.frame_duration * 10 * options.last_frame_multiplier)
-                        
-                        durations_to_use.append(duration)
+                    durations_to_use.append(duration)
+        
+        return durations_to_use
+
+    def _save_animation(self, frames: 'FrameStream', frame_repeats: List[int], output_path: str,
+                    options: GenerationOptions) -> bool:
+        if not frames or not frames.n_frames or not frame_repeats:
+            return False
+        
+        try:
+            expanded_durations = self._get_frame_durations(sum(frame_repeats), options)
+            
+            durations_to_use = []
+            position = 0
+            for repeat in frame_repeats:
+                durations_to_use.append(sum(expanded_durations[position:position + repeat]))
+                position += repeat
             
-            frames[0].save(
+            save_animation(
+                frames,
                 output_path,
-                format='WEBP',
-                save_all=True,
-                append_images=frames[1:],
+                "animation",
                 duration=durations_to_use,
                 loop=0,
                 quality=options.quality
@@ -772,12 +945,162 @@ class AnimationGenerator:
             return False
         
         try:
-            frame.save(
+            save_image(
+                frame,
                 output_path,
+                "card",
                 format=options.output_format,
                 quality=options.quality
             )
             return True
         except Exception as e:
             logger.error(f"Error saving static image: {e}")
-            return False
\ No newline at end of file
+            return False
+
+
+class FrameStream(Image.Image):
+    """Multi-frame image that renders each frame on seek, so encoders never hold the full sequence."""
+
+    def __init__(self, frame_count: int, render_frame: callable):
+        super().__init__()
+        self.frame_count = frame_count
+        self.render_frame = render_frame
+        self.position = -1
+        self.seek(0)
+
+    @property
+    def n_frames(self) -> int:
+        return self.frame_count
+
+    @property
+    def is_animated(self) -> bool:
+        return self.frame_count > 1
+
+    def seek(self, frame: int):
+        if frame == self.position:
+            return
+        if not 0 <= frame < self.frame_count:
+            raise EOFError("attempt to seek outside sequence")
+
+        rendered = self.render_frame(frame)
+        self.im = rendered.im
+        self._size = rendered.size
+        if hasattr(rendered, '_mode'):
+            self._mode = rendered.mode
+        else:
+            self.mode = rendered.mode
+        self.position = frame
+
+    def tell(self) -> int:
+        return self.position
+
+
+def _init_render_worker():
+    AnimationGenerator().preload_animations()
+
+
+def _render_in_worker(request: GenerationRequest, custom_overlay_dict: Optional[Dict],
+                      results_folder: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    generator = AnimationGenerator()
+    generator.results_folder = results_folder
+    return generator.render(request, custom_overlay_dict)
+
+
+class RenderService:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_workers: int = RENDER_WORKERS):
+        self.max_workers = max_workers
+        self.executor = None
+        self.lock = threading.Lock()
+        self.stats = {'submitted': 0, 'completed': 0, 'fallbacks': 0, 'rebuilds': 0}
+
+    @classmethod
+    def get_instance(cls) -> 'RenderService':
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self.lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_render_worker
+                )
+                logger.info(f"[RenderService] Started render pool with {self.max_workers} workers")
+            return self.executor
+
+    def _reset_executor(self, broken_executor: Optional[ProcessPoolExecutor] = None):
+        with self.lock:
+            if self.executor is None:
+                return
+            if broken_executor is not None and broken_executor is not self.executor:
+                return
+            self.executor.shutdown(wait=False)
+            self.executor = None
+            if broken_executor is not None:
+                self.stats['rebuilds'] += 1
+
+    def submit(self, request: GenerationRequest, custom_overlay_dict: Optional[Dict],
+               results_folder: Optional[str]) -> Optional[Future]:
+        return self._submit(request, custom_overlay_dict, results_folder)[0]
+
+    def _submit(self, request: GenerationRequest, custom_overlay_dict: Optional[Dict],
+                results_folder: Optional[str]) -> Tuple[Optional[Future], ProcessPoolExecutor]:
+        shipped_request = replace(request, options=replace(request.options, custom_overlay_kwargs=None))
+        executor = self._get_executor()
+        try:
+            future = executor.submit(
+                _render_in_worker, shipped_request, custom_overlay_dict, results_folder
+            )
+        except BrokenProcessPool as e:
+            logger.error(f"[RenderService] Render pool is broken, rebuilding it: {e}")
+            self.stats['fallbacks'] += 1
+            self._reset_executor(executor)
+            return None, executor
+        except Exception as e:
+            logger.error(f"[RenderService] Submit failed, rendering in-process: {e}")
+            self.stats['fallbacks'] += 1
+            return None, executor
+
+        self.stats['submitted'] += 1
+        return future, executor
+
+    def render(self, request: GenerationRequest, custom_overlay_dict: Optional[Dict],
+               results_folder: Optional[str]) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        render_start = time.perf_counter()
+        future, executor = self._submit(request, custom_overlay_dict, results_folder)
+        if future is None:
+            return None
+
+        try:
+            result = future.result()
+        except BrokenProcessPool as e:
+            logger.error(f"[RenderService] Render pool is broken, rebuilding it: {e}")
+            self.stats['fallbacks'] += 1
+            self._reset_executor(executor)
+            return None
+        except Exception as e:
+            logger.error(f"[RenderService] Worker failed, rendering in-process: {e}")
+            self.stats['fallbacks'] += 1
+            return None
+
+        self.stats['completed'] += 1
+        logger.debug(
+            f"[RenderService] {request.game_name} rendered in "
+            f"{round((time.perf_counter() - render_start) * 1000, 1)}ms"
+        )
+        return result
+
+    def shutdown(self):
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = None
+
+    def get_stats(self) -> Dict:
+        return {'workers': self.max_workers, **self.stats}
@@ -1,18 +1,52 @@
 import json
+import copy
+import marshal
+import shutil
+import bisect
 import threading
 import time
 import os
 from datetime import datetime, timedelta
 from logger import logger
 from message_handler import get_last_message_time
+from cache_journal import CacheJournal, CacheLock
+from sqlite_store import SqliteCacheStore
+from shard_store import ShardStore
+from leaderboard import Leaderboard, balance_key, level_key
+from send_queue import with_priority, PRIORITY_COSMETIC
+
+STORAGE_BACKEND = "journal"
+JOURNAL_FSYNC = True
+JOURNAL_COMPACT_ENTRIES = 500
+JOURNAL_COMPACT_SECONDS = 60
+SHARD_FULL_FLUSH_SECONDS = 3600
+STORE_FULL_SYNC_SECONDS = 300
+DEFAULT_AVATAR_PATH = os.path.join("assets", "avatars", "default-avatar.png")
+DEFAULT_BACKGROUND_PATH = os.path.join("assets", "backgrounds", "default-bg.png")
 
 class AppCache:
     def __init__(self, backup_file="cache_backup.json", autosave_interval=60):
         self.backup_file = backup_file
         self.backup_dir = "backups"
-        self.lock = threading.Lock()
+        self.lock = CacheLock(self._flush_writes)
+        self.compaction_lock = threading.Lock()
         self.autosave_interval = autosave_interval
         self.last_daily_backup = None
+        self.last_compaction = time.time()
+        self.snapshot_seq = 0
+        self.persist_stats = {'snapshots': 0, 'lock_hold_ms_last': 0.0, 'lock_hold_ms_max': 0.0, 'lock_hold_ms_total': 0.0, 'write_ms_last': 0.0}
+        self.journal = None
+        self.store = None
+        self.shards = None
+        self.dirty_users = set()
+        self.dirty_globals = False
+        self.last_full_flush = 0
+
+        if STORAGE_BACKEND == "sqlite":
+            self.store = SqliteCacheStore(f"{os.path.splitext(backup_file)[0]}.db")
+        else:
+            self.journal = CacheJournal(f"{os.path.splitext(backup_file)[0]}.journal", fsync=JOURNAL_FSYNC)
+            self.shards = ShardStore(f"{os.path.splitext(backup_file)[0]}_shards")
 
         self.users = {}
         self.games = {}
@@ -22,14 +56,38 @@ class AppCache:
         self.auctions = []
         
         self.active_math_challenge = None
+        
+        self.identity_index = {}
+        self.name_index = {}
+        self.name_lower_sorted = []
+        self.indexed_keys = {}
+        self.next_user_id = 1
+        self.index_stats = {'lookups': 0, 'stale': 0, 'rebuilds': 0}
+        self.leaderboards = {"balance": Leaderboard(balance_key), "level": Leaderboard(level_key)}
+        self.leaderboard_stats = {'updates': 0, 'reads': 0, 'repairs': 0}
 
         os.makedirs(self.backup_dir, exist_ok=True)
 
-        self._load_backup()
+        if self.store:
+            self._load_store()
+        else:
+            self._load_backup()
+            self._replay_journal()
+            self.journal.open()
+
+        self._rebuild_user_indexes()
 
         threading.Thread(target=self._autosave_loop, daemon=True).start()
 
     def _load_backup(self):
+        if self.shards.exists():
+            try:
+                self._apply_loaded_data(self.shards.load())
+                self.last_full_flush = time.time()
+            except Exception as e:
+                logger.critical(f"[AppCache] Shard load error: {e}", exc_info=True)
+            return
+
         if not os.path.exists(self.backup_file):
             logger.info(f"[AppCache] No backup file found at {self.backup_file}")
             return
@@ -37,93 +95,380 @@ class AppCache:
         try:
             with open(self.backup_file, "r", encoding="utf-8") as f:
                 data = json.load(f)
-                
-                self.users = data.get("users", {})
-                
-                for user_id, user_data in self.users.items():
-                    if "avatar_path" in user_data and "avatar" not in user_data:
-                        old_path = user_data["avatar_path"]
-                        user_data["avatar"] = os.path.basename(old_path) if old_path else "default-avatar.png"
-                        del user_data["avatar_path"]
-                    
-                    if "background_path" in user_data and "background" not in user_data:
-                        old_path = user_data["background_path"]
-                        user_data["background"] = os.path.basename(old_path) if old_path else "default-bg.png"
-                        del user_data["background_path"]
-                    
-                    if "avatar_url" not in user_data:
-                        user_data["avatar_url"] = None
-                    
-                    if "is_admin" not in user_data:
-                        user_data["is_admin"] = False
-                    
-                    if "backgrounds" not in user_data:
-                        user_data["backgrounds"] = ["default-bg.png"]
-                    
-                    if "avatars" not in user_data:
-                        user_data["avatars"] = ["default-avatar.png"]
-                    
-                    if "purchase_history" not in user_data:
-                        user_data["purchase_history"] = []
-                
-                self.games = data.get("games", {})
-                
-                self.settings = data.get("settings", {})
-                
-                market_data = data.get("market_items", [])
-                self.auctions = data.get("auctions", [])
-                
-                converted_items = []
-                for item in market_data:
-                    if isinstance(item, dict):
-                        if "type" in item and "file" in item:
-                            if "id" not in item:
-                                item["id"] = f"market_{len(converted_items)}"
-                            if "listed_at" not in item:
-                                item["listed_at"] = time.time()
-                            if "status" not in item:
-                                item["status"] = "for_sale"
-                            
-                            converted_items.append(item)
-                        elif "file" in item and "type" not in item:
-                            converted_items.append({
-                                "type": "background",
-                                "file": item.get("file", ""),
-                                "price": item.get("price", 100),
-                                "seller_id": item.get("seller_id"),
-                                "seller_name": item.get("seller_name", "Unknown"),
-                                "listed_at": item.get("listed_at", time.time()),
-                                "status": "for_sale",
-                                "id": f"market_{len(converted_items)}"
-                            })
-                    elif isinstance(item, str):
-                        converted_items.append({
-                            "type": "background",
-                            "file": item,
-                            "price": 100,
-                            "seller_id": None,
-                            "seller_name": "Unknown",
-                            "listed_at": time.time(),
-                            "status": "for_sale",
-                            "id": f"market_{len(converted_items)}"
-                        })
-                
-                self.market_items = converted_items
-                
-                if "ranking_leader_record" not in self.settings:
-                    old_money_record = self.settings.get("money_leader_record")
-                    if old_money_record and "user_id" in old_money_record:
-                        self.settings["ranking_leader_record"] = old_money_record
-                
-                self.active_math_challenge = data.get("active_math_challenge")
-                if self.active_math_challenge is None:
-                    self.active_math_challenge = None
-                
-                logger.info(f"[AppCache] Cache loaded: {len(self.users)} users, {len(self.games)} game states, {len(self.market_items)} market items, {len(self.auctions)} auctions")
+
+            self._apply_loaded_data(data)
+            logger.info(f"[AppCache] Legacy snapshot loaded, all shards will be written on the next flush")
 
         except Exception as e:
             logger.critical(f"[AppCache] Cache load error: {e}", exc_info=True)
 
+    def _load_store(self):
+        try:
+            if self.store.is_empty() and os.path.exists(self.backup_file):
+                logger.info(f"[AppCache] Migrating {self.backup_file} into {self.store.db_file}")
+                with open(self.backup_file, "r", encoding="utf-8") as f:
+                    self._apply_loaded_data(json.load(f))
+                self.store.import_data(self._snapshot_data())
+                return
+
+            self._apply_loaded_data(self.store.load())
+
+        except Exception as e:
+            logger.critical(f"[AppCache] Store load error: {e}", exc_info=True)
+
+    def _snapshot_data(self):
+        return {
+            "users": self.users,
+            "games": self.games,
+            "settings": self.settings,
+            "market_items": self.market_items,
+            "auctions": self.auctions,
+            "active_math_challenge": self.active_math_challenge
+        }
+
+    def _capture_snapshot(self, dirty_users, dirty_globals):
+        data = {
+            "users": {
+                uid: {"user": self.users.get(uid), "games": self.games.get(uid, {})}
+                for uid in dirty_users
+            },
+            "globals": {
+                "settings": self.settings,
+                "market_items": self.market_items,
+                "auctions": self.auctions,
+                "active_math_challenge": self.active_math_challenge
+            } if dirty_globals else None
+        }
+        try:
+            return marshal.dumps(data)
+        except ValueError:
+            return copy.deepcopy(data)
+
+    def _materialize_snapshot(self, captured):
+        if isinstance(captured, bytes):
+            return marshal.loads(captured)
+        return captured
+
+    def _record_lock_hold(self, started):
+        hold_ms = (time.perf_counter() - started) * 1000
+        self.persist_stats['snapshots'] += 1
+        self.persist_stats['lock_hold_ms_last'] = hold_ms
+        self.persist_stats['lock_hold_ms_max'] = max(self.persist_stats['lock_hold_ms_max'], hold_ms)
+        self.persist_stats['lock_hold_ms_total'] += hold_ms
+        return hold_ms
+
+    def get_persistence_stats(self):
+        stats = {
+            'backend': STORAGE_BACKEND,
+            'lock_hold_ms_avg': self.persist_stats['lock_hold_ms_total'] / max(1, self.persist_stats['snapshots']),
+            **self.persist_stats
+        }
+        if self.journal:
+            stats['journal'] = self.journal.get_stats()
+            stats['shards'] = self.shards.get_stats()
+            stats['dirty_users'] = len(self.dirty_users)
+        if self.store:
+            stats['store'] = self.store.get_stats()
+        return stats
+
+    def _apply_loaded_data(self, data):
+        self.users = data.get("users", {})
+        
+        for user_id, user_data in self.users.items():
+            if "avatar_path" in user_data and "avatar" not in user_data:
+                old_path = user_data["avatar_path"]
+                user_data["avatar"] = os.path.basename(old_path) if old_path else "default-avatar.png"
+                del user_data["avatar_path"]
+            
+            if "background_path" in user_data and "background" not in user_data:
+                old_path = user_data["background_path"]
+                user_data["background"] = os.path.basename(old_path) if old_path else "default-bg.png"
+                del user_data["background_path"]
+            
+            if "avatar_url" not in user_data:
+                user_data["avatar_url"] = None
+            
+            if "is_admin" not in user_data:
+                user_data["is_admin"] = False
+            
+            if "backgrounds" not in user_data:
+                user_data["backgrounds"] = ["default-bg.png"]
+            
+            if "avatars" not in user_data:
+                user_data["avatars"] = ["default-avatar.png"]
+            
+            if "purchase_history" not in user_data:
+                user_data["purchase_history"] = []
+        
+        self.games = data.get("games", {})
+        
+        self.settings = data.get("settings", {})
+        
+        market_data = data.get("market_items", [])
+        self.auctions = data.get("auctions", [])
+        
+        converted_items = []
+        for item in market_data:
+            if isinstance(item, dict):
+                if "type" in item and "file" in item:
+                    if "id" not in item:
+                        item["id"] = f"market_{len(converted_items)}"
+                    if "listed_at" not in item:
+                        item["listed_at"] = time.time()
+                    if "status" not in item:
+                        item["status"] = "for_sale"
+                    
+                    converted_items.append(item)
+                elif "file" in item and "type" not in item:
+                    converted_items.append({
+                        "type": "background",
+                        "file": item.get("file", ""),
+                        "price": item.get("price", 100),
+                        "seller_id": item.get("seller_id"),
+                        "seller_name": item.get("seller_name", "Unknown"),
+                        "listed_at": item.get("listed_at", time.time()),
+                        "status": "for_sale",
+                        "id": f"market_{len(converted_items)}"
+                    })
+            elif isinstance(item, str):
+                converted_items.append({
+                    "type": "background",
+                    "file": item,
+                    "price": 100,
+                    "seller_id": None,
+                    "seller_name": "Unknown",
+                    "listed_at": time.time(),
+                    "status": "for_sale",
+                    "id": f"market_{len(converted_items)}"
+                })
+        
+        self.market_items = converted_items
+        
+        if "ranking_leader_record" not in self.settings:
+            old_money_record = self.settings.get("money_leader_record")
+            if old_money_record and "user_id" in old_money_record:
+                self.settings["ranking_leader_record"] = old_money_record
+        
+        self.active_math_challenge = data.get("active_math_challenge")
+        if self.active_math_challenge is None:
+            self.active_math_challenge = None
+        
+        self.snapshot_seq = data.get("journal_seq", 0)
+        
+        logger.info(f"[AppCache] Cache loaded: {len(self.users)} users, {len(self.games)} game states, {len(self.market_items)} market items, {len(self.auctions)} auctions")
+
+    def _replay_journal(self):
+        try:
+            entries = self.journal.replay(after_seq=self.snapshot_seq)
+            for entry in entries:
+                self._apply_journal_entry(entry)
+            if entries:
+                logger.info(f"[AppCache] Replayed {len(entries)} journal entries after snapshot seq {self.snapshot_seq}")
+        except Exception as e:
+            logger.critical(f"[AppCache] Journal replay error: {e}", exc_info=True)
+
+    def _apply_journal_entry(self, entry):
+        op = entry.get("op")
+        key = entry.get("key")
+        value = entry.get("value")
+        
+        self._mark_dirty(op, key)
+        
+        if op == "user":
+            self.users[key] = value
+        elif op == "game":
+            self.games.setdefault(key[0], {})[key[1]] = value
+        elif op == "game_delete":
+            self.games.get(key[0], {}).pop(key[1], None)
+        elif op == "setting":
+            self.settings[key] = value
+        elif op == "market_items":
+            self.market_items = value
+        elif op == "auctions":
+            self.auctions = value
+        elif op == "math_challenge":
+            self.active_math_challenge = value
+        else:
+            logger.warning(f"[AppCache] Unknown journal op: {op}")
+
+    def _mark_dirty(self, op, key):
+        if op == "user":
+            self.dirty_users.add(key)
+        elif op in ("game", "game_delete"):
+            self.dirty_users.add(key[0])
+        else:
+            self.dirty_globals = True
+
+    def _journal(self, op, key=None, value=None):
+        if self.store:
+            self.store.append(op, key, value)
+        else:
+            self._mark_dirty(op, key)
+            self.journal.append(op, key, value)
+        self.lock.mark_queued()
+
+    def _flush_writes(self):
+        if self.store:
+            self.store.flush()
+        elif self.journal:
+            self.journal.flush()
+
+    def _journal_user(self, uid):
+        self._index_user(uid)
+        self._update_leaderboards(uid)
+        self._journal("user", uid, self.users.get(uid))
+
+    def _rebuild_user_indexes(self):
+        with self.lock:
+            self.identity_index = {}
+            self.name_index = {}
+            self.name_lower_sorted = []
+            self.indexed_keys = {}
+            self.next_user_id = 1
+            for leaderboard in self.leaderboards.values():
+                leaderboard.clear()
+            for uid in self.users:
+                self._index_user(uid)
+                self._update_leaderboards(uid)
+            self.index_stats['rebuilds'] += 1
+
+    def _index_user(self, uid):
+        user = self.users.get(uid)
+        new_key = (user.get("name"), user.get("avatar_url")) if isinstance(user, dict) else None
+        old_key = self.indexed_keys.get(uid)
+
+        try:
+            self.next_user_id = max(self.next_user_id, int(uid) + 1)
+        except ValueError:
+            pass
+
+        if new_key == old_key:
+            return
+
+        if old_key:
+            name, avatar_url = old_key
+            self.identity_index.get(old_key, {}).pop(uid, None)
+            if not self.identity_index.get(old_key):
+                self.identity_index.pop(old_key, None)
+            self.name_index.get(name, {}).pop(uid, None)
+            if not self.name_index.get(name):
+                self.name_index.pop(name, None)
+            if name:
+                entry = (name.lower(), uid)
+                position = bisect.bisect_left(self.name_lower_sorted, entry)
+                if position < len(self.name_lower_sorted) and self.name_lower_sorted[position] == entry:
+                    del self.name_lower_sorted[position]
+
+        if new_key:
+            name, avatar_url = new_key
+            self.identity_index.setdefault(new_key, {})[uid] = None
+            self.name_index.setdefault(name, {})[uid] = None
+            if name:
+                bisect.insort(self.name_lower_sorted, (name.lower(), uid))
+            self.indexed_keys[uid] = new_key
+        else:
+            self.indexed_keys.pop(uid, None)
+
+    def _indexed_user_matches(self, uid, name, avatar_url=None):
+        user = self.users.get(uid)
+        if not isinstance(user, dict) or user.get("name") != name:
+            return False
+        return avatar_url is None or user.get("avatar_url") == avatar_url
+
+    def find_user_by_identity(self, name, avatar_url):
+        with self.lock:
+            self.index_stats['lookups'] += 1
+            for uid in self.identity_index.get((name, avatar_url), {}):
+                if self._indexed_user_matches(uid, name, avatar_url):
+                    return uid, self.users[uid]
+                self.index_stats['stale'] += 1
+            return None, None
+
+    def find_users_by_name(self, name):
+        with self.lock:
+            self.index_stats['lookups'] += 1
+            return [
+                (uid, self.users[uid])
+                for uid in self.name_index.get(name, {})
+                if self._indexed_user_matches(uid, name)
+            ]
+
+    def find_users_by_name_prefix(self, prefix):
+        prefix = prefix.lower()
+        exact_matches = []
+        partial_matches = []
+
+        with self.lock:
+            self.index_stats['lookups'] += 1
+            position = bisect.bisect_left(self.name_lower_sorted, (prefix,))
+            while position < len(self.name_lower_sorted):
+                name_lower, uid = self.name_lower_sorted[position]
+                if not name_lower.startswith(prefix):
+                    break
+                user = self.users.get(uid)
+                if isinstance(user, dict) and (user.get("name") or "").lower() == name_lower:
+                    if name_lower == prefix:
+                        exact_matches.append((uid, user))
+                    else:
+                        partial_matches.append((uid, user))
+                position += 1
+
+        return exact_matches + partial_matches
+
+    def allocate_user_id(self):
+        with self.lock:
+            while str(self.next_user_id) in self.users:
+                self.next_user_id += 1
+            user_id = str(self.next_user_id)
+            self.next_user_id += 1
+            return user_id
+
+    def get_index_stats(self):
+        with self.lock:
+            return {
+                'identities': len(self.identity_index),
+                'names': len(self.name_index),
+                'next_user_id': self.next_user_id,
+                'leaderboards': {name: len(leaderboard) for name, leaderboard in self.leaderboards.items()},
+                'leaderboard_stats': dict(self.leaderboard_stats),
+                **self.index_stats
+            }
+
+    def _update_leaderboards(self, uid):
+        user = self.users.get(uid)
+        changed = False
+        for leaderboard in self.leaderboards.values():
+            changed = leaderboard.update(uid, user) or changed
+        if changed:
+            self.leaderboard_stats['updates'] += 1
+        return changed
+
+    def get_leaderboard(self, ranking_type="balance", offset=0, limit=None):
+        leaderboard = self.leaderboards.get(ranking_type, self.leaderboards["balance"])
+
+        with self.lock:
+            self.leaderboard_stats['reads'] += 1
+            for _ in range(3):
+                user_ids = leaderboard.slice(offset, limit)
+                stale = [uid for uid in user_ids if self._update_leaderboards(uid)]
+                if not stale:
+                    break
+                self.leaderboard_stats['repairs'] += len(stale)
+            return [(uid, self.users[uid]) for uid in user_ids if uid in self.users]
+
+    def get_leaderboard_rank(self, ranking_type, user_id):
+        leaderboard = self.leaderboards.get(ranking_type, self.leaderboards["balance"])
+
+        with self.lock:
+            uid = str(user_id)
+            if self._update_leaderboards(uid):
+                self.leaderboard_stats['repairs'] += 1
+            return leaderboard.rank(uid)
+
+    def get_leaderboard_size(self, ranking_type="balance"):
+        with self.lock:
+            return len(self.leaderboards.get(ranking_type, self.leaderboards["balance"]))
+
     def _autosave_loop(self):
         while True:
             time.sleep(self.autosave_interval)
@@ -132,9 +477,20 @@ class AppCache:
             if time_diff > (self.autosave_interval * 1.5):
                 continue
             else:
-                self.save_to_disk()
+                if self._should_compact():
+                    self.save_to_disk()
                 self._check_daily_backup()
 
+    def _should_compact(self):
+        if self.store:
+            return time.time() - self.last_full_flush >= STORE_FULL_SYNC_SECONDS
+        if time.time() - self.last_full_flush >= SHARD_FULL_FLUSH_SECONDS:
+            return True
+        pending = self.journal.pending
+        if pending >= JOURNAL_COMPACT_ENTRIES:
+            return True
+        return pending > 0 and time.time() - self.last_compaction >= JOURNAL_COMPACT_SECONDS
+
     def _check_daily_backup(self):
         now = datetime.now()
         
@@ -145,26 +501,30 @@ class AppCache:
             self.last_daily_backup = now
 
     def _create_daily_backup(self):
-        try:
-            with self.lock:
+        if self.store:
+            try:
                 date_str = datetime.now().strftime("%Y-%m-%d")
-                backup_filename = f"cache_backup_{date_str}.json"
-                backup_path = os.path.join(self.backup_dir, backup_filename)
-                
-                data = {
-                    "users": self.users,
-                    "games": self.games,
-                    "settings": self.settings,
-                    "market_items": self.market_items,
-                    "auctions": self.auctions,
-                }
-                
-                with open(backup_path, "w", encoding="utf-8") as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
-                
-                logger.info(f"[AppCache] Daily backup saved: {len(self.market_items)} market items, {len(self.auctions)} auctions")
-
+                backup_path = os.path.join(self.backup_dir, f"cache_backup_{date_str}.db")
+                self.store.backup(backup_path)
+                logger.info(f"[AppCache] Daily backup saved: {backup_path}")
                 self._cleanup_old_backups()
+            except Exception as e:
+                logger.critical(f"[AppCache] Daily backup error: {e}")
+            return
+
+        try:
+            date_str = datetime.now().strftime("%Y-%m-%d")
+            backup_path = os.path.join(self.backup_dir, f"cache_backup_{date_str}")
+            
+            if not self.save_to_disk():
+                logger.critical(f"[AppCache] Daily backup skipped, shard flush failed")
+                return
+            
+            self.shards.link_to(backup_path)
+            
+            logger.info(f"[AppCache] Daily backup saved: {backup_path}")
+
+            self._cleanup_old_backups()
                 
         except Exception as e:
             logger.critical(f"[AppCache] Daily backup error: {e}")
@@ -173,13 +533,17 @@ class AppCache:
         try:
             now = datetime.now()
             for filename in os.listdir(self.backup_dir):
-                if filename.startswith("cache_backup_") and filename.endswith(".json"):
-                    date_str = filename[13:-5]
+                file_path = os.path.join(self.backup_dir, filename)
+                is_dir = os.path.isdir(file_path)
+                if filename.startswith("cache_backup_") and (is_dir or filename.endswith((".json", ".db"))):
+                    date_str = filename[13:] if is_dir else os.path.splitext(filename)[0][13:]
                     try:
                         file_date = datetime.strptime(date_str, "%Y-%m-%d")
                         if (now - file_date) > timedelta(days=keep_days):
-                            file_path = os.path.join(self.backup_dir, filename)
-                            os.remove(file_path)
+                            if is_dir:
+                                shutil.rmtree(file_path)
+                            else:
+                                os.remove(file_path)
                     except ValueError:
                         continue
             logger.info(f"[AppCache] Backup cleanup completed")
@@ -187,23 +551,73 @@ class AppCache:
             logger.error(f"[AppCache] Backup cleanup error: {e}", exc_info=True)
 
     def save_to_disk(self):
-        with self.lock:
-            try:
-                data = {
-                    "users": self.users,
-                    "games": self.games,
-                    "settings": self.settings,
-                    "market_items": self.market_items,
-                    "auctions": self.auctions,
-                    "active_math_challenge": self.active_math_challenge
-                }
-                with open(self.backup_file, "w", encoding="utf-8") as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
+        if self.store:
+            return self._sync_store()
+
+        with self.compaction_lock:
+            with self.lock:
+                full_flush = time.time() - self.last_full_flush >= SHARD_FULL_FLUSH_SECONDS
+                if not full_flush and not self.dirty_users and not self.dirty_globals and self.journal.pending == 0:
+                    return True
+
+                try:
+                    started = time.perf_counter()
+                    snapshot_seq = self.journal.rotate()
+                    if full_flush:
+                        dirty_users = set(self.users) | set(self.games)
+                        dirty_globals = True
+                    else:
+                        dirty_users = self.dirty_users
+                        dirty_globals = self.dirty_globals
+                    captured = self._capture_snapshot(dirty_users, dirty_globals)
+                    self.dirty_users = set()
+                    self.dirty_globals = False
+                    hold_ms = self._record_lock_hold(started)
+                except Exception as e:
+                    logger.critical(f"Cache save error: {e}", exc_info=True)
+                    return False
 
-                logger.info(f"[AppCache] Autosave completed: {len(self.games)} game states, {len(self.market_items)} market items, {len(self.auctions)} auctions")
+            try:
+                write_started = time.perf_counter()
+                data = self._materialize_snapshot(captured)
+                written = self.shards.flush(data["users"], data["globals"], snapshot_seq)
+                write_ms = (time.perf_counter() - write_started) * 1000
+                self.persist_stats['write_ms_last'] = write_ms
+                self.journal.drop_segment()
+                self.snapshot_seq = snapshot_seq
+                self.last_compaction = time.time()
+                if full_flush:
+                    self.last_full_flush = self.last_compaction
+
+                logger.info(f"[AppCache] Autosave completed at journal seq {snapshot_seq}: {written} shards written{' (full flush)' if full_flush else ''}, lock held {hold_ms:.1f} ms, write {write_ms:.0f} ms")
+                return True
             except Exception as e:
+                with self.lock:
+                    self.dirty_users |= dirty_users
+                    self.dirty_globals = self.dirty_globals or dirty_globals
                 logger.critical(f"Cache save error: {e}", exc_info=True)
+                return False
     
+    def _sync_store(self):
+        with self.compaction_lock:
+            try:
+                with self.lock:
+                    started = time.perf_counter()
+                    captured = self._capture_snapshot(set(self.users) | set(self.games), True)
+                    self.store.append("snapshot", None, captured)
+                    hold_ms = self._record_lock_hold(started)
+
+                if not self.store.flush():
+                    return False
+
+                self.store.checkpoint()
+                self.last_full_flush = time.time()
+                logger.info(f"[AppCache] Store sync completed: {self.store.db_file}, lock held {hold_ms:.1f} ms")
+                return True
+            except Exception as e:
+                logger.critical(f"Cache save error: {e}", exc_info=True)
+                return False
+
     def get_game_state(self, user_id, game_name):
         with self.lock:
             user_id = str(user_id)
@@ -218,6 +632,7 @@ class AppCache:
                 self.games[user_id] = {}
             
             self.games[user_id][game_name] = game_state
+            self._journal("game", [user_id, game_name], game_state)
             logger.info(f"[AppCache] Game state saved for user {user_id}, game: {game_name}")
             return True
     
@@ -226,6 +641,7 @@ class AppCache:
             user_id = str(user_id)
             if user_id in self.games and game_name in self.games[user_id]:
                 del self.games[user_id][game_name]
+                self._journal("game_delete", [user_id, game_name])
                 logger.info(f"[AppCache] Game state deleted for user {user_id}, game: {game_name}")
                 return True
             return False
@@ -252,6 +668,7 @@ class AppCache:
                 item["status"] = "for_sale"
             
             self.market_items.append(item)
+            self._journal("market_items", value=self.market_items)
             return True
     
     def remove_market_item(self, item_file):
@@ -259,6 +676,7 @@ class AppCache:
             for i, item in enumerate(self.market_items):
                 if item.get("file") == item_file:
                     del self.market_items[i]
+                    self._journal("market_items", value=self.market_items)
                     return True
             return False
     
@@ -280,6 +698,7 @@ class AppCache:
                 auction["bids"] = []
             
             self.auctions.append(auction)
+            self._journal("auctions", value=self.auctions)
             logger.info(f"[AppCache] Auction added: {auction.get('type')} {auction.get('file')} by {auction.get('seller_name', 'Unknown')}")
             return True
     
@@ -287,6 +706,7 @@ class AppCache:
         with self.lock:
             if 0 <= index < len(self.auctions):
                 self.auctions[index] = auction
+                self._journal("auctions", value=self.auctions)
                 return True
             return False
     
@@ -298,6 +718,7 @@ class AppCache:
             for i, auction in enumerate(self.auctions):
                 if auction.get("id") == auction_id:
                     del self.auctions[i]
+                    self._journal("auctions", value=self.auctions)
                     return True
             return False
 
@@ -322,6 +743,7 @@ class AppCache:
                 "avatars": kwargs.get("avatars", ["default-avatar.png"]),
                 **kwargs
             }
+            self._journal_user(str(user_id))
 
     def update_user(self, user_id, **fields):
         with self.lock:
@@ -340,6 +762,7 @@ class AppCache:
                     "avatars": ["default-avatar.png"]
                 }
             self.users[uid].update(fields)
+            self._journal_user(uid)
             return self.users[uid]
 
     def update_balance(self, user_id, delta):
@@ -361,19 +784,20 @@ class AppCache:
             
             new_balance = self.users[uid]["balance"] + delta
             self.users[uid]["balance"] = new_balance
+            self._journal_user(uid)
             return new_balance
 
     def get_avatar_path(self, user_id):
         user = self.get_user(user_id)
         if user and user.get("avatar"):
-            return self._resolve_relative_path(os.path.join("assets", "avatars", user["avatar"]))
-        return self._resolve_relative_path(os.path.join("assets", "avatars", "default-avatar.png"))
+            return self._resolve_relative_path(os.path.join("assets", "avatars", user["avatar"]), DEFAULT_AVATAR_PATH)
+        return self._resolve_relative_path(DEFAULT_AVATAR_PATH)
 
     def get_background_path(self, user_id):
         user = self.get_user(user_id)
         if user and user.get("background"):
             return self._resolve_relative_path(os.path.join("assets", "backgrounds", user["background"]))
-        return self._resolve_relative_path(os.path.join("assets", "backgrounds", "default-bg.png"))
+        return self._resolve_relative_path(DEFAULT_BACKGROUND_PATH)
 
     def get_setting(self, key, default=None):
         with self.lock:
@@ -382,16 +806,17 @@ class AppCache:
     def set_setting(self, key, value):
         with self.lock:
             self.settings[key] = value
+            self._journal("setting", key, value)
 
-    def _resolve_relative_path(self, relative_path):
+    def _resolve_relative_path(self, relative_path, fallback_path=None):
         current_dir = os.path.dirname(os.path.abspath(__file__))
         full_path = os.path.join(current_dir, relative_path)
         
         if os.path.exists(full_path):
             return full_path
-        else: 
-            backup_path = os.path.join(current_dir, os.path.join("assets", "backgrounds", "default-bg.png"))
-            return backup_path
+        if fallback_path and fallback_path != relative_path:
+            return self._resolve_relative_path(fallback_path)
+        return os.path.join(current_dir, DEFAULT_BACKGROUND_PATH)
         
     def add_experience(self, user_id, win_amount, sender, file_queue):
         with self.lock:
@@ -411,6 +836,7 @@ class AppCache:
                     "avatars": ["default-avatar.png"],
                     "backgrounds": ["default-bg.png"]
                 }
+                self._journal_user(uid)
 
             user = self.users[uid]
 
@@ -448,6 +874,7 @@ class AppCache:
 
             user["level"] = new_level
             user["level_progress"] = new_progress
+            self._journal_user(uid)
 
             if level_changed:
                 try:
@@ -459,7 +886,7 @@ class AppCache:
                     import threading
                     def run_level_up():
                         try:
-                            result = plugin.on_level_up(user_id, sender, file_queue)
+                            result = plugin.on_level_up(user_id, sender, with_priority(file_queue, PRIORITY_COSMETIC))
                         except Exception as e:
                             logger.critical(f"[AppCache] ERROR in level up thread: {e}", exc_info=True)
 
@@ -476,6 +903,7 @@ class AppCache:
     def set_active_math_challenge(self, challenge_data):
         with self.lock:
             self.active_math_challenge = challenge_data
+            self._journal("math_challenge", value=challenge_data)
 
     def get_active_math_challenge(self):
         with self.lock:
@@ -485,4 +913,5 @@ class AppCache:
         with self.lock:
             challenge = self.active_math_challenge
             self.active_math_challenge = None
+            self._journal("math_challenge")
             return challenge
\ No newline at end of file
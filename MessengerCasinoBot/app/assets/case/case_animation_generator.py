@@ -1,7 +1,10 @@
 import os
+import math
+import json
+import argparse
 import random
 from PIL import Image, ImageDraw, ImageFont
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 import time
 import logging
@@ -10,6 +13,12 @@ from PIL import ImageFilter
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+PREGENERATION_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+PREGENERATION_MANIFEST = "pregeneration_manifest.json"
+PROGRESS_LOG_EVERY = 10
+SKIN_THUMB_SIZE = (140, 110)
+USE_STRIP_RENDERER = True
+
 class SkinPriceRepository:
 
     SKIN_DATA = [       
@@ -800,8 +809,52 @@ class SkinPriceRepository:
         
         return skins_data
 
+class SkinAtlas:
+    def __init__(self, names, data, size=SKIN_THUMB_SIZE):
+        self.names = list(names)
+        self.data = data
+        self.size = tuple(size)
+        self.skins = {}
+
+        if self.names:
+            sheet = Image.frombytes("RGBA", (self.size[0], self.size[1] * len(self.names)), data)
+            for i, name in enumerate(self.names):
+                top = i * self.size[1]
+                self.skins[name] = sheet.crop((0, top, self.size[0], top + self.size[1]))
+
+    @classmethod
+    def build(cls, skin_folder, skin_names, size=SKIN_THUMB_SIZE):
+        names = []
+        thumbs = []
+
+        for skin_name in skin_names:
+            skin_path = os.path.join(skin_folder, f"{skin_name}.png")
+            if not os.path.exists(skin_path):
+                continue
+            try:
+                with Image.open(skin_path) as img:
+                    thumbs.append(img.convert("RGBA").resize(size, Image.Resampling.LANCZOS))
+            except Exception as e:
+                logger.error(f"Error loading skin {skin_path}: {e}")
+                thumbs.append(Image.new('RGBA', size, (100, 100, 100, 100)))
+            names.append(skin_name)
+
+        sheet = Image.new("RGBA", (size[0], size[1] * max(1, len(names))), (0, 0, 0, 0))
+        for i, thumb in enumerate(thumbs):
+            sheet.paste(thumb, (0, i * size[1]))
+
+        data = sheet.tobytes() if names else b""
+        logger.info(f"Skin atlas built: {len(names)} skins, {len(data) / 1024 / 1024:.1f} MB")
+        return cls(names, data, size)
+
+    def payload(self):
+        return self.names, self.data, self.size
+
+    def get(self, skin_name):
+        return self.skins.get(skin_name)
+
 class RaffleRollerAnimation:
-    def __init__(self, width=700, height=200):
+    def __init__(self, width=700, height=200, skin_atlas=None):
         self.width = width
         self.height = height
         self.roller_height = 200
@@ -817,6 +870,9 @@ class RaffleRollerAnimation:
         self.winning_border = (102, 178, 51)
         self.normal_border = (112, 103, 124)
         
+        self.skin_atlas = skin_atlas
+        self.skin_cache = {}
+        
         current_dir = os.path.dirname(os.path.abspath(__file__))
         self.SKIN_FOLDER = os.path.join(current_dir, "skins")
         self.PREGENERATED_FOLDER = os.path.join(current_dir, "pregenerated_webp")
@@ -841,6 +897,15 @@ class RaffleRollerAnimation:
             placeholder = Image.new('RGBA', (target_width, target_height), (100, 100, 100, 100))
             return placeholder
 
+    def get_skin(self, skin_name):
+        if self.skin_atlas is not None:
+            return self.skin_atlas.get(skin_name)
+
+        if skin_name not in self.skin_cache:
+            skin_path = Path(self.SKIN_FOLDER) / f"{skin_name}.png"
+            self.skin_cache[skin_name] = self.load_skin(skin_path, *SKIN_THUMB_SIZE) if skin_path.exists() else None
+        return self.skin_cache[skin_name]
+
     def create_item(self, skin_img, stripe_color, is_winning=False):
         width, height = self.item_width, self.item_height
         
@@ -875,9 +940,131 @@ class RaffleRollerAnimation:
         
         return item
 
+    def create_center_marker(self):
+        marker = Image.new('RGBA', (6, self.roller_height + 1), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(marker)
+        
+        gold_colors = [
+            (255, 215, 0),
+            (255, 195, 0),
+            (205, 173, 0),
+        ]
+        
+        for i in range(6):
+            color_idx = min(i // 2, len(gold_colors) - 1)
+            alpha = 220 - (i * 20)
+            gold_color = (*gold_colors[color_idx], alpha)
+            draw.line([i, 0, i, self.roller_height], fill=gold_color, width=1)
+        
+        draw.line([0, 0, 0, self.roller_height], fill=(255, 255, 255, 180), width=1)
+        draw.line([5, 0, 5, self.roller_height], fill=(255, 255, 200, 160), width=1)
+        
+        return marker
+
+    def get_center_marker_position(self):
+        return self.width // 2, (self.height - self.roller_height) // 2
+
+    def create_winner_panel(self, winning_item):
+        try:
+            winning_skin_img, winning_skin_name, winning_price, winning_condition, winning_stattrak, winning_stripe_color = winning_item
+            
+            frame_color = winning_stripe_color
+            
+            info_width = 450
+            info_height = 130
+            
+            info_bg = Image.new('RGBA', (info_width, info_height), (0, 0, 0, 0))
+            info_draw = ImageDraw.Draw(info_bg)
+            
+            for y in range(info_height):
+                alpha = 240 - int(y / info_height * 40)
+                bg_color = (20, 25, 35, alpha)
+                info_draw.line([0, y, info_width, y], fill=bg_color)
+            
+            border_width = 4
+            
+            for i in range(border_width):
+                border_alpha = 255 - (i * 40)
+                border_color = (*frame_color, border_alpha)
+                info_draw.rectangle([i, i, info_width-1-i, info_height-1-i], 
+                                outline=border_color, width=1)
+            
+            info_draw.rectangle([border_width, border_width, info_width-1-border_width, info_height-1-border_width], 
+                            outline=(255, 255, 255, 180), width=1)
+            
+            stattrak_text = "StatTrak™ " if winning_stattrak == "StatTrak" else ""
+            name_text = f"{stattrak_text}{winning_skin_name}"
+            name_bbox = info_draw.textbbox((0, 0), name_text, font=self.font_medium)
+            name_width = name_bbox[2] - name_bbox[0]
+            name_x = (info_width - name_width) // 2
+            
+            if winning_stattrak == "StatTrak":
+                name_color = (255, 215, 0)
+                name_shadow = (100, 80, 0)
+            else:
+                name_color = (255, 255, 255)
+                name_shadow = (80, 80, 80)
+            
+            info_draw.text((name_x + 1, 25), name_text, fill=name_shadow, font=self.font_medium)
+            info_draw.text((name_x, 24), name_text, fill=name_color, font=self.font_medium)
+            
+            condition_text = f"{winning_condition}"
+            condition_bbox = info_draw.textbbox((0, 0), condition_text, font=self.font_small)
+            condition_width = condition_bbox[2] - condition_bbox[0]
+            condition_x = (info_width - condition_width) // 2
+            
+            condition_color = (220, 220, 220)
+            condition_shadow = (80, 80, 80)
+            
+            info_draw.text((condition_x + 1, 58), condition_text, fill=condition_shadow, font=self.font_small)
+            info_draw.text((condition_x, 57), condition_text, fill=condition_color, font=self.font_small)
+            
+            price_text = f"${winning_price}"
+            price_bbox = info_draw.textbbox((0, 0), price_text, font=self.font_medium)
+            price_width = price_bbox[2] - price_bbox[0]
+            price_x = (info_width - price_width) // 2
+            
+            price_shadow_color = (100, 80, 0, 255)
+            price_main_color = (255, 215, 0)
+            price_highlight = (255, 235, 150)
+            
+            info_draw.text((price_x + 2, 88), price_text, fill=price_shadow_color, font=self.font_medium)
+            info_draw.text((price_x, 86), price_text, fill=price_main_color, font=self.font_medium)
+            info_draw.text((price_x + 1, 87), price_text, fill=price_highlight, font=self.font_medium)
+            
+            separator_y = 50
+            line_color = (*frame_color, 180)
+            info_draw.line([30, separator_y, info_width - 30, separator_y], 
+                        fill=line_color, width=2)
+            
+            separator_y2 = 80
+            info_draw.line([30, separator_y2, info_width - 30, separator_y2], 
+                        fill=line_color, width=2)
+            
+            corner_size = 12
+            corner_color = (*frame_color, 220)
+            
+            info_draw.line([0, 0, corner_size, 0], fill=corner_color, width=2)
+            info_draw.line([0, 0, 0, corner_size], fill=corner_color, width=2)
+            info_draw.line([info_width-1, 0, info_width-1-corner_size, 0], fill=corner_color, width=2)
+            info_draw.line([info_width-1, 0, info_width-1, corner_size], fill=corner_color, width=2)
+            info_draw.line([0, info_height-1, corner_size, info_height-1], fill=corner_color, width=2)
+            info_draw.line([0, info_height-1, 0, info_height-1-corner_size], fill=corner_color, width=2)
+            info_draw.line([info_width-1, info_height-1, info_width-1-corner_size, info_height-1], fill=corner_color, width=2)
+            info_draw.line([info_width-1, info_height-1, info_width-1, info_height-1-corner_size], fill=corner_color, width=2)
+            
+            return info_bg
+            
+        except Exception as e:
+            logger.error(f"End label error: {e}")
+            return None
+
+    def paste_winner_panel(self, frame, info_bg):
+        if info_bg:
+            frame.paste(info_bg, ((self.width - info_bg.width) // 2, 5), info_bg)
+
     def generate_roller_frame(self, skin_items, offset_x=0, winning_index=None):
         frame = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(frame)
         
         start_x = 100 - offset_x
         for i, (skin_img, skin_name, price, condition, stattrak, stripe_color) in enumerate(skin_items):
@@ -891,130 +1078,56 @@ class RaffleRollerAnimation:
                 mask = Image.new('L', (self.item_width, self.item_height), 255)
                 frame.paste(item_rgba, (int(x_pos), (self.height - self.roller_height) // 2 + 20), mask)
         
-        center_x = self.width // 2
-        roller_y = (self.height - self.roller_height) // 2
+        frame.paste(self.create_center_marker(), self.get_center_marker_position())
         
-        gold_colors = [
-            (255, 215, 0),
-            (255, 195, 0),
-            (205, 173, 0),
-        ]
+        if winning_index is not None and winning_index < len(skin_items):
+            self.paste_winner_panel(frame, self.create_winner_panel(skin_items[winning_index]))
+
+        return frame
+
+    def build_strip(self, skin_items):
+        step = self.item_width + self.margin
+        item_y = (self.height - self.roller_height) // 2 + 20
+        strip = Image.new('RGBA', (100 + len(skin_items) * step + self.width, self.height), (0, 0, 0, 0))
+        cards = {}
         
-        for i in range(6):
-            color_idx = min(i // 2, len(gold_colors) - 1)
-            alpha = 220 - (i * 20)
-            gold_color = (*gold_colors[color_idx], alpha)
-            draw.line([center_x + i, roller_y, center_x + i, roller_y + self.roller_height], 
-                    fill=gold_color, width=1)
+        for i, (skin_img, skin_name, price, condition, stattrak, stripe_color) in enumerate(skin_items):
+            card_key = (id(skin_img), stripe_color)
+            if card_key not in cards:
+                cards[card_key] = self.create_item(skin_img, stripe_color)
+            strip.paste(cards[card_key], (100 + i * step, item_y))
+        
+        return strip
+
+    def render_strip_frames(self, skin_items, offsets, final_offset, winning_index,
+                            settle_frames=5, winner_frames=30, frame_duration=50):
+        strip = self.build_strip(skin_items)
+        marker = self.create_center_marker()
+        marker_position = self.get_center_marker_position()
+        
+        def crop_frame(offset):
+            left = math.ceil(offset)
+            frame = strip.crop((left, 0, left + self.width, self.height))
+            frame.paste(marker, marker_position)
+            return frame
         
-        draw.line([center_x, roller_y, center_x, roller_y + self.roller_height], 
-                fill=(255, 255, 255, 180), width=1)
-        draw.line([center_x + 5, roller_y, center_x + 5, roller_y + self.roller_height], 
-                fill=(255, 255, 200, 160), width=1)
+        frames = [crop_frame(offset) for offset in offsets]
+        durations = [frame_duration] * len(frames)
         
+        settled = crop_frame(final_offset)
+        frames.append(settled)
+        durations.append(frame_duration * settle_frames)
+        
+        winner_frame = settled.copy()
         if winning_index is not None and winning_index < len(skin_items):
-            try:
-                winning_skin_img, winning_skin_name, winning_price, winning_condition, winning_stattrak, winning_stripe_color = skin_items[winning_index]
-                
-                frame_color = winning_stripe_color
-                
-                info_width = 450
-                info_height = 130
-                
-                info_x = (self.width - info_width) // 2
-                info_y = 5
-                
-                info_bg = Image.new('RGBA', (info_width, info_height), (0, 0, 0, 0))
-                info_draw = ImageDraw.Draw(info_bg)
-                
-                for y in range(info_height):
-                    alpha = 240 - int(y / info_height * 40)
-                    bg_color = (20, 25, 35, alpha)
-                    info_draw.line([0, y, info_width, y], fill=bg_color)
-                
-                border_width = 4
-                
-                for i in range(border_width):
-                    border_alpha = 255 - (i * 40)
-                    border_color = (*frame_color, border_alpha)
-                    info_draw.rectangle([i, i, info_width-1-i, info_height-1-i], 
-                                    outline=border_color, width=1)
-                
-                info_draw.rectangle([border_width, border_width, info_width-1-border_width, info_height-1-border_width], 
-                                outline=(255, 255, 255, 180), width=1)
-                
-                stattrak_text = "StatTrak™ " if winning_stattrak == "StatTrak" else ""
-                name_text = f"{stattrak_text}{winning_skin_name}"
-                name_bbox = info_draw.textbbox((0, 0), name_text, font=self.font_medium)
-                name_width = name_bbox[2] - name_bbox[0]
-                name_x = (info_width - name_width) // 2
-                
-                if winning_stattrak == "StatTrak":
-                    name_color = (255, 215, 0)
-                    name_shadow = (100, 80, 0)
-                else:
-                    name_color = (255, 255, 255)
-                    name_shadow = (80, 80, 80)
-                
-                info_draw.text((name_x + 1, 25), name_text, fill=name_shadow, font=self.font_medium)
-                info_draw.text((name_x, 24), name_text, fill=name_color, font=self.font_medium)
-                
-                condition_text = f"{winning_condition}"
-                condition_bbox = info_draw.textbbox((0, 0), condition_text, font=self.font_small)
-                condition_width = condition_bbox[2] - condition_bbox[0]
-                condition_x = (info_width - condition_width) // 2
-                
-                condition_color = (220, 220, 220)
-                condition_shadow = (80, 80, 80)
-                
-                info_draw.text((condition_x + 1, 58), condition_text, fill=condition_shadow, font=self.font_small)
-                info_draw.text((condition_x, 57), condition_text, fill=condition_color, font=self.font_small)
-                
-                price_text = f"${winning_price}"
-                price_bbox = info_draw.textbbox((0, 0), price_text, font=self.font_medium)
-                price_width = price_bbox[2] - price_bbox[0]
-                price_x = (info_width - price_width) // 2
-                
-                price_shadow_color = (100, 80, 0, 255)
-                price_main_color = (255, 215, 0)
-                price_highlight = (255, 235, 150)
-                
-                info_draw.text((price_x + 2, 88), price_text, fill=price_shadow_color, font=self.font_medium)
-                info_draw.text((price_x, 86), price_text, fill=price_main_color, font=self.font_medium)
-                info_draw.text((price_x + 1, 87), price_text, fill=price_highlight, font=self.font_medium)
-                
-                separator_y = 50
-                line_color = (*frame_color, 180)
-                info_draw.line([30, separator_y, info_width - 30, separator_y], 
-                            fill=line_color, width=2)
-                
-                separator_y2 = 80
-                info_draw.line([30, separator_y2, info_width - 30, separator_y2], 
-                            fill=line_color, width=2)
-                
-                corner_size = 12
-                corner_color = (*frame_color, 220)
-                
-                info_draw.line([0, 0, corner_size, 0], fill=corner_color, width=2)
-                info_draw.line([0, 0, 0, corner_size], fill=corner_color, width=2)
-                info_draw.line([info_width-1, 0, info_width-1-corner_size, 0], fill=corner_color, width=2)
-                info_draw.line([info_width-1, 0, info_width-1, corner_size], fill=corner_color, width=2)
-                info_draw.line([0, info_height-1, corner_size, info_height-1], fill=corner_color, width=2)
-                info_draw.line([0, info_height-1, 0, info_height-1-corner_size], fill=corner_color, width=2)
-                info_draw.line([info_width-1, info_height-1, info_width-1-corner_size, info_height-1], fill=corner_color, width=2)
-                info_draw.line([info_width-1, info_height-1, info_width-1, info_height-1-corner_size], fill=corner_color, width=2)
-                
-                frame.paste(info_bg, (info_x, info_y), info_bg)
-                
-            except Exception as e:
-                logger.error(f"End label error: {e}")
-
-        return frame
+            self.paste_winner_panel(winner_frame, self.create_winner_panel(skin_items[winning_index]))
+        frames.append(winner_frame)
+        durations.append(frame_duration * winner_frames)
+        
+        return frames, durations
 
     def create_animation_optimized(self, target_combination, output_path, min_price, max_price):
         try:
-            import math
-            
             all_skins_data = SkinPriceRepository.get_all_skins_with_prices()
             skin_items = []
             
@@ -1047,16 +1160,8 @@ class RaffleRollerAnimation:
             random_offset = random.uniform(10, ITEM_WIDTH)
             
             for i, skin_data in enumerate(selected_skins):
-                skin_path = Path(self.SKIN_FOLDER) / f"{skin_data['name']}.png"
-                skin_img = None
-                if skin_path.exists():
-                    skin_img = self.load_skin(skin_path, 140, 110)
-                
                 if i == WINNING_POSITION:
-                    target_skin_path = Path(self.SKIN_FOLDER) / f"{target_combination.skin_name}.png"
-                    target_skin_img = None
-                    if target_skin_path.exists():
-                        target_skin_img = self.load_skin(target_skin_path, 140, 110)
+                    target_skin_img = self.get_skin(target_combination.skin_name)
                     
                     target_color = SkinPriceRepository.get_skin_color(
                         target_combination.skin_name,
@@ -1074,7 +1179,7 @@ class RaffleRollerAnimation:
                     ))
                 else:
                     skin_items.append((
-                        skin_img,
+                        self.get_skin(skin_data['name']),
                         skin_data['name'],
                         skin_data['price'],
                         skin_data['condition'],
@@ -1082,11 +1187,10 @@ class RaffleRollerAnimation:
                         skin_data['color']
                     ))
             
-            frames = []
-            
             base_distance = WINNING_POSITION * (self.item_width + self.margin) - self.width // 2 + self.item_width // 2
             total_distance = base_distance + random_offset
             num_roll_frames = 100
+            offsets = []
             
             for i in range(num_roll_frames):
                 if i < 20:
@@ -1102,21 +1206,27 @@ class RaffleRollerAnimation:
                     eased_progress = 1 - math.pow(1 - phase_progress, 3)
                     eased_progress = 0.02 + (eased_progress * 0.98)
                 
-                current_offset = total_distance * eased_progress
-                frames.append(self.generate_roller_frame(skin_items, current_offset))
+                offsets.append(total_distance * eased_progress)
             
-            for i in range(5):
-                frames.append(self.generate_roller_frame(skin_items, total_distance))
-            
-            for i in range(30):
-                frames.append(self.generate_roller_frame(skin_items, total_distance, WINNING_POSITION))
+            if USE_STRIP_RENDERER:
+                frames, durations = self.render_strip_frames(skin_items, offsets, total_distance, WINNING_POSITION)
+            else:
+                frames = [self.generate_roller_frame(skin_items, offset) for offset in offsets]
+                
+                for i in range(5):
+                    frames.append(self.generate_roller_frame(skin_items, total_distance))
+                
+                for i in range(30):
+                    frames.append(self.generate_roller_frame(skin_items, total_distance, WINNING_POSITION))
+                
+                durations = [50] * len(frames)
             
             if frames:
                 frames[0].save(
                     output_path,
                     save_all=True,
                     append_images=frames[1:],
-                    duration=50,
+                    duration=durations,
                     loop=0,
                     format='WEBP',
                     quality=85,
@@ -1131,6 +1241,34 @@ class RaffleRollerAnimation:
             logger.error(f"Error during generation: {e}")
             return False
 
+_worker_animator = None
+
+def _init_pregeneration_worker(atlas_payload):
+    global _worker_animator
+    _worker_animator = RaffleRollerAnimation(skin_atlas=SkinAtlas(*atlas_payload))
+
+def _pregenerate_job(job):
+    skin_name, condition, stattrak_status, price, output_path, min_price, max_price = job
+    temp_path = output_path + ".part"
+    start_time = time.time()
+    
+    try:
+        combination = CaseOpeningAnimationGenerator.SkinCombination(skin_name, condition, stattrak_status, price)
+        if not _worker_animator.create_animation_optimized(combination, temp_path, min_price, max_price):
+            return False, "Animation creation failed", 0, time.time() - start_time
+        
+        os.replace(temp_path, output_path)
+        return True, None, os.path.getsize(output_path), time.time() - start_time
+        
+    except Exception as e:
+        return False, str(e), 0, time.time() - start_time
+    finally:
+        if os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
 class CaseOpeningAnimationGenerator:
     def __init__(self):
         self.MIN_PRICE = 0
@@ -1241,15 +1379,64 @@ class CaseOpeningAnimationGenerator:
             logger.error(f"Error in pregeneration: {e}")
             return False, str(e)
 
-    def pregenerate_all_animations_optimized(self, min_price=None, max_price=None):
+    def get_manifest_path(self):
+        return os.path.join(self.PREGENERATED_FOLDER, PREGENERATION_MANIFEST)
+
+    def load_manifest(self):
+        try:
+            with open(self.get_manifest_path(), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            return manifest if isinstance(manifest, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Could not read manifest, starting fresh: {e}")
+            return {}
+
+    def save_manifest(self, manifest):
+        manifest_path = self.get_manifest_path()
+        temp_path = manifest_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temp_path, manifest_path)
+
+    def is_animation_complete(self, manifest, filename, output_path, resume=True):
+        if not resume or not os.path.exists(output_path):
+            return False
+        
+        entry = manifest.get(filename)
+        if entry:
+            return entry.get('status') == 'done'
+        
+        try:
+            with Image.open(output_path) as img:
+                if getattr(img, "n_frames", 1) <= 1:
+                    return False
+        except Exception:
+            return False
+        
+        manifest[filename] = {'status': 'done', 'bytes': os.path.getsize(output_path), 'adopted': True}
+        return True
+
+    def build_skin_atlas(self, min_price, max_price):
+        skin_names = sorted({
+            skin_name
+            for skin_name, price_infos in SkinPriceRepository.get_all_skins_with_prices().items()
+            if any(min_price <= price_info['price'] <= max_price for price_info in price_infos)
+        })
+        return SkinAtlas.build(self.SKIN_FOLDER, skin_names)
+
+    def pregenerate_all_animations_optimized(self, min_price=None, max_price=None, workers=None, resume=True):
         if min_price is None:
             min_price = self.MIN_PRICE
         if max_price is None:
             max_price = self.MAX_PRICE
+        if workers is None:
+            workers = PREGENERATION_WORKERS
             
         self.PRICE_RANGE = (min_price, max_price)
         
-        logger.info(f"Starting pregeneration for price range ${min_price}-${max_price}")
+        logger.info(f"Starting pregeneration for price range ${min_price}-${max_price} with {workers} workers")
         
         start_time = time.time()
         
@@ -1260,67 +1447,113 @@ class CaseOpeningAnimationGenerator:
             if not combinations:
                 logger.error("No skin combinations found!")
                 return 0, 0
+            
+            manifest = self.load_manifest() if resume else {}
+            jobs = {}
+            skipped_count = 0
+            
+            for animation_number, combo in enumerate(combinations, 1):
+                filename = self.generate_filename(combo, animation_number)
+                output_path = str(Path(self.PREGENERATED_FOLDER) / filename)
                 
+                if self.is_animation_complete(manifest, filename, output_path, resume):
+                    skipped_count += 1
+                    continue
+                
+                jobs[filename] = (
+                    combo.skin_name, combo.condition, combo.stattrak_status, combo.price,
+                    output_path, min_price, max_price
+                )
+            
+            self.save_manifest(manifest)
+            if resume:
+                logger.info(f"Resuming: {skipped_count} already done, {len(jobs)} to generate")
+            else:
+                logger.info(f"Fresh run: regenerating all {len(jobs)} animations")
+            
             success_count = 0
             error_count = 0
-            total = len(combinations)
+            total_bytes = 0
+            total = len(jobs)
             
-            with ThreadPoolExecutor(max_workers=2) as executor:
-                future_to_combination = {}
-                animation_counter = 1
-                
-                for combo in combinations:
-                    future = executor.submit(
-                        self.pregenerate_single_animation_optimized, 
-                        combo, 
-                        animation_counter,
-                        min_price,
-                        max_price
-                    )
-                    future_to_combination[future] = (combo, animation_counter)
-                    animation_counter += 1
+            if jobs:
+                atlas = self.build_skin_atlas(min_price, max_price)
+                render_start = time.time()
                 
-                for i, future in enumerate(as_completed(future_to_combination), 1):
-                    combination, anim_num = future_to_combination[future]
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_pregeneration_worker,
+                    initargs=(atlas.payload(),)
+                ) as executor:
+                    future_to_filename = {
+                        executor.submit(_pregenerate_job, job): filename
+                        for filename, job in jobs.items()
+                    }
                     
-                    try:
-                        success, error_message = future.result()
+                    for i, future in enumerate(as_completed(future_to_filename), 1):
+                        filename = future_to_filename[future]
+                        
+                        try:
+                            success, error_message, file_bytes, seconds = future.result()
+                        except Exception as e:
+                            success, error_message, file_bytes, seconds = False, str(e), 0, 0
+                        
                         if success:
                             success_count += 1
+                            total_bytes += file_bytes
+                            manifest[filename] = {'status': 'done', 'bytes': file_bytes, 'seconds': round(seconds, 2)}
                         else:
                             error_count += 1
-                            logger.error(f"Error for {combination}: {error_message}")
+                            manifest[filename] = {'status': 'failed', 'error': error_message}
+                            logger.error(f"Error for {filename}: {error_message}")
+                        
+                        self.save_manifest(manifest)
                         
-                        if i % 10 == 0 or i == total:
+                        if i % PROGRESS_LOG_EVERY == 0 or i == total:
+                            elapsed = time.time() - render_start
+                            rate = i / elapsed * 60 if elapsed > 0 else 0
+                            eta = (total - i) / rate * 60 if rate > 0 else 0
                             progress = (i / total) * 100
-                            logger.info(f"Progress: {i}/{total} ({progress:.1f}%) - Success: {success_count}, Errors: {error_count}")
-                            
-                    except Exception as e:
-                        error_count += 1
-                        logger.error(f"Exception for {combination}: {e}")
+                            logger.info(
+                                f"Progress: {i}/{total} ({progress:.1f}%) - Success: {success_count}, Errors: {error_count} - "
+                                f"{rate:.1f} animations/min, ETA {eta:.0f}s"
+                            )
         
             end_time = time.time()
             duration = end_time - start_time
             
             logger.info(f"Success: {success_count}")
             logger.info(f"Errors: {error_count}")
+            logger.info(f"Skipped (already done): {skipped_count}")
             logger.info(f"Total time: {duration:.2f} seconds")
+            if success_count:
+                logger.info(
+                    f"Throughput: {success_count / duration * 60:.1f} animations/min, "
+                    f"avg {total_bytes / success_count / 1024:.1f} KB"
+                )
             
-            return total, sum(combo.price for combo in combinations)
+            return len(combinations), sum(combo.price for combo in combinations)
             
         except Exception as e:
             logger.error(f"Error during pregeneration: {e}")
             return 0, 0
 
 def main():
+    parser = argparse.ArgumentParser(description="Pregenerate case opening animations")
+    parser.add_argument("--min-price", type=int, default=None)
+    parser.add_argument("--max-price", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=PREGENERATION_WORKERS)
+    parser.add_argument("--fresh", action="store_true", help="ignore the manifest and regenerate every animation")
+    args = parser.parse_args()
+    
     generator = CaseOpeningAnimationGenerator()
     
-    min_price = generator.MIN_PRICE
-    max_price = generator.MAX_PRICE
+    min_price = generator.MIN_PRICE if args.min_price is None else args.min_price
+    max_price = generator.MAX_PRICE if args.max_price is None else args.max_price
     
     combinations = generator.get_all_skin_combinations_in_range(min_price, max_price)
     
-    generator.pregenerate_all_animations_optimized(min_price, max_price)
+    generator.pregenerate_all_animations_optimized(min_price, max_price, workers=max(1, args.workers), resume=not args.fresh)
     
     total_price = sum(combo.price for combo in combinations)
     total_animations = len(combinations)
@@ -0,0 +1,252 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import requests
+from requests.adapters import HTTPAdapter
+from logger import logger
+
+AVATAR_POOL_SIZE = 8
+AVATAR_FETCH_WORKERS = 4
+AVATAR_DOWNLOAD_TIMEOUT = 10
+AVATAR_PROBE_TIMEOUT = 5
+AVATAR_PROBE_WAIT_SECONDS = 0.5
+AVATAR_REVALIDATE_SECONDS = 3600
+AVATAR_RETRY_SECONDS = 300
+AVATAR_INDEX_FILE = ".avatar_index.json"
+
+class AvatarFetcher:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, avatars_dir, session=None, workers=AVATAR_FETCH_WORKERS):
+        self.avatars_dir = avatars_dir
+        self.index_file = os.path.join(avatars_dir, AVATAR_INDEX_FILE)
+        self.session = session or self._create_session()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="avatar-fetch")
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.probes = {}
+        self.urls = {}
+        self.hashes = {}
+        self.stats = {
+            'downloads': 0, 'not_modified': 0, 'deduplicated': 0, 'bytes': 0,
+            'probes': 0, 'probe_cache_hits': 0, 'probe_timeouts': 0,
+            'prefetches': 0, 'revalidations': 0, 'errors': 0, 'fetch_ms': 0.0
+        }
+
+        os.makedirs(avatars_dir, exist_ok=True)
+        self._load_index()
+
+    @classmethod
+    def get_instance(cls, avatars_dir, session=None):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls(avatars_dir, session=session)
+        return cls._instance
+
+    def _create_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=AVATAR_POOL_SIZE, pool_maxsize=AVATAR_POOL_SIZE)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _load_index(self):
+        if not os.path.exists(self.index_file):
+            return
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.urls = data.get("urls", {})
+            self.hashes = data.get("hashes", {})
+        except Exception as e:
+            logger.warning(f"[AvatarFetcher] Could not read avatar index, starting empty: {e}")
+
+    def _save_index(self):
+        with self.lock:
+            payload = json.dumps({"urls": self.urls, "hashes": self.hashes}, ensure_ascii=False)
+        tmp_file = f"{self.index_file}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp_file, self.index_file)
+        except Exception as e:
+            logger.warning(f"[AvatarFetcher] Could not save avatar index: {e}")
+
+    def _conditional_headers(self, url, filename=None):
+        entry = self.urls.get(url, {})
+        if filename and not os.path.exists(os.path.join(self.avatars_dir, filename)):
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def _remember(self, url, response, **fields):
+        with self.lock:
+            entry = self.urls.setdefault(url, {})
+            if response is not None and response.status_code == 200:
+                entry["etag"] = response.headers.get("ETag")
+                entry["last_modified"] = response.headers.get("Last-Modified")
+            entry["checked_at"] = time.time()
+            entry.update(fields)
+
+    def _forget_file(self, filename):
+        for digest in [digest for digest, name in self.hashes.items() if name == filename]:
+            del self.hashes[digest]
+
+    def _store_content(self, filename, content):
+        digest = hashlib.sha256(content).hexdigest()
+        path = os.path.join(self.avatars_dir, filename)
+
+        with self.lock:
+            existing = self.hashes.get(digest)
+
+        if existing and existing != filename:
+            existing_path = os.path.join(self.avatars_dir, existing)
+            if os.path.exists(existing_path):
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                try:
+                    os.link(existing_path, tmp_path)
+                except OSError:
+                    shutil.copy2(existing_path, tmp_path)
+                os.replace(tmp_path, path)
+                with self.lock:
+                    self._forget_file(filename)
+                self.stats['deduplicated'] += 1
+                return digest
+
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+        with self.lock:
+            self._forget_file(filename)
+            self.hashes[digest] = filename
+        self.stats['bytes'] += len(content)
+        return digest
+
+    def fetch(self, url, filename):
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, headers=self._conditional_headers(url, filename), timeout=AVATAR_DOWNLOAD_TIMEOUT)
+
+            if response.status_code == 304:
+                self.stats['not_modified'] += 1
+                self._remember(url, response, filename=filename, available=True)
+                self._save_index()
+                return filename
+
+            response.raise_for_status()
+
+            digest = self._store_content(filename, response.content)
+            self.stats['downloads'] += 1
+            self._remember(url, response, filename=filename, sha256=digest, available=True)
+            self._save_index()
+            return filename
+
+        except Exception as e:
+            self.stats['errors'] += 1
+            self._remember(url, None, available=False)
+            logger.error(f"[AvatarFetcher] Error downloading avatar from {url}: {e}")
+            return None
+        finally:
+            self.stats['fetch_ms'] += (time.perf_counter() - start) * 1000
+
+    def prefetch(self, url, filename):
+        with self.lock:
+            future = self.in_flight.get(url)
+            if future is not None:
+                return future
+            entry = self.urls.get(url, {})
+            if entry.get("available") is False and time.time() - entry.get("checked_at", 0) < AVATAR_RETRY_SECONDS:
+                return None
+            future = self.executor.submit(self._run_prefetch, url, filename)
+            self.in_flight[url] = future
+            self.stats['prefetches'] += 1
+            return future
+
+    def revalidate(self, url, filename):
+        with self.lock:
+            entry = self.urls.get(url, {})
+            if time.time() - entry.get("checked_at", 0) < AVATAR_REVALIDATE_SECONDS:
+                return None
+            self.stats['revalidations'] += 1
+        return self.prefetch(url, filename)
+
+    def _run_prefetch(self, url, filename):
+        try:
+            return self.fetch(url, filename)
+        finally:
+            with self.lock:
+                self.in_flight.pop(url, None)
+
+    def probe(self, url):
+        self.stats['probes'] += 1
+        try:
+            response = self.session.get(url, headers=self._conditional_headers(url), timeout=AVATAR_PROBE_TIMEOUT, stream=True)
+            try:
+                if response.status_code == 304:
+                    self.stats['not_modified'] += 1
+                    self._remember(url, response, available=True)
+                    return True
+
+                response.raise_for_status()
+
+                content_type = response.headers.get("content-type", "").lower()
+                if content_type and not content_type.startswith("image/"):
+                    logger.warning(f"[AvatarFetcher] Avatar URL is not an image: {url} ({content_type})")
+                    self._remember(url, None, available=False)
+                    return False
+
+                self._remember(url, response, available=True)
+                return True
+            finally:
+                response.close()
+        except Exception as e:
+            logger.info(f"[AvatarFetcher] Avatar URL is not reachable: {url} ({e})")
+            self._remember(url, None, available=False)
+            return False
+
+    def is_available(self, url, wait=AVATAR_PROBE_WAIT_SECONDS):
+        with self.lock:
+            entry = self.urls.get(url)
+            if entry and "available" in entry and time.time() - entry.get("checked_at", 0) < AVATAR_REVALIDATE_SECONDS:
+                self.stats['probe_cache_hits'] += 1
+                return entry["available"]
+
+            future = self.probes.get(url)
+            if future is None:
+                future = self.executor.submit(self._run_probe, url)
+                self.probes[url] = future
+
+        try:
+            return future.result(timeout=wait)
+        except FutureTimeoutError:
+            self.stats['probe_timeouts'] += 1
+            return None
+
+    def _run_probe(self, url):
+        try:
+            return self.probe(url)
+        finally:
+            with self.lock:
+                self.probes.pop(url, None)
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                'tracked_urls': len(self.urls),
+                'unique_images': len(self.hashes),
+                'in_flight': len(self.in_flight) + len(self.probes),
+                'avg_fetch_ms': self.stats['fetch_ms'] / max(1, self.stats['downloads'] + self.stats['not_modified'] + self.stats['errors']),
+                **self.stats
+            }
@@ -2,9 +2,10 @@
 from typing import Dict, List, Tuple, Optional
 from PIL import Image, ImageDraw
 from animation_generator import AnimationGenerator, GenerationRequest, UserInfo, GenerationOptions
-from utils import _get_unique_id
+from resource_cache import RenderCache
 from user_manager import UserManager
 from logger import logger
+from media_encoder import save_image
 
 class BaseGamePlugin:
     
@@ -27,6 +28,8 @@ class BaseGamePlugin:
 
         self.text_renderer = self.generator.text_renderer
         
+        self.render_cache = RenderCache.get_instance()
+        
         if hasattr(self, 'get_custom_overlay') and callable(self.get_custom_overlay):
             if game_name not in self.generator.custom_overlay_providers:
                 self.generator.register_custom_overlay_provider(
@@ -42,7 +45,8 @@ class BaseGamePlugin:
                          last_frame_multiplier=1.0, custom_overlay_kwargs=None, 
                          show_win_text=True, font_scale=1.0, avatar_size=85, 
                          show_bet_amount=True, win_text_height=-1, final_frames_start_index=-1,
-                         win_text_scale=-1, overlay_position="bottom", quality=90):
+                         win_text_scale=-1, overlay_position="bottom", quality=None,
+                         frame_limit=-1, use_source_durations=False, base_frames=None):
         avatar_path = None
         bg_path = None
         
@@ -58,7 +62,7 @@ class BaseGamePlugin:
         if not bg_path or not os.path.exists(bg_path):
             validation_errors.append(f"Background not found for user {user_id}: {bg_path}")
         
-        if not os.path.exists(base_animation_path):
+        if base_frames is None and not os.path.exists(base_animation_path):
             validation_errors.append(f"Base animation not found: {base_animation_path}")
         
         if validation_errors:
@@ -91,7 +95,9 @@ class BaseGamePlugin:
             final_frames_start_index=final_frames_start_index,
             win_text_scale=win_text_scale,
             overlay_position=overlay_position,
-            quality=quality
+            quality=quality,
+            frame_limit=frame_limit,
+            use_source_durations=use_source_durations
         )
         
         request = GenerationRequest(
@@ -100,6 +106,7 @@ class BaseGamePlugin:
             user_before=user_before,
             user_after=user_after,
             game_name=self.game_name,
+            base_frames=base_frames,
             options=options
         )
         
@@ -122,7 +129,8 @@ class BaseGamePlugin:
                        user_info: Dict, custom_overlay_kwargs: Optional[Dict] = None,
                        show_bet_amount: bool = True, show_win_text: bool = True,
                        font_scale: float = 1.0, avatar_size: int = 85,
-                       win_text_scale: float = 1.0, win_text_height: int = -1) -> str:
+                       win_text_scale: float = 1.0, win_text_height: int = -1,
+                       frame_limit: int = -1) -> str:
         try:
             user_info_data = {
                 **user_info,
@@ -139,7 +147,8 @@ class BaseGamePlugin:
                 show_bet_amount=show_bet_amount,
                 custom_overlay_kwargs=custom_overlay_kwargs,
                 win_text_scale=win_text_scale,
-                win_text_height=win_text_height
+                win_text_height=win_text_height,
+                frame_limit=frame_limit
             )
             
             request = GenerationRequest(
@@ -236,122 +245,127 @@ class BaseGamePlugin:
     def _generate_dynamic_message_image(self, username, error_title, error_message, 
                                     background_path, output_folder):
         try:
-            IMAGE_WIDTH = 600
-            BOX_WIDTH = 560
-            BOX_PADDING = 15
-            TITLE_Y = 15
-            MAX_LINE_WIDTH = 520
-            
-            temp_img = Image.new('RGB', (1, 1))
-            temp_draw = ImageDraw.Draw(temp_img)
-            
-            title_font = self.generator.text_renderer.get_font(32)
-            message_font = self.generator.text_renderer.get_font(16)
-
-            lines = []
-            paragraphs = error_message.split('\n')
-            
-            for paragraph in paragraphs:
-                if not paragraph.strip():
-                    lines.append("")
-                    continue
-                    
-                words = paragraph.split()
-                current_line = ""
-                
-                for word in words:
-                    test_line = f"{current_line} {word}".strip() if current_line else word
-                    bbox = temp_draw.textbbox((0, 0), test_line, font=message_font)
-                    line_width = bbox[2] - bbox[0]
-                    
-                    if line_width <= MAX_LINE_WIDTH:
-                        current_line = test_line
-                    else:
-                        if current_line:
-                            lines.append(current_line)
-                        current_line = word
-            
-                if current_line:
-                    lines.append(current_line)
-            
-            title_bbox = temp_draw.textbbox((0, 0), error_title, font=title_font)
-            title_height = title_bbox[3] - title_bbox[1]
-            
-            test_bbox = temp_draw.textbbox((0, 0), "Ay", font=message_font)
-            line_height = test_bbox[3] - test_bbox[1]
-            LINE_HEIGHT = max(28, line_height + 2)
-            
-            text_height = len(lines) * LINE_HEIGHT
-            box_height = text_height + (BOX_PADDING * 2)
-            
-            box_y = TITLE_Y + title_height + 15
-            separator_y = box_y + box_height + 15
-            
-            nick_bbox = temp_draw.textbbox((0, 0), username, font=message_font)
-            nick_height = nick_bbox[3] - nick_bbox[1]
-            nick_y = separator_y + 15
-            
-            image_height = nick_y + nick_height + 15
-            
-            original_bg = Image.open(background_path).convert("RGB")
-            original_bg = original_bg.resize((IMAGE_WIDTH, image_height))
-            draw = ImageDraw.Draw(original_bg)
-            
-            title_x = (IMAGE_WIDTH - (title_bbox[2] - title_bbox[0])) // 2
-            
-            for dx in [-2, -1, 1, 2]:
-                for dy in [-2, -1, 1, 2]:
-                    draw.text((title_x + dx, TITLE_Y + dy), error_title,
-                            font=title_font, fill=(0, 0, 0))
-            
-            draw.text((title_x, TITLE_Y), error_title,
-                    font=title_font, fill=(255, 255, 255))
-            
-            dark_color = (30, 30, 40)
-            box_x = (IMAGE_WIDTH - BOX_WIDTH) // 2
-            draw.rectangle(
-                [box_x, box_y, box_x + BOX_WIDTH, box_y + box_height],
-                fill=dark_color
+            key = self.render_cache.make_key(
+                "message", username, error_title, error_message,
+                files=[background_path]
             )
-            
-            text_start_y = box_y + BOX_PADDING
-            
-            for i, line in enumerate(lines):
-                if line:
-                    bbox = temp_draw.textbbox((0, 0), line, font=message_font)
-                    line_x = box_x + (BOX_WIDTH - (bbox[2] - bbox[0])) // 2
-                    line_y = text_start_y + i * LINE_HEIGHT
-                    
-                    draw.text((line_x, line_y), line,
-                            font=message_font, fill=(255, 255, 255))
-            
-            draw.line([(0, separator_y), (IMAGE_WIDTH, separator_y)],
-                    fill=dark_color, width=2)
-            
-            nick_x = (IMAGE_WIDTH - (nick_bbox[2] - nick_bbox[0])) // 2
-            
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    if dx or dy:
-                        draw.text((nick_x + dx, nick_y + dy), username,
-                                font=message_font, fill=(0, 0, 0))
-            
-            draw.text((nick_x, nick_y), username,
-                    font=message_font, fill=(255, 255, 255))
-            
-            timestamp = _get_unique_id()
-            output_path = os.path.join(
-                output_folder,
-                f"message_{username}_{timestamp}.png"
+            return self.render_cache.get_or_render(
+                key, ".png",
+                lambda output_path: self._render_message_image(
+                    output_path, username, error_title, error_message, background_path
+                )
             )
             
-            original_bg.save(output_path, "PNG", quality=95)
-            return output_path
-            
         except Exception as e:
             logger.error(f"[{self.game_name}] Error generating message image: {e}", exc_info=True)
             return None
 
+    def _render_message_image(self, output_path, username, error_title, error_message, background_path):
+        IMAGE_WIDTH = 600
+        BOX_WIDTH = 560
+        BOX_PADDING = 15
+        TITLE_Y = 15
+        MAX_LINE_WIDTH = 520
+        
+        temp_img = Image.new('RGB', (1, 1))
+        temp_draw = ImageDraw.Draw(temp_img)
+        
+        title_font = self.generator.text_renderer.get_font(32)
+        message_font = self.generator.text_renderer.get_font(16)
+
+        lines = []
+        paragraphs = error_message.split('\n')
+        
+        for paragraph in paragraphs:
+            if not paragraph.strip():
+                lines.append("")
+                continue
+                
+            words = paragraph.split()
+            current_line = ""
+            
+            for word in words:
+                test_line = f"{current_line} {word}".strip() if current_line else word
+                bbox = temp_draw.textbbox((0, 0), test_line, font=message_font)
+                line_width = bbox[2] - bbox[0]
+                
+                if line_width <= MAX_LINE_WIDTH:
+                    current_line = test_line
+                else:
+                    if current_line:
+                        lines.append(current_line)
+                    current_line = word
+        
+            if current_line:
+                lines.append(current_line)
+        
+        title_bbox = temp_draw.textbbox((0, 0), error_title, font=title_font)
+        title_height = title_bbox[3] - title_bbox[1]
+        
+        test_bbox = temp_draw.textbbox((0, 0), "Ay", font=message_font)
+        line_height = test_bbox[3] - test_bbox[1]
+        LINE_HEIGHT = max(28, line_height + 2)
+        
+        text_height = len(lines) * LINE_HEIGHT
+        box_height = text_height + (BOX_PADDING * 2)
+        
+        box_y = TITLE_Y + title_height + 15
+        separator_y = box_y + box_height + 15
+        
+        nick_bbox = temp_draw.textbbox((0, 0), username, font=message_font)
+        nick_height = nick_bbox[3] - nick_bbox[1]
+        nick_y = separator_y + 15
+        
+        image_height = nick_y + nick_height + 15
+        
+        original_bg = Image.open(background_path).convert("RGB")
+        original_bg = original_bg.resize((IMAGE_WIDTH, image_height))
+        draw = ImageDraw.Draw(original_bg)
+        
+        title_x = (IMAGE_WIDTH - (title_bbox[2] - title_bbox[0])) // 2
+        
+        for dx in [-2, -1, 1, 2]:
+            for dy in [-2, -1, 1, 2]:
+                draw.text((title_x + dx, TITLE_Y + dy), error_title,
+                        font=title_font, fill=(0, 0, 0))
+        
+        draw.text((title_x, TITLE_Y), error_title,
+                font=title_font, fill=(255, 255, 255))
+        
+        dark_color = (30, 30, 40)
+        box_x = (IMAGE_WIDTH - BOX_WIDTH) // 2
+        draw.rectangle(
+            [box_x, box_y, box_x + BOX_WIDTH, box_y + box_height],
+            fill=dark_color
+        )
+        
+        text_start_y = box_y + BOX_PADDING
+        
+        for i, line in enumerate(lines):
+            if line:
+                bbox = temp_draw.textbbox((0, 0), line, font=message_font)
+                line_x = box_x + (BOX_WIDTH - (bbox[2] - bbox[0])) // 2
+                line_y = text_start_y + i * LINE_HEIGHT
+                
+                draw.text((line_x, line_y), line,
+                        font=message_font, fill=(255, 255, 255))
+        
+        draw.line([(0, separator_y), (IMAGE_WIDTH, separator_y)],
+                fill=dark_color, width=2)
+        
+        nick_x = (IMAGE_WIDTH - (nick_bbox[2] - nick_bbox[0])) // 2
+        
+        for dx in [-1, 0, 1]:
+            for dy in [-1, 0, 1]:
+                if dx or dy:
+                    draw.text((nick_x + dx, nick_y + dy), username,
+                            font=message_font, fill=(0, 0, 0))
+        
+        draw.text((nick_x, nick_y), username,
+                font=message_font, fill=(255, 255, 255))
+        
+        save_image(original_bg, output_path, "card", format="PNG")
+
     def execute_game(self, command_name: str, args: List[str], file_queue,
                     cache=None, sender: Optional[str] = None,
                     avatar_url: Optional[str] = None) -> None:
@@ -409,12 +423,6 @@ class BaseGamePlugin:
         
         return user_id, user, None
     
-    def update_user_balance(self, user_id, new_balance):
-        if hasattr(self, 'cache') and self.cache and hasattr(self.cache, 'update_user'):
-            self.cache.update_user(user_id, balance=new_balance)
-        else:
-            logger.warning(f"[{self.game_name}] Cache not available for updating balance")
-
     def create_user_info(self, sender, amount, win, balance, user):
         return {  
             "user_id": str(user.get('id', '')),
@@ -0,0 +1,169 @@
+import glob
+import json
+import os
+import threading
+import time
+from logger import logger
+
+class CacheLock:
+
+    def __init__(self, flush=None):
+        self.lock = threading.Lock()
+        self.flush = flush
+        self.owner = None
+        self.local = threading.local()
+
+    def acquire(self, blocking=True, timeout=-1):
+        acquired = self.lock.acquire(blocking, timeout)
+        if acquired:
+            self.owner = threading.get_ident()
+        return acquired
+
+    def release(self):
+        self.owner = None
+        self.lock.release()
+        if getattr(self.local, 'queued', False):
+            self.local.queued = False
+            self.flush()
+
+    def mark_queued(self):
+        if not self.flush:
+            return
+        if self.owner == threading.get_ident():
+            self.local.queued = True
+        else:
+            self.flush()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+class CacheJournal:
+
+    def __init__(self, journal_file="cache_backup.journal", fsync=True):
+        self.journal_file = journal_file
+        self.fsync = fsync
+        self.file = None
+        self.seq = 0
+        self.pending = 0
+        self.queue = []
+        self.sealed = []
+        self.lock = threading.Lock()
+        self.queue_lock = threading.Lock()
+        self.stats = {'appends': 0, 'bytes': 0, 'syncs': 0, 'replayed': 0, 'skipped': 0, 'rotations': 0, 'errors': 0, 'write_ms': 0.0}
+
+    def open(self):
+        with self.lock:
+            if self.file is None:
+                self.file = open(self.journal_file, "a", encoding="utf-8")
+
+    def close(self):
+        self.flush()
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+    def append(self, op, key, value):
+        with self.queue_lock:
+            if self.file is None:
+                return None
+
+            try:
+                line = json.dumps({"seq": self.seq + 1, "op": op, "key": key, "value": value}, ensure_ascii=False) + "\n"
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.critical(f"[CacheJournal] Journal encode error: {e}", exc_info=True)
+                return None
+
+            self.seq += 1
+            self.pending += 1
+            self.queue.append(line)
+            return self.seq
+
+    def flush(self):
+        with self.lock:
+            with self.queue_lock:
+                lines, self.queue = self.queue, []
+            if not lines or self.file is None:
+                return
+
+            start = time.perf_counter()
+            try:
+                payload = "".join(lines)
+                self.file.write(payload)
+                self.file.flush()
+                if self.fsync:
+                    os.fsync(self.file.fileno())
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.critical(f"[CacheJournal] Journal write error: {e}", exc_info=True)
+                return
+
+            self.stats['appends'] += len(lines)
+            self.stats['bytes'] += len(payload)
+            self.stats['syncs'] += 1
+            self.stats['write_ms'] += (time.perf_counter() - start) * 1000
+
+    def _segment_files(self):
+        return glob.glob(f"{glob.escape(self.journal_file)}.*")
+
+    def rotate(self):
+        with self.lock:
+            with self.queue_lock:
+                seq = self.seq
+                self.pending = 0
+            if self.file is not None:
+                self.file.close()
+            if os.path.exists(self.journal_file) and os.path.getsize(self.journal_file):
+                os.replace(self.journal_file, f"{self.journal_file}.{seq}.{time.time_ns()}")
+            self.file = open(self.journal_file, "a", encoding="utf-8")
+            self.sealed = self._segment_files()
+            self.stats['rotations'] += 1
+            return seq
+
+    def drop_segment(self):
+        with self.lock:
+            for path in self.sealed:
+                if os.path.exists(path):
+                    os.remove(path)
+            self.sealed = []
+
+    def replay(self, after_seq=0):
+        entries = []
+        for path in self._segment_files() + [self.journal_file]:
+            if not os.path.exists(path):
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                for line_number, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        logger.warning(f"[CacheJournal] Ignoring torn journal entry at {path}:{line_number}")
+                        continue
+                    self.seq = max(self.seq, entry.get("seq", 0))
+                    if entry.get("seq", 0) <= after_seq:
+                        self.stats['skipped'] += 1
+                        continue
+                    entries.append(entry)
+
+        self.seq = max(self.seq, after_seq)
+        entries.sort(key=lambda entry: entry["seq"])
+        self.stats['replayed'] += len(entries)
+        return entries
+
+    def get_stats(self):
+        with self.queue_lock:
+            return {
+                'seq': self.seq,
+                'pending': self.pending,
+                'queued': len(self.queue),
+                'avg_write_ms': self.stats['write_ms'] / max(1, self.stats['syncs']),
+                **self.stats
+            }
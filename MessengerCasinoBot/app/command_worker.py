@@ -1,11 +1,62 @@
 import importlib
 import os
+import threading
 import time
+import zlib
+from contextlib import contextmanager
 from queue import Queue
 from user_manager import UserManager
 from logger import logger
 
 PLUGINS = {}
+EXCLUSIVE_PLUGINS = set()
+LANE_STATS = []
+LANE_QUEUES = []
+DEFAULT_WORKER_LANES = 4
+SLOW_WAIT_WARNING_MS = 5000
+
+user_creation_lock = threading.Lock()
+
+
+class CommandGate:
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.shared = 0
+        self.exclusive = False
+        self.exclusive_waiting = 0
+
+    @contextmanager
+    def shared_access(self):
+        with self.condition:
+            while self.exclusive or self.exclusive_waiting:
+                self.condition.wait()
+            self.shared += 1
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.shared -= 1
+                if not self.shared:
+                    self.condition.notify_all()
+
+    @contextmanager
+    def exclusive_access(self):
+        with self.condition:
+            self.exclusive_waiting += 1
+            while self.exclusive or self.shared:
+                self.condition.wait()
+            self.exclusive_waiting -= 1
+            self.exclusive = True
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.exclusive = False
+                self.condition.notify_all()
+
+
+command_gate = CommandGate()
 
 def load_plugins():
     plugins_dir = os.path.join(os.path.dirname(__file__), "plugins")
@@ -18,6 +69,8 @@ def load_plugins():
                 
                 command_name = f"/{info['name']}"
                 PLUGINS[command_name] = info
+                if info.get("exclusive"):
+                    EXCLUSIVE_PLUGINS.add(info["name"])
                 logger.info(f"[CommandWorker] Loaded: {command_name}")
                 
                 if "aliases" in info:
@@ -33,8 +86,9 @@ def execute_command(command_data, file_queue, cache):
     sender_name = command_data.get("sender").lower()
     avatar_url = command_data.get("avatar_url")
 
-    user_manager = UserManager(cache)
-    success, message = user_manager.create_user(sender_name, avatar_url)
+    with user_creation_lock:
+        user_manager = UserManager(cache)
+        success, message = user_manager.create_user(sender_name, avatar_url)
 
     if not success:
         logger.warning(f"[CommandWorker] Security: {message}")
@@ -53,37 +107,127 @@ def execute_command(command_data, file_queue, cache):
 
     if command_name in PLUGINS:
         plugin = PLUGINS[command_name]
+        if plugin["name"] in EXCLUSIVE_PLUGINS:
+            access = command_gate.exclusive_access()
+        else:
+            access = command_gate.shared_access()
         try:
-            plugin["execute"](
-                command_name, 
-                args, 
-                file_queue, 
-                cache=cache, 
-                sender=sender_name,
-                avatar_url=avatar_url
-            )
+            with access:
+                plugin["execute"](
+                    command_name, 
+                    args, 
+                    file_queue, 
+                    cache=cache, 
+                    sender=sender_name,
+                    avatar_url=avatar_url
+                )
         except Exception as e:
             logger.critical(f"Error in plugin {plugin['name']}: {e}", exc_info=True)
     else:
         logger.info(f"[CommandWorker] Unknown command: {command_name}")
 
 
-def command_worker(command_queue: Queue, file_queue: Queue, cache):
-    logger.info("[CommandWorker] Command worker starting")
+def get_lane_for_sender(sender, lanes):
+    key = str(sender or "").lower().encode("utf-8")
+    return zlib.crc32(key) % lanes
+
+
+def get_lane_stats():
+    return [
+        {
+            **stats,
+            'depth': LANE_QUEUES[lane_id].qsize(),
+            'avg_wait_ms': round(stats['total_wait_ms'] / max(1, stats['processed']), 1),
+        }
+        for lane_id, stats in enumerate(LANE_STATS)
+    ]
+
+
+def lane_worker(lane_id, lane_queue: Queue, command_queue: Queue, file_queue: Queue, cache):
+    stats = LANE_STATS[lane_id]
+
+    while True:
+        item = lane_queue.get()
+        if item is None:
+            lane_queue.task_done()
+            break
+
+        command_data, queued_at = item
+        wait_ms = round((time.perf_counter() - queued_at) * 1000, 1)
+        stats['busy'] = True
+        run_start = time.perf_counter()
+        try:
+            execute_command(command_data, file_queue, cache)
+        except Exception as e:
+            logger.critical(f"[CommandWorker] Lane {lane_id} error: {e}", exc_info=True)
+        finally:
+            run_ms = round((time.perf_counter() - run_start) * 1000, 1)
+            stats['busy'] = False
+            stats['processed'] += 1
+            stats['total_wait_ms'] += wait_ms
+            stats['max_wait_ms'] = max(stats['max_wait_ms'], wait_ms)
+            stats['last_wait_ms'] = wait_ms
+            stats['last_run_ms'] = run_ms
+
+            log = logger.warning if wait_ms >= SLOW_WAIT_WARNING_MS else logger.info
+            log(
+                f"[CommandWorker] lane={lane_id} done: '{command_data.get('message')}' "
+                f"wait_ms={wait_ms} run_ms={run_ms} depth={lane_queue.qsize()}"
+            )
+            lane_queue.task_done()
+            command_queue.task_done()
+
+
+def command_worker(command_queue: Queue, file_queue: Queue, cache, workers=DEFAULT_WORKER_LANES):
+    logger.info(f"[CommandWorker] Command worker starting with {workers} lanes")
     load_plugins()
 
+    workers = max(1, int(workers))
+    lane_threads = []
+    LANE_STATS.clear()
+    LANE_QUEUES.clear()
+
+    for lane_id in range(workers):
+        lane_queue = Queue()
+        LANE_QUEUES.append(lane_queue)
+        LANE_STATS.append({
+            'lane': lane_id,
+            'busy': False,
+            'processed': 0,
+            'total_wait_ms': 0.0,
+            'max_wait_ms': 0.0,
+            'last_wait_ms': 0.0,
+            'last_run_ms': 0.0,
+        })
+        thread = threading.Thread(
+            target=lane_worker,
+            args=(lane_id, lane_queue, command_queue, file_queue, cache),
+            name=f"CommandLane-{lane_id}",
+            daemon=True
+        )
+        thread.start()
+        lane_threads.append(thread)
+
     while True:
         command_data = command_queue.get()
         if command_data is None:
             break
         try:
             if command_data.get("message"):
-                execute_command(command_data, file_queue, cache)
+                lane_id = get_lane_for_sender(command_data.get("sender"), workers)
+                LANE_QUEUES[lane_id].put((command_data, time.perf_counter()))
+                logger.debug(f"[CommandWorker] Dispatched to lane={lane_id} depth={LANE_QUEUES[lane_id].qsize()}")
+                continue
             else:
                 logger.warning(f"[CommandWorker] No 'message' field in command object")
         except Exception as e:
             logger.critical(f"[CommandWorker] Command worker error: {e}", exc_info=True)
-        finally:
-            command_queue.task_done()
+        command_queue.task_done()
+
+    for lane_queue in LANE_QUEUES:
+        lane_queue.put(None)
+    for thread in lane_threads:
+        thread.join()
+    command_queue.task_done()
 
     logger.critical("[CommandWorker] Command worker stopped.")
\ No newline at end of file
@@ -8,6 +8,8 @@ from email.header import decode_header
 from bs4 import BeautifulSoup
 from PIL import Image, ImageDraw
 from logger import logger
+from media_encoder import save_image
+from send_queue import with_priority, PRIORITY_BROADCAST
 import configparser
 
 
@@ -609,7 +611,7 @@ class EmailMonitor:
             output_dir = self.temp_folder
             os.makedirs(output_dir, exist_ok=True)
             path = os.path.join(output_dir, f"confirm_{user_id}_{int(time.time() * 1000)}.png")
-            img.convert("RGB").save(path, format="PNG", optimize=True)
+            save_image(img.convert("RGB"), path, "card", format="PNG")
             
             return path
             
@@ -624,7 +626,7 @@ class EmailMonitor:
         try:
             image_path = self._create_confirmation_image(user_id, user_name, kwota_pln, coins_added, tytul)
             if image_path:
-                self.file_queue.put(image_path)
+                with_priority(self.file_queue, PRIORITY_BROADCAST).put(image_path)
                 logger.info(f"Confirmation image sent for user {user_id}")
         except Exception as e:
             logger.error(f"Error sending confirmation: {e}")
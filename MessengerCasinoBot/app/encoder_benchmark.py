@@ -0,0 +1,101 @@
+import argparse
+import io
+import os
+import time
+from PIL import Image
+from media_encoder import ENCODER_PROFILES, save_image, save_animation
+
+ASSETS_DIR = os.path.join(os.path.dirname(__file__), "assets")
+IMAGE_EXTENSIONS = (".png", ".webp", ".jpg", ".jpeg", ".gif")
+
+LEGACY_SETTINGS = {
+    "legacy_webp_q100": ("WEBP", {"quality": 100, "optimize": True}),
+    "legacy_webp_q90": ("WEBP", {"quality": 90}),
+    "legacy_png_optimize": ("PNG", {"optimize": True}),
+}
+
+
+def collect_assets(root, limit, max_frames):
+    stills = []
+    animations = []
+
+    for current_root, _, files in os.walk(root):
+        for file_name in sorted(files):
+            if not file_name.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            path = os.path.join(current_root, file_name)
+            try:
+                with Image.open(path) as img:
+                    frame_count = getattr(img, "n_frames", 1)
+                    if frame_count > 1 and len(animations) < limit:
+                        frames = []
+                        for index in range(min(frame_count, max_frames)):
+                            img.seek(index)
+                            frames.append(img.convert("RGBA"))
+                        animations.append((path, frames, img.info.get("duration", 100)))
+                    elif frame_count == 1 and len(stills) < limit:
+                        stills.append((path, img.convert("RGBA")))
+            except Exception as e:
+                print(f"skip {path}: {e}")
+
+            if len(stills) >= limit and len(animations) >= limit:
+                return stills, animations
+
+    return stills, animations
+
+
+def measure(encode):
+    buffer = io.BytesIO()
+    start = time.perf_counter()
+    encode(buffer)
+    return buffer.tell(), (time.perf_counter() - start) * 1000
+
+
+def run(stills, animations):
+    results = {}
+
+    def add(name, fmt, kind, size, encode_ms):
+        row = results.setdefault((name, fmt, kind), {'files': 0, 'bytes': 0, 'encode_ms': 0.0})
+        row['files'] += 1
+        row['bytes'] += size
+        row['encode_ms'] += encode_ms
+
+    for _, img in stills:
+        for fmt in ("WEBP", "PNG"):
+            for profile in ENCODER_PROFILES:
+                add(profile, fmt, "still", *measure(lambda buffer: save_image(img, buffer, profile, format=fmt)))
+        for name, (fmt, options) in LEGACY_SETTINGS.items():
+            add(name, fmt, "still", *measure(lambda buffer: img.save(buffer, format=fmt, **options)))
+
+    for _, frames, duration in animations:
+        for profile in ENCODER_PROFILES:
+            add(profile, "WEBP", "animation", *measure(lambda buffer: save_animation(frames, buffer, profile, duration=duration)))
+        for name, (fmt, options) in LEGACY_SETTINGS.items():
+            if fmt == "WEBP":
+                add(name, fmt, "animation", *measure(lambda buffer: frames[0].save(
+                    buffer, format=fmt, save_all=True, append_images=frames[1:], duration=duration, loop=0, **options
+                )))
+
+    return results
+
+
+def print_report(results):
+    print(f"{'profile':<22}{'format':<7}{'kind':<11}{'files':>6}{'avg KiB':>10}{'avg ms':>9}{'total MiB':>11}")
+    for (name, fmt, kind), row in sorted(results.items(), key=lambda item: (item[0][2], item[0][1], item[1]['bytes'])):
+        files = max(1, row['files'])
+        print(
+            f"{name:<22}{fmt:<7}{kind:<11}{row['files']:>6}"
+            f"{row['bytes'] / files / 1024:>10.1f}{row['encode_ms'] / files:>9.1f}{row['bytes'] / 1024 / 1024:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare encoder profiles on the real asset set")
+    parser.add_argument("assets", nargs="?", default=ASSETS_DIR)
+    parser.add_argument("--limit", type=int, default=40, help="max stills and max animations to sample")
+    parser.add_argument("--max-frames", type=int, default=30, help="frames per animation to encode")
+    args = parser.parse_args()
+
+    stills, animations = collect_assets(args.assets, args.limit, args.max_frames)
+    print(f"Benchmarking {len(stills)} stills and {len(animations)} animations from {args.assets}")
+    print_report(run(stills, animations))
@@ -1,27 +1,268 @@
 import time
 import os
 import random
-from queue import Queue
+import threading
+from queue import Empty
 from logger import logger
+from send_queue import SendQueue, PRIORITY_COSMETIC
+from resource_cache import RenderCache
 from auth import MessengerAuth
 from utils import take_info_screenshot
 from utils import take_error_screenshot
-import time
-def file_worker(file_queue: Queue):
-    max_retries = 3
-    retry_delay = 1
-    sent_startup_avatar = False
-    
-    while True:
+
+DEFAULT_FILE_WORKER_PAGES = 1
+FILE_BATCH_MAX_FILES = 6
+FILE_BATCH_WINDOW_SECONDS = 0.05
+SLOW_SEND_WARNING_MS = 10000
+
+PAGE_STATS = []
+active_pages = {'count': 0}
+active_pages_lock = threading.Lock()
+
+FILE_SELECTORS = [
+    "input.x1s85apg",
+    "input[type='file']",
+    "div[aria-label='Attach'] input"
+]
+
+ALTERNATIVE_SEND_SELECTORS = [
+    "div[aria-label='Send']",
+    "div[aria-label*='send']",
+    "div[data-testid='send-button']",
+]
+
+
+def get_file_worker_stats():
+    return [
+        {
+            **stats,
+            'avg_wait_ms': round(stats['total_wait_ms'] / max(1, stats['files_sent'] + stats['files_failed']), 1),
+            'avg_send_ms': round(stats['total_send_ms'] / max(1, stats['batches']), 1),
+        }
+        for stats in PAGE_STATS
+    ]
+
+
+def _queue_startup_avatar(file_queue):
+    try:
+        avatars_dir = os.path.join(os.path.dirname(__file__), "assets", "avatars")
+        candidates = []
+        if os.path.isdir(avatars_dir):
+            for name in os.listdir(avatars_dir):
+                lower = name.lower()
+                if lower.endswith((".png", ".jpg", ".jpeg", ".webp", ".gif")):
+                    candidates.append(os.path.join(avatars_dir, name))
+        if candidates:
+            avatar_path = random.choice(candidates)
+            file_queue.put(avatar_path, priority=PRIORITY_COSMETIC)
+            logger.info(f"[FileWorker] Startup confirmation avatar queued: {os.path.basename(avatar_path)}")
+            return True
+        logger.warning(f"[FileWorker] No avatar files found in: {avatars_dir}")
+    except Exception as e:
+        logger.warning(f"[FileWorker] Failed to queue startup avatar: {e}")
+    return False
+
+
+def _drain_burst(file_queue, first_item, first_wait_ms):
+    batch = [(first_item, first_wait_ms)]
+    deadline = time.perf_counter() + FILE_BATCH_WINDOW_SECONDS
+    shutdown = False
+
+    while len(batch) < FILE_BATCH_MAX_FILES:
+        remaining = deadline - time.perf_counter()
+        try:
+            file_path, wait_ms = file_queue.get_timed(timeout=remaining) if remaining > 0 else file_queue.get_timed(block=False)
+        except Empty:
+            break
+
+        if file_path is None:
+            shutdown = True
+            break
+        batch.append((file_path, wait_ms))
+
+    return batch, shutdown
+
+
+def _attach_files(page, file_paths):
+    for selector in FILE_SELECTORS:
+        try:
+            page.wait_for_selector(selector, state="attached", timeout=10000)
+            page.set_input_files(selector, file_paths if len(file_paths) > 1 else file_paths[0])
+            return True
+        except Exception:
+            continue
+    return False
+
+
+def _remove_attachments(page):
+    for _ in range(FILE_BATCH_MAX_FILES):
+        try:
+            if not page.is_visible("div[aria-label='Remove attachment']", timeout=500):
+                return
+            page.click("div[aria-label='Remove attachment']")
+        except Exception:
+            return
+
+
+def _send_files(page, file_paths, max_retries=3, retry_delay=1):
+    label = ", ".join(os.path.basename(path) for path in file_paths)
+
+    for attempt in range(max_retries):
+        try:
+            if not _attach_files(page, file_paths):
+                logger.critical("[FileWorker] Could not find file input")
+                if attempt < max_retries - 1:
+                    time.sleep(retry_delay)
+                    continue
+                return False
+
+            try:
+                page.wait_for_selector(
+                    "div[aria-label='Remove attachment']",
+                    timeout=5000
+                )
+            except Exception as upload_error:
+                logger.warning(f"[FileWorker] Attachment load timeout/error: {upload_error}")
+
+            try:
+                page.wait_for_selector(
+                    "div[aria-label='Press enter to send']",
+                    timeout=5000
+                )
+
+                page.click("div[aria-label='Press enter to send']")
+
+                try:
+                    page.wait_for_selector(
+                        "div[aria-label='Remove attachment']",
+                        state="hidden",
+                        timeout=3000
+                    )
+                except:
+                    pass
+
+                return True
+
+            except Exception as send_error:
+                logger.error(f"[FileWorker] Send attempt {attempt + 1} failed for {label}: {send_error}")
+
+                for send_selector in ALTERNATIVE_SEND_SELECTORS:
+                    try:
+                        if page.is_visible(send_selector, timeout=1000):
+                            page.click(send_selector)
+                            logger.info(f"[FileWorker] Clicked alternative send button: {send_selector}")
+                            return True
+                    except:
+                        continue
+
+                if attempt < max_retries - 1:
+                    time.sleep(retry_delay)
+                    _remove_attachments(page)
+                    logger.info("[FileWorker] Removed old attachments before retry")
+
+        except Exception as e:
+            logger.critical(f"[FileWorker] Error in attempt {attempt + 1}: {e}")
+            if attempt < max_retries - 1:
+                time.sleep(retry_delay)
+                continue
+            logger.critical(f"[FileWorker] All {max_retries} attempts failed for: {label}")
+
+    return False
+
+
+def _record_sent(page_id, stats, batch, send_ms, sent):
+    stats['batches'] += 1
+    stats['total_send_ms'] += send_ms
+    stats['last_batch_size'] = len(batch)
+
+    for file_path, wait_ms in batch:
+        stats['total_wait_ms'] += wait_ms
+        stats['max_wait_ms'] = max(stats['max_wait_ms'], wait_ms)
+        if sent:
+            stats['files_sent'] += 1
+        else:
+            stats['files_failed'] += 1
+
+        log = logger.warning if wait_ms + send_ms >= SLOW_SEND_WARNING_MS else logger.info
+        log(
+            f"[FileWorker] page={page_id} {'sent' if sent else 'failed'}: {os.path.basename(file_path)} "
+            f"wait_ms={wait_ms} send_ms={send_ms} batch={len(batch)}"
+        )
+
+
+def _report_failure(page, browser, file_path):
+    logger.critical(f"[FileWorker] Failed to send file after all attempts: {file_path}")
+
+    if browser.is_connected():
+        try:
+            take_error_screenshot(page, f"send_failed_{os.path.basename(file_path)}")
+        except Exception as screenshot_error:
+            logger.error(f"[FileWorker] Failed to take error screenshot: {screenshot_error}")
+
+
+def _process_batch(page_id, page, browser, stats, batch):
+    try:
+        _send_batch(page_id, page, browser, stats, batch)
+    finally:
+        render_cache = RenderCache.get_instance()
+        for file_path, _ in batch:
+            render_cache.release(file_path)
+
+
+def _send_batch(page_id, page, browser, stats, batch):
+    ready = []
+    for file_path, wait_ms in batch:
+        if os.path.exists(file_path):
+            ready.append((file_path, wait_ms))
+        else:
+            logger.error(f"[FileWorker] File does not exist: {file_path}")
+            stats['files_failed'] += 1
+
+    if not ready:
+        return
+
+    send_start = time.perf_counter()
+    sent = _send_files(page, [file_path for file_path, _ in ready])
+    send_ms = round((time.perf_counter() - send_start) * 1000, 1)
+
+    if sent or len(ready) == 1:
+        _record_sent(page_id, stats, ready, send_ms, sent)
+        if not sent:
+            _report_failure(page, browser, ready[0][0])
+        return
+
+    logger.warning(f"[FileWorker] page={page_id} batch of {len(ready)} failed, sending files one by one")
+    _remove_attachments(page)
+    for item in ready:
+        send_start = time.perf_counter()
+        item_sent = _send_files(page, [item[0]])
+        _record_sent(page_id, stats, [item], round((time.perf_counter() - send_start) * 1000, 1), item_sent)
+        if not item_sent:
+            _report_failure(page, browser, item[0])
+
+
+def _release_page():
+    with active_pages_lock:
+        active_pages['count'] -= 1
+        return active_pages['count']
+
+
+def page_worker(page_id, file_queue: SendQueue):
+    stats = PAGE_STATS[page_id]
+    sent_startup_avatar = page_id != 0
+    shutdown = False
+
+    while not shutdown:
         try:
             auth = MessengerAuth()
             page, browser, playwright = auth.log_in_to_messenger()
-    
+
             if not page:
-                logger.critical("[FileWorker] Failed to log in")
+                logger.critical(f"[FileWorker] page={page_id} Failed to log in")
                 continue
 
-            logger.info("[FileWorker] Ready to send files")
+            logger.info(f"[FileWorker] page={page_id} Ready to send files")
+            stats['ready'] = True
 
             try:
                 take_info_screenshot(page, "ready_to_send_files")
@@ -29,142 +270,30 @@ def file_worker(file_queue: Queue):
                 logger.error(f"[FileWorker] Failed to take screenshot: {e}")
 
             if not sent_startup_avatar:
-                try:
-                    avatars_dir = os.path.join(os.path.dirname(__file__), "assets", "avatars")
-                    candidates = []
-                    if os.path.isdir(avatars_dir):
-                        for name in os.listdir(avatars_dir):
-                            lower = name.lower()
-                            if lower.endswith((".png", ".jpg", ".jpeg", ".webp", ".gif")):
-                                candidates.append(os.path.join(avatars_dir, name))
-                    if candidates:
-                        avatar_path = random.choice(candidates)
-                        file_queue.put(avatar_path)
-                        sent_startup_avatar = True
-                        logger.info(f"[FileWorker] Startup confirmation avatar queued: {os.path.basename(avatar_path)}")
-                    else:
-                        logger.warning(f"[FileWorker] No avatar files found in: {avatars_dir}")
-                except Exception as e:
-                    logger.warning(f"[FileWorker] Failed to queue startup avatar: {e}")
+                sent_startup_avatar = _queue_startup_avatar(file_queue)
 
             while True:
-                file_path = file_queue.get()
+                file_path, wait_ms = file_queue.get_timed()
 
                 if file_path is None:
-                    logger.critical("[FileWorker] Received shutdown signal")
+                    logger.critical(f"[FileWorker] page={page_id} Received shutdown signal")
+                    shutdown = True
+                    file_queue.task_done()
                     break
 
-                file_sent = False
-                
-                for attempt in range(max_retries):
-                    try:
-                        if not os.path.exists(file_path):
-                            logger.error(f"[FileWorker] File does not exist: {file_path}")
-                            break
-   
-                        file_input_found = False
-                        file_selectors = [
-                            "input.x1s85apg",
-                            "input[type='file']",
-                            "div[aria-label='Attach'] input"
-                        ]
-
-                        for selector in file_selectors:
-                            try:
-                                page.wait_for_selector(selector, state="attached", timeout=10000)
-                                page.set_input_files(selector, file_path)
-                                file_input_found = True
-                                break
-                            except Exception as e:
-                                continue
-
-                        if not file_input_found:
-                            logger.critical("[FileWorker] Could not find file input")
-                            if attempt < max_retries - 1:
-                                time.sleep(retry_delay)
-                                continue
-                            else:
-                                break
-
-                        try:
-                            page.wait_for_selector(
-                                "div[aria-label='Remove attachment']",
-                                timeout=5000
-                            )
-                        except Exception as upload_error:
-                            logger.warning(f"[FileWorker] Attachment load timeout/error: {upload_error}")
-
-                        try:
-                            page.wait_for_selector(
-                                "div[aria-label='Press enter to send']",
-                                timeout=5000
-                            )
-                            
-                            page.click("div[aria-label='Press enter to send']")
-
-                            try:
-                                page.wait_for_selector(
-                                    "div[aria-label='Remove attachment']",
-                                    state="hidden",
-                                    timeout=3000
-                                )
-                            except:
-                                pass
-                            
-                            file_sent = True
-                            logger.info(f"[FileWorker] File sent successfully: {os.path.basename(file_path)}")
-                            break
-                            
-                        except Exception as send_error:
-                            logger.error(f"[FileWorker] Send attempt {attempt + 1} failed: {send_error}")
-                            
-                            alternative_send_selectors = [
-                                "div[aria-label='Send']",
-                                "div[aria-label*='send']",
-                                "div[data-testid='send-button']",
-                            ]
-                            
-                            for send_selector in alternative_send_selectors:
-                                try:
-                                    if page.is_visible(send_selector, timeout=1000):
-                                        page.click(send_selector)
-                                        logger.info(f"[FileWorker] Clicked alternative send button: {send_selector}")
-                                        file_sent = True
-                                        break
-                                except:
-                                    continue
-                            
-                            if file_sent:
-                                break
-                            
-                            if attempt < max_retries - 1:
-                                time.sleep(retry_delay)
-                                
-                                try:
-                                    page.click("div[aria-label='Remove attachment']")
-                                    logger.info("[FileWorker] Removed old attachment before retry")
-                                except:
-                                    pass
-
-                    except Exception as e:
-                        logger.critical(f"[FileWorker] Error in attempt {attempt + 1}: {e}")
-                        if attempt < max_retries - 1:
-                            time.sleep(retry_delay)
-                            continue
-                        else:
-                            logger.critical(f"[FileWorker] All {max_retries} attempts failed for: {file_path}")
-                            break
-
-                if not file_sent:
-                    logger.critical(f"[FileWorker] Failed to send file after all attempts: {file_path}")
-                    
-                    if browser.is_connected():
-                        try:
-                            take_error_screenshot(page, f"send_failed_{os.path.basename(file_path)}")
-                        except Exception as screenshot_error:
-                            logger.error(f"[FileWorker] Failed to take error screenshot: {screenshot_error}")
-
-                file_queue.task_done()
+                batch, shutdown = _drain_burst(file_queue, file_path, wait_ms)
+                try:
+                    _process_batch(page_id, page, browser, stats, batch)
+                finally:
+                    for _ in batch:
+                        file_queue.task_done()
+
+                if shutdown:
+                    logger.critical(f"[FileWorker] page={page_id} Received shutdown signal")
+                    file_queue.task_done()
+                    break
+
+            stats['ready'] = False
 
             try:
                 browser.close()
@@ -176,14 +305,48 @@ def file_worker(file_queue: Queue):
             except:
                 pass
 
-            if file_path is None:
-                break
-
         except KeyboardInterrupt:
-            logger.critical("[FileWorker] File worker interrupted")
+            logger.critical(f"[FileWorker] page={page_id} File worker interrupted")
             break
         except Exception as e:
-            logger.critical(f"[FileWorker] File worker error: {e}", exc_info=True)
+            stats['ready'] = False
+            logger.critical(f"[FileWorker] page={page_id} File worker error: {e}", exc_info=True)
             time.sleep(10)
 
+    if _release_page() > 0:
+        file_queue.put(None)
+
+    logger.critical(f"[FileWorker] page={page_id} File worker stopped")
+
+
+def file_worker(file_queue: SendQueue, pages=DEFAULT_FILE_WORKER_PAGES):
+    pages = max(1, int(pages))
+    PAGE_STATS.clear()
+    active_pages['count'] = pages
+
+    for page_id in range(pages):
+        PAGE_STATS.append({
+            'page': page_id,
+            'ready': False,
+            'batches': 0,
+            'files_sent': 0,
+            'files_failed': 0,
+            'last_batch_size': 0,
+            'total_wait_ms': 0.0,
+            'max_wait_ms': 0.0,
+            'total_send_ms': 0.0,
+        })
+
+    page_threads = [
+        threading.Thread(target=page_worker, args=(page_id, file_queue), name=f"FilePage-{page_id}", daemon=True)
+        for page_id in range(1, pages)
+    ]
+    for thread in page_threads:
+        thread.start()
+
+    page_worker(0, file_queue)
+
+    for thread in page_threads:
+        thread.join()
+
     logger.critical("[FileWorker] File worker stopped")
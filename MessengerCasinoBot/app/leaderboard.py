@@ -0,0 +1,156 @@
+import random
+
+LEADERBOARD_MAX_LEVEL = 24
+
+def balance_key(user):
+    return (-user.get("balance", 0),)
+
+def level_key(user):
+    return (-user.get("level", 1), -user.get("level_progress", 0.0))
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key, level):
+        self.key = key
+        self.next = [None] * level
+        self.width = [1] * level
+
+class SkipList:
+
+    def __init__(self, max_level=LEADERBOARD_MAX_LEVEL):
+        self.max_level = max_level
+        self.head = _Node(None, max_level)
+        self.level = 1
+        self.size = 0
+        self.random = random.Random()
+
+    def __len__(self):
+        return self.size
+
+    def _random_level(self):
+        level = 1
+        while level < self.max_level and self.random.random() < 0.5:
+            level += 1
+        return level
+
+    def _find_predecessors(self, key):
+        node = self.head
+        position = 0
+        predecessors = [self.head] * self.max_level
+        positions = [0] * self.max_level
+        for level in range(self.level - 1, -1, -1):
+            while node.next[level] is not None and node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+            predecessors[level] = node
+            positions[level] = position
+        return predecessors, positions
+
+    def add(self, key):
+        predecessors, positions = self._find_predecessors(key)
+        new_position = positions[0] + 1
+        node = _Node(key, self._random_level())
+
+        if len(node.next) > self.level:
+            for level in range(self.level, len(node.next)):
+                self.head.width[level] = self.size + 1
+            self.level = len(node.next)
+
+        for level in range(self.level):
+            predecessor = predecessors[level]
+            if level < len(node.next):
+                node.next[level] = predecessor.next[level]
+                node.width[level] = positions[level] + predecessor.width[level] + 1 - new_position
+                predecessor.next[level] = node
+                predecessor.width[level] = new_position - positions[level]
+            else:
+                predecessor.width[level] += 1
+        self.size += 1
+
+    def remove(self, key):
+        predecessors, _ = self._find_predecessors(key)
+        node = predecessors[0].next[0]
+        if node is None or node.key != key:
+            return False
+
+        for level in range(self.level):
+            predecessor = predecessors[level]
+            if predecessor.next[level] is node:
+                predecessor.width[level] += node.width[level] - 1
+                predecessor.next[level] = node.next[level]
+            else:
+                predecessor.width[level] -= 1
+        self.size -= 1
+        return True
+
+    def index(self, key):
+        _, positions = self._find_predecessors(key)
+        return positions[0]
+
+    def _node_at(self, index):
+        node = self.head
+        position = 0
+        target = index + 1
+        for level in range(self.level - 1, -1, -1):
+            while node.next[level] is not None and position + node.width[level] <= target:
+                position += node.width[level]
+                node = node.next[level]
+        return node
+
+    def slice(self, offset=0, limit=None):
+        end = self.size if limit is None else min(self.size, offset + limit)
+        if offset >= end:
+            return []
+
+        node = self._node_at(offset)
+        keys = []
+        while node is not None and len(keys) < end - offset:
+            keys.append(node.key)
+            node = node.next[0]
+        return keys
+
+class Leaderboard:
+
+    def __init__(self, key_func):
+        self.key_func = key_func
+        self.entries = SkipList()
+        self.keys = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def make_key(self, user_id, user):
+        if not isinstance(user, dict):
+            return None
+        return self.key_func(user) + (len(user_id), user_id)
+
+    def update(self, user_id, user):
+        new_key = self.make_key(user_id, user)
+        old_key = self.keys.get(user_id)
+
+        if new_key == old_key:
+            return False
+
+        if old_key is not None:
+            self.entries.remove(old_key)
+
+        if new_key is None:
+            self.keys.pop(user_id, None)
+        else:
+            self.entries.add(new_key)
+            self.keys[user_id] = new_key
+        return True
+
+    def clear(self):
+        self.entries = SkipList()
+        self.keys = {}
+
+    def rank(self, user_id):
+        key = self.keys.get(user_id)
+        if key is None:
+            return None
+        return self.entries.index(key) + 1
+
+    def slice(self, offset=0, limit=None):
+        return [key[-1] for key in self.entries.slice(offset, limit)]
@@ -3,18 +3,23 @@ from threading import Thread
 from app_cache import AppCache
 from command_worker import command_worker
 from file_worker import file_worker
+from send_queue import SendQueue
 from logger import logger
 from message_handler import start_monitoring_messages
 from plugins.math_challenge import get_math_plugin_instance
 from email_monitor import start_email_monitor
+from animation_generator import RenderService
+
+COMMAND_WORKER_LANES = 4
+FILE_WORKER_PAGES = 1
 
 def main():
     cache = AppCache(autosave_interval=60)
     command_queue = Queue()
-    file_queue = Queue()
+    file_queue = SendQueue()
 
-    cmd_thread = Thread(target=command_worker, args=(command_queue, file_queue, cache), daemon=True)
-    file_thread = Thread(target=file_worker, args=(file_queue,), daemon=True)
+    cmd_thread = Thread(target=command_worker, args=(command_queue, file_queue, cache, COMMAND_WORKER_LANES), daemon=True)
+    file_thread = Thread(target=file_worker, args=(file_queue, FILE_WORKER_PAGES), daemon=True)
 
     cmd_thread.start()
     file_thread.start()
@@ -47,6 +52,7 @@ def main():
         cmd_thread.join()
         file_thread.join()
         cache.save_to_disk()
+        RenderService.get_instance().shutdown()
         logger.critical("[MAIN] All workers stopped.")
 
 if __name__ == "__main__":
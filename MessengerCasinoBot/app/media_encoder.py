@@ -0,0 +1,144 @@
+import os
+import threading
+import time
+from PIL import Image
+from logger import logger
+
+ENCODER_PROFILES = {
+    "card": {"quality": 85, "method": 4, "compress_level": 6, "colors": None, "max_size": None},
+    "palette_card": {"quality": 85, "method": 4, "compress_level": 6, "colors": 256, "max_size": None},
+    "animation": {"quality": 80, "method": 4, "compress_level": 6, "colors": None, "max_size": None},
+    "intermediate": {"quality": 90, "method": 0, "compress_level": 1, "colors": None, "max_size": None},
+}
+DEFAULT_PROFILE = "card"
+
+encoder_stats = {}
+encoder_stats_lock = threading.Lock()
+
+
+def get_profile(profile, **overrides):
+    if profile not in ENCODER_PROFILES:
+        logger.warning(f"[MediaEncoder] Unknown profile '{profile}', using {DEFAULT_PROFILE}")
+        profile = DEFAULT_PROFILE
+    settings = dict(ENCODER_PROFILES[profile])
+    settings.update({key: value for key, value in overrides.items() if value is not None})
+    return profile, settings
+
+
+def _resolve_format(output, format):
+    if format:
+        return format.upper()
+    if isinstance(output, str):
+        extension = os.path.splitext(output)[1].lower()
+        return Image.registered_extensions().get(extension, "PNG")
+    return "PNG"
+
+
+def _save_kwargs(fmt, settings):
+    if fmt == "WEBP":
+        return {"quality": settings["quality"], "method": settings["method"]}
+    if fmt == "PNG":
+        return {"compress_level": settings["compress_level"]}
+    if fmt == "JPEG":
+        return {"quality": settings["quality"]}
+    return {}
+
+
+def _prepare(img, fmt, settings):
+    max_size = settings.get("max_size")
+    if max_size and (img.width > max_size[0] or img.height > max_size[1]):
+        img = img.copy()
+        img.thumbnail(max_size, Image.Resampling.LANCZOS)
+
+    colors = settings.get("colors")
+    if colors and fmt == "PNG" and img.mode != "P":
+        source = img if img.mode in ("RGB", "RGBA") else img.convert("RGBA")
+        img = source.quantize(colors=colors, method=Image.Quantize.FASTOCTREE)
+
+    return img
+
+
+def _record(profile, output, started):
+    encode_ms = (time.perf_counter() - started) * 1000
+    try:
+        size = os.path.getsize(output) if isinstance(output, str) else output.tell()
+    except Exception:
+        size = 0
+
+    with encoder_stats_lock:
+        stats = encoder_stats.setdefault(profile, {'saves': 0, 'bytes': 0, 'encode_ms': 0.0})
+        stats['saves'] += 1
+        stats['bytes'] += size
+        stats['encode_ms'] += encode_ms
+
+
+def save_image(img, output, profile=DEFAULT_PROFILE, format=None, **overrides):
+    started = time.perf_counter()
+    profile, settings = get_profile(profile, **overrides)
+    fmt = _resolve_format(output, format)
+
+    _prepare(img, fmt, settings).save(output, format=fmt, **_save_kwargs(fmt, settings))
+    _record(profile, output, started)
+    return output
+
+
+def save_animation(frames, output, profile="animation", duration=100, loop=0, format="WEBP", **overrides):
+    started = time.perf_counter()
+    profile, settings = get_profile(profile, **overrides)
+    fmt = _resolve_format(output, format)
+
+    if isinstance(frames, Image.Image):
+        first, rest = frames, []
+    else:
+        frames = [_prepare(frame, fmt, settings) for frame in frames]
+        first, rest = frames[0], frames[1:]
+
+    first.save(
+        output,
+        format=fmt,
+        save_all=True,
+        append_images=rest,
+        duration=duration,
+        loop=loop,
+        **_save_kwargs(fmt, settings)
+    )
+    _record(profile, output, started)
+    return output
+
+
+def reencode(path, profile):
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        with Image.open(path) as img:
+            fmt = img.format
+            frame_count = getattr(img, "n_frames", 1)
+            frames, durations = [], []
+            for index in range(frame_count):
+                img.seek(index)
+                img.load()
+                durations.append(img.info.get("duration", 100))
+                frames.append(img.convert("RGBA") if frame_count > 1 else img.copy())
+            loop = img.info.get("loop", 0)
+
+        if frame_count > 1:
+            save_animation(frames, tmp_path, profile, duration=durations, loop=loop, format=fmt)
+        else:
+            save_image(frames[0], tmp_path, profile, format=fmt)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning(f"[MediaEncoder] Could not re-encode {path} as {profile}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def get_encoder_stats():
+    with encoder_stats_lock:
+        return {
+            profile: {
+                **stats,
+                'avg_bytes': round(stats['bytes'] / max(1, stats['saves'])),
+                'avg_encode_ms': round(stats['encode_ms'] / max(1, stats['saves']), 1),
+            }
+            for profile, stats in encoder_stats.items()
+        }
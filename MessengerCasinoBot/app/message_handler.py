@@ -1,20 +1,202 @@
 import os
 import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime as dt
 from utils import take_error_screenshot
 from utils import take_info_screenshot
 from auth import MessengerAuth
 from logger import logger
+from processed_store import ProcessedMessageStore
+from resource_cache import RenderCache
 
 last_message_time = None
 initial_load_done = False
-processed_in_session = set()
+processed_messages = ProcessedMessageStore()
+last_scanned_message_id = None
 
 BASE_DIR = os.path.dirname(__file__)
 TEMP_DIR = os.path.join(BASE_DIR, "temp")
 LOG_PREVIEW_LEN = 140
 
+USE_DOM_SNAPSHOT = True
+SCAN_CONTEXT_ROWS = 5
+NAME_MAPPING_MAX = 500
+USE_MUTATION_OBSERVER = True
+OBSERVER_WATCHDOG_SECONDS = 30
+OBSERVER_PUMP_MS = 250
+OBSERVER_BINDING_NAME = "__casinoBotRowsAdded"
+
+SNAPSHOT_SELECTORS = {
+    "rows": [
+        "div[data-scope='messages_table'][aria-roledescription='message'][aria-label]",
+        "div[role='row']",
+        "[role='article'][aria-label]",
+    ],
+    "skip_class": "x9f619 x1n2onr6 x1ja2u2z",
+    "gridcell": "div[role='gridcell']",
+    "message": ["[data-lexical-editor='true']", "div[dir='auto']"],
+    "media": "a[href*='/messenger_media/?attachment_id='], a[href*='messenger_media'][role='link']",
+    "gif": "img[alt='GIF Image']",
+    "avatar": "img.x1rg5ohu, [role='row'] img",
+}
+
+# Reads rows bottom-up in one page.evaluate call, stopping SCAN_CONTEXT_ROWS past stop_at_id;
+# Python-side rules live in collect_rows_snapshot
+SNAPSHOT_ROWS_JS = """
+({ sel, stop_at_id, context_rows }) => {
+    let rows = [];
+    for (const selector of sel.rows) {
+        rows = Array.from(document.querySelectorAll(selector));
+        if (rows.length) break;
+    }
+
+    const readRow = (row, context) => {
+        if (row.getAttribute('class') === sel.skip_class) {
+            return { skip: true, context };
+        }
+
+        const gridcell = row.querySelector(sel.gridcell) || row;
+        let messageEl = null;
+        for (const selector of sel.message) {
+            messageEl = gridcell.querySelector(selector);
+            if (messageEl) break;
+        }
+
+        const hasYouSentSpan = Array.from(row.querySelectorAll('span'))
+            .some(span => (span.textContent || '').includes('You sent'));
+        const avatar = row.querySelector(sel.avatar);
+
+        return {
+            skip: false,
+            context,
+            data_message_id: row.getAttribute('data-message-id'),
+            message_text: messageEl ? (messageEl.innerText || '') : '',
+            has_media: !!row.querySelector(sel.media),
+            has_gif: !!row.querySelector(sel.gif),
+            aria_label: row.getAttribute('aria-label'),
+            row_text: row.innerText || '',
+            has_you_sent_span: hasYouSentSpan,
+            has_avatar: !!avatar,
+            avatar_alt: avatar ? avatar.getAttribute('alt') : null,
+            avatar_src: avatar ? avatar.getAttribute('src') : null,
+        };
+    };
+
+    const picked = [];
+    let contextLeft = -1;
+    for (let i = rows.length - 1; i >= 0; i--) {
+        const row = rows[i];
+        if (contextLeft < 0 && stop_at_id && row.getAttribute('data-message-id') === stop_at_id) {
+            contextLeft = context_rows;
+        }
+        if (contextLeft === 0) break;
+        if (contextLeft > 0) contextLeft--;
+        picked.push(readRow(row, contextLeft >= 0));
+    }
+    return picked.reverse();
+}
+"""
+
+OBSERVER_INSTALL_JS = """
+({ binding, rows }) => {
+    const state = window.__casinoBotObserver;
+    if (state && state.target && state.target.isConnected) {
+        return false;
+    }
+    if (state && state.observer) {
+        state.observer.disconnect();
+    }
+
+    const rowSelector = rows.join(', ');
+    const firstRow = document.querySelector(rowSelector);
+    const target = (firstRow && (firstRow.closest("[role='grid']") || firstRow.parentElement)) || document.body;
+
+    let scheduled = false;
+    let added = 0;
+    const observer = new MutationObserver(mutations => {
+        for (const mutation of mutations) {
+            for (const node of mutation.addedNodes) {
+                if (node.nodeType !== Node.ELEMENT_NODE) continue;
+                if (node.matches(rowSelector) || node.querySelector(rowSelector)) {
+                    added++;
+                }
+            }
+        }
+        if (added && !scheduled) {
+            scheduled = true;
+            queueMicrotask(() => {
+                const count = added;
+                added = 0;
+                scheduled = false;
+                window[binding](count);
+            });
+        }
+    });
+    observer.observe(target, { childList: true, subtree: true });
+    window.__casinoBotObserver = { observer, target };
+    return true;
+}
+"""
+
+
+class MessageObserver:
+    def __init__(self, page):
+        self.page = page
+        self.pending_rows = 0
+        self.wakeups = 0
+        self.watchdog_scans = 0
+
+    def _on_rows_added(self, source, count):
+        self.pending_rows += int(count or 0)
+
+    def install(self):
+        self.page.expose_binding(OBSERVER_BINDING_NAME, self._on_rows_added)
+        self.ensure_attached()
+        logger.info("[MessageHandler] MutationObserver bridge installed")
+
+    def ensure_attached(self):
+        attached = self.page.evaluate(OBSERVER_INSTALL_JS, {
+            "binding": OBSERVER_BINDING_NAME,
+            "rows": SNAPSHOT_SELECTORS["rows"],
+        })
+        if attached:
+            logger.debug("[MessageHandler] MutationObserver attached to messages table")
+        return attached
+
+    def wait_for_rows(self, timeout_seconds):
+        wait_start = time.perf_counter()
+        self.ensure_attached()
+
+        deadline = time.time() + timeout_seconds
+        while self.pending_rows == 0 and time.time() < deadline:
+            self.page.wait_for_timeout(OBSERVER_PUMP_MS)
+
+        rows_added = self.pending_rows
+        self.pending_rows = 0
+        if rows_added:
+            self.wakeups += 1
+            logger.debug(f"[MessageHandler] observer_wake rows_added={rows_added} waited_ms={_perf_ms(wait_start)}")
+        else:
+            self.watchdog_scans += 1
+            logger.debug(
+                f"[MessageHandler] observer_watchdog timeout={timeout_seconds}s "
+                f"wakeups={self.wakeups} watchdog_scans={self.watchdog_scans}"
+            )
+        return rows_added
+
+
+def install_message_observer(page):
+    if not USE_MUTATION_OBSERVER:
+        return None
+    try:
+        observer = MessageObserver(page)
+        observer.install()
+        return observer
+    except Exception as e:
+        logger.warning(f"[MessageHandler] MutationObserver bridge unavailable, using polling only: {e}")
+        return None
+
 
 def _preview(text, limit=LOG_PREVIEW_LEN):
     if text is None:
@@ -29,6 +211,43 @@ def _perf_ms(start):
     return round((time.perf_counter() - start) * 1000, 1)
 
 
+def parse_sender_and_message_from_aria(aria_label):
+    if not aria_label:
+        return None, None
+
+    aria = aria_label.strip()
+    if aria.lower().startswith("at "):
+        parts = aria.split(",", 1)
+        if len(parts) == 2:
+            rest = parts[1].strip()
+            if ": " in rest:
+                sender, msg = rest.split(": ", 1)
+                return sender.strip(), msg.strip()
+            if ":" in rest:
+                sender, msg = rest.split(":", 1)
+                return sender.strip(), msg.strip()
+            return rest.strip(), ""
+
+    if " by " in aria:
+        after_by = aria.split(" by ", 1)[1].strip()
+        if ": " in after_by:
+            sender, msg = after_by.split(": ", 1)
+            return sender.strip(), msg.strip()
+        if ":" in after_by:
+            sender, msg = after_by.split(":", 1)
+            return sender.strip(), msg.strip()
+        return after_by.strip(), ""
+
+    if ": " in aria:
+        head, msg = aria.rsplit(": ", 1)
+        if "," in head:
+            sender = head.split(",")[-1].strip()
+            return sender, msg.strip()
+        return None, msg.strip()
+
+    return None, None
+
+
 def update_last_message_time():
     global last_message_time
     last_message_time = dt.now()
@@ -85,11 +304,18 @@ def get_sleep_time():
 
 
 pending_unknown_messages = []
+known_full_names = OrderedDict()
+
+def remember_full_name(first_name, full_name):
+    known_full_names[first_name] = full_name
+    known_full_names.move_to_end(first_name)
+    while len(known_full_names) > NAME_MAPPING_MAX:
+        known_full_names.popitem(last=False)
 
 def fill_unknown_senders(messages):
     global USER_NAME_CACHE, pending_unknown_messages
     
-    name_mapping = {}
+    name_mapping = dict(known_full_names)
     for msg in messages:
         sender = msg.get("sender")
         avatar_url = msg.get("avatar_url")
@@ -99,6 +325,7 @@ def fill_unknown_senders(messages):
                 first_name = sender.split()[0]
                 name_mapping[first_name] = sender
                 name_mapping[sender] = sender
+                remember_full_name(first_name, sender)
     
     next_known_sender = None
     next_known_avatar = None
@@ -168,130 +395,205 @@ def fill_unknown_senders(messages):
     return unknown_after
 
 
+def collect_rows_per_element(page, cycle_id, stop_at_id=None):
+    rows_local = page.query_selector_all(
+        "div[data-scope='messages_table'][aria-roledescription='message'][aria-label]"
+    )
+    if not rows_local:
+        rows_local = page.query_selector_all("div[role='row']")
+    if not rows_local:
+        rows_local = page.query_selector_all("[role='article'][aria-label]")
+    
+    logger.debug(f"[MessageHandler] collect_messages id={cycle_id}: rows_found={len(rows_local)}")
+    context_messages = []
+    new_messages = []
+    context_left = -1
+    
+    for row in reversed(rows_local):
+        try:
+            data_message_id = row.get_attribute("data-message-id")
+
+            if context_left < 0 and stop_at_id and data_message_id == stop_at_id:
+                context_left = SCAN_CONTEXT_ROWS
+            if context_left == 0:
+                break
+            if context_left > 0:
+                context_left -= 1
+            messages_local = context_messages if context_left >= 0 else new_messages
+            
+            gridcell = row.query_selector("div[role='gridcell']") or row
+
+            if row.get_attribute("class") == "x9f619 x1n2onr6 x1ja2u2z":
+                continue
+            
+            you_sent_element = row.query_selector('span:has-text("You sent")')
+            
+            message_el = (
+                gridcell.query_selector("[data-lexical-editor='true']")
+                or gridcell.query_selector("div[dir='auto']")
+            )
+            message_text = message_el.inner_text().strip() if message_el else ""
+
+            if message_text == "":
+                if row.query_selector("a[href*='/messenger_media/?attachment_id='], a[href*='messenger_media'][role='link']"):
+                    message_text = "media_attachment"
+                elif row.query_selector("img[alt='GIF Image']"):
+                    message_text = "gif_attachment"
+
+            if message_text == "":
+                aria_label = row.get_attribute("aria-label")
+                if aria_label and any(word in aria_label.lower() for word in ["like", "thumbs", "reaction", "emoji"]):
+                    message_text = "reaction"
+
+            if message_text == "Enter":
+                continue
+                
+            avatar = row.query_selector("img.x1rg5ohu, [role='row'] img")
+            row_text = row.inner_text().lower()
+            aria_label = row.get_attribute("aria-label") or ""
+            aria_label_lower = aria_label.lower()
+            contains_you_sent = (
+                bool(you_sent_element)
+                or ("you sent" in row_text)
+                or ("you sent" in aria_label_lower)
+            )
+            avatar_url = None
+            
+            if contains_you_sent:
+                sender_name = "You"
+            elif avatar:
+                sender_name = avatar.get_attribute("alt")
+                avatar_url = avatar.get_attribute("src")
+            else:
+                sender_name = "Unknown"
+                if message_text == "":
+                    parsed_sender, parsed_msg = parse_sender_and_message_from_aria(aria_label)
+                    if parsed_msg:
+                        message_text = parsed_msg
+                
+            messages_local.append({
+                "sender": sender_name,
+                "message": message_text,
+                "avatar_url": avatar_url,
+                "has_you_sent": contains_you_sent,
+                "data_message_id": data_message_id,
+            })
+        except Exception as e:
+            logger.warning(f"[MessageHandler] Error during message extraction: {e}")
+            take_error_screenshot(page, "message_extraction")
+
+    context_messages.reverse()
+    new_messages.reverse()
+    return context_messages, new_messages
+
+
+def collect_rows_snapshot(page, cycle_id, stop_at_id=None):
+    rows = page.evaluate(SNAPSHOT_ROWS_JS, {
+        "sel": SNAPSHOT_SELECTORS,
+        "stop_at_id": stop_at_id,
+        "context_rows": SCAN_CONTEXT_ROWS,
+    })
+    logger.debug(f"[MessageHandler] collect_messages id={cycle_id}: rows_found={len(rows)} (snapshot)")
+
+    context_messages = []
+    new_messages = []
+    for row in rows:
+        messages_local = context_messages if row.get("context") else new_messages
+        if row.get("skip"):
+            continue
+
+        message_text = (row.get("message_text") or "").strip()
+
+        if message_text == "":
+            if row.get("has_media"):
+                message_text = "media_attachment"
+            elif row.get("has_gif"):
+                message_text = "gif_attachment"
+
+        aria_label = row.get("aria_label") or ""
+        aria_label_lower = aria_label.lower()
+
+        if message_text == "":
+            if aria_label and any(word in aria_label_lower for word in ["like", "thumbs", "reaction", "emoji"]):
+                message_text = "reaction"
+
+        if message_text == "Enter":
+            continue
+
+        contains_you_sent = (
+            bool(row.get("has_you_sent_span"))
+            or ("you sent" in (row.get("row_text") or "").lower())
+            or ("you sent" in aria_label_lower)
+        )
+        avatar_url = None
+
+        if contains_you_sent:
+            sender_name = "You"
+        elif row.get("has_avatar"):
+            sender_name = row.get("avatar_alt")
+            avatar_url = row.get("avatar_src")
+        else:
+            sender_name = "Unknown"
+            if message_text == "":
+                parsed_sender, parsed_msg = parse_sender_and_message_from_aria(aria_label)
+                if parsed_msg:
+                    message_text = parsed_msg
+
+        messages_local.append({
+            "sender": sender_name,
+            "message": message_text,
+            "avatar_url": avatar_url,
+            "has_you_sent": contains_you_sent,
+            "data_message_id": row.get("data_message_id"),
+        })
+
+    return context_messages, new_messages
+
+
+def advance_scan_cursor(messages):
+    global last_scanned_message_id
+
+    for message in messages:
+        if message.get("sender") == "Unknown":
+            break
+        if message.get("data_message_id"):
+            last_scanned_message_id = message.get("data_message_id")
+
+    processed_messages.set_cursor(last_scanned_message_id)
+    return last_scanned_message_id
+
+
 def extract_messages_fix_unknown_sender(page, command_queue):
-    global initial_load_done, processed_in_session, pending_unknown_messages
+    global initial_load_done, processed_messages, pending_unknown_messages
     
     cycle_id = uuid.uuid4().hex[:8]
     cycle_start = time.perf_counter()
     logger.debug(f"[MessageHandler] cycle_start id={cycle_id}")
 
+    stop_at_id = last_scanned_message_id
+
     def collect_messages():
         collect_start = time.perf_counter()
         
-        def parse_sender_and_message_from_aria(aria_label):
-            if not aria_label:
-                return None, None
-
-            aria = aria_label.strip()
-            if aria.lower().startswith("at "):
-                parts = aria.split(",", 1)
-                if len(parts) == 2:
-                    rest = parts[1].strip()
-                    if ": " in rest:
-                        sender, msg = rest.split(": ", 1)
-                        return sender.strip(), msg.strip()
-                    if ":" in rest:
-                        sender, msg = rest.split(":", 1)
-                        return sender.strip(), msg.strip()
-                    return rest.strip(), ""
-
-            if " by " in aria:
-                after_by = aria.split(" by ", 1)[1].strip()
-                if ": " in after_by:
-                    sender, msg = after_by.split(": ", 1)
-                    return sender.strip(), msg.strip()
-                if ":" in after_by:
-                    sender, msg = after_by.split(":", 1)
-                    return sender.strip(), msg.strip()
-                return after_by.strip(), ""
-
-            if ": " in aria:
-                head, msg = aria.rsplit(": ", 1)
-                if "," in head:
-                    sender = head.split(",")[-1].strip()
-                    return sender, msg.strip()
-                return None, msg.strip()
-
-            return None, None
-
-        rows_local = page.query_selector_all(
-            "div[data-scope='messages_table'][aria-roledescription='message'][aria-label]"
-        )
-        if not rows_local:
-            rows_local = page.query_selector_all("div[role='row']")
-        if not rows_local:
-            rows_local = page.query_selector_all("[role='article'][aria-label]")
-        
-        logger.debug(f"[MessageHandler] collect_messages id={cycle_id}: rows_found={len(rows_local)}")
-        messages_local = []
-        
-        for idx, row in enumerate(rows_local):
-            try:
-                data_message_id = row.get_attribute("data-message-id")
-                
-                gridcell = row.query_selector("div[role='gridcell']") or row
+        extract_start = time.perf_counter()
+        mode = "snapshot" if USE_DOM_SNAPSHOT else "per_element"
+        collected = None
 
-                if row.get_attribute("class") == "x9f619 x1n2onr6 x1ja2u2z":
-                    continue
-                
-                you_sent_element = row.query_selector('span:has-text("You sent")')
-                
-                message_el = (
-                    gridcell.query_selector("[data-lexical-editor='true']")
-                    or gridcell.query_selector("div[dir='auto']")
-                )
-                message_text = message_el.inner_text().strip() if message_el else ""
-
-                if message_text == "":
-                    if row.query_selector("a[href*='/messenger_media/?attachment_id='], a[href*='messenger_media'][role='link']"):
-                        message_text = "media_attachment"
-                    elif row.query_selector("img[alt='GIF Image']"):
-                        message_text = "gif_attachment"
+        if USE_DOM_SNAPSHOT:
+            try:
+                collected = collect_rows_snapshot(page, cycle_id, stop_at_id)
+            except Exception as e:
+                logger.warning(f"[MessageHandler] Snapshot extraction failed, falling back to per-element: {e}")
+                mode = "per_element"
 
-                if message_text == "":
-                    aria_label = row.get_attribute("aria-label")
-                    if aria_label and any(word in aria_label.lower() for word in ["like", "thumbs", "reaction", "emoji"]):
-                        message_text = "reaction"
+        if collected is None:
+            collected = collect_rows_per_element(page, cycle_id, stop_at_id)
 
-                if message_text == "Enter":
-                    continue
-                    
-                avatar = row.query_selector("img.x1rg5ohu, [role='row'] img")
-                row_text = row.inner_text().lower()
-                aria_label = row.get_attribute("aria-label") or ""
-                aria_label_lower = aria_label.lower()
-                contains_you_sent = (
-                    bool(you_sent_element)
-                    or ("you sent" in row_text)
-                    or ("you sent" in aria_label_lower)
-                )
-                avatar_url = None
-                
-                if contains_you_sent:
-                    sender_name = "You"
-                elif avatar:
-                    sender_name = avatar.get_attribute("alt")
-                    avatar_url = avatar.get_attribute("src")
-                else:
-                    sender_name = "Unknown"
-                    if message_text == "":
-                        parsed_sender, parsed_msg = parse_sender_and_message_from_aria(aria_label)
-                        if parsed_msg:
-                            message_text = parsed_msg
-                    
-                messages_local.append({
-                    "sender": sender_name,
-                    "message": message_text,
-                    "avatar_url": avatar_url,
-                    "has_you_sent": contains_you_sent,
-                    "data_message_id": data_message_id,
-                })
-            except Exception as e:
-                logger.warning(f"[MessageHandler] Error during message extraction: {e}")
-                take_error_screenshot(page, "message_extraction")
+        context_messages, messages_local = collected
+        extract_ms = _perf_ms(extract_start)
         
         unknown_before = sum(1 for m in messages_local if m.get("sender") == "Unknown")
-        unknown_after = fill_unknown_senders(messages_local)
+        unknown_after = fill_unknown_senders(context_messages + messages_local)
         
         for msg in messages_local:
             if msg.get("sender") == "Unknown" and msg.get("data_message_id"):
@@ -304,29 +606,43 @@ def extract_messages_fix_unknown_sender(page, command_queue):
         if messages_local:
             logger.debug(
                 f"[MessageHandler] collect_done id={cycle_id}: messages={len(messages_local)}, "
+                f"context={len(context_messages)}, cursor={stop_at_id}, "
                 f"commands={commands}, unknown_before={unknown_before}, unknown_after={unknown_after}, "
-                f"pending_total={len(pending_unknown_messages)}, ms={_perf_ms(collect_start)}"
+                f"pending_total={len(pending_unknown_messages)}, mode={mode}, extract_ms={extract_ms}, "
+                f"ms={_perf_ms(collect_start)}"
             )
         else:
-            logger.debug(f"[MessageHandler] collect_done id={cycle_id}: messages=0, ms={_perf_ms(collect_start)}")
+            logger.debug(
+                f"[MessageHandler] collect_done id={cycle_id}: messages=0, mode={mode}, "
+                f"extract_ms={extract_ms}, ms={_perf_ms(collect_start)}"
+            )
         
-        return messages_local
+        return context_messages, messages_local
 
-    messages = collect_messages()
+    context_messages, messages = collect_messages()
     if not messages:
         logger.debug(f"[MessageHandler] cycle_end id={cycle_id} messages=0 ms={_perf_ms(cycle_start)}")
         return
 
     if not initial_load_done:
-        for message in messages:
-            if message.get("data_message_id"):
-                processed_in_session.add(message.get("data_message_id"))
         initial_load_done = True
-        logger.info(f"[MessageHandler] Initial load: added {len(processed_in_session)} existing message IDs as processed")
-        logger.debug(f"[MessageHandler] cycle_end id={cycle_id} initial load complete, no processing")
-        return
+        if stop_at_id and context_messages:
+            logger.info(
+                f"[MessageHandler] Initial load: resuming after {stop_at_id}, "
+                f"replaying {len(messages)} messages missed while offline"
+            )
+        else:
+            for message in messages:
+                if message.get("data_message_id"):
+                    processed_messages.add(message.get("data_message_id"))
+            advance_scan_cursor(messages)
+            processed_messages.save(force=True)
+            logger.info(f"[MessageHandler] Initial load: added {len(processed_messages)} existing message IDs as processed")
+            logger.debug(f"[MessageHandler] cycle_end id={cycle_id} initial load complete, no processing")
+            return
 
     logger.debug(f"[MessageHandler] process_messages id={cycle_id}: start count={len(messages)}")
+    commands_queued = 0
     
     for idx, message in enumerate(messages):
         sender_name = message["sender"]
@@ -337,7 +653,7 @@ def extract_messages_fix_unknown_sender(page, command_queue):
             logger.debug(f"[MessageHandler] msg id={cycle_id} idx={idx}: SKIPPING Unknown message, waiting for sender: '{_preview(message_text)}' (ID: {data_message_id})")
             continue
 
-        if data_message_id and data_message_id in processed_in_session:
+        if data_message_id and data_message_id in processed_messages:
             logger.debug(f"[MessageHandler] msg id={cycle_id} idx={idx}: skipping already processed message {data_message_id}")
             continue
 
@@ -351,10 +667,11 @@ def extract_messages_fix_unknown_sender(page, command_queue):
         )
 
         if is_command_message and sender_name != "You" and not message.get("has_you_sent"):
-            if data_message_id and data_message_id not in processed_in_session:
+            if data_message_id and data_message_id not in processed_messages:
                 logger.info(f"[MessageHandler] Command queued: '{sender_name}' - '{message_text}' (ID: {data_message_id})")
                 command_queue.put(message)
-                processed_in_session.add(data_message_id)
+                processed_messages.add(data_message_id)
+                commands_queued += 1
                 update_last_message_time()
             elif not data_message_id:
                 logger.warning(f"[MessageHandler] Command without data-message-id, cannot track: '{message_text}'")
@@ -364,6 +681,8 @@ def extract_messages_fix_unknown_sender(page, command_queue):
             else:
                 logger.debug(f"[MessageHandler] msg id={cycle_id} idx={idx}: ignoring non-command message from '{sender_name}'")
 
+    advance_scan_cursor(messages)
+    processed_messages.save(force=commands_queued > 0)
     logger.debug(f"[MessageHandler] cycle_end id={cycle_id} messages={len(messages)} ms={_perf_ms(cycle_start)}")
 
 
@@ -382,10 +701,13 @@ def cleanup_temp_folder():
             os.makedirs(TEMP_DIR, exist_ok=True)
             return 0
         
-        deleted_count = 0
+        render_cache = RenderCache.get_instance()
+        deleted_count = render_cache.cleanup()
+        render_cache_dir = os.path.abspath(render_cache.cache_dir)
         
         all_files = []
         for root, dirs, files in os.walk(TEMP_DIR):
+            dirs[:] = [d for d in dirs if os.path.abspath(os.path.join(root, d)) != render_cache_dir]
             for file in files:
                 file_path = os.path.join(root, file)
                 all_files.append(file_path)
@@ -418,12 +740,13 @@ def cleanup_temp_folder():
 
 
 def start_monitoring_messages(command_queue):
-    global initial_load_done, processed_in_session
+    global initial_load_done, processed_messages, last_scanned_message_id
     
     last_cleanup_time = None
     last_hourly_screenshot_time = None
     initial_load_done = False
-    processed_in_session = set()
+    processed_messages.load()
+    last_scanned_message_id = processed_messages.cursor
     
     while True:
         try:
@@ -444,6 +767,8 @@ def start_monitoring_messages(command_queue):
             except Exception as e:
                 logger.error(f"[MessageHandler] Failed to take initial screenshot: {e}")
 
+            message_observer = install_message_observer(page)
+
             while True:
                 try:
                     click_go_to_recent_button(page)
@@ -471,7 +796,10 @@ def start_monitoring_messages(command_queue):
                             cleanup_temp_folder()
                             last_cleanup_time = current_time
                             logger.debug(f"[Cleanup] cycle_cleanup ms={_perf_ms(cleanup_start)}")
-                        
+
+                    if message_observer:
+                        message_observer.wait_for_rows(max(sleep_time, OBSERVER_WATCHDOG_SECONDS))
+                    elif sleep_time != 0:
                         time.sleep(sleep_time)
 
                 except Exception as e:
@@ -482,6 +810,7 @@ def start_monitoring_messages(command_queue):
                         pass
                     break
             logger.critical("[MessageHandler] Closing browser, will reconnect...")
+            processed_messages.save(force=True)
             try:
                 browser.close()
             except:
@@ -493,6 +822,7 @@ def start_monitoring_messages(command_queue):
             time.sleep(5)
         except KeyboardInterrupt:
             logger.info("[MessageHandler] Monitoring stopped by user")
+            processed_messages.save(force=True)
             break
         except Exception as e:
             logger.critical(f"[MessageHandler] Unexpected error in monitoring: {e}")
@@ -410,11 +410,7 @@ class AdminPlugin(BaseGamePlugin):
         if not hasattr(cache, 'users'):
             return "No users found"
         
-        users_with_name = []
-        for user_id, user_data in cache.users.items():
-            user_name = user_data.get("name", "")
-            if user_name == name:
-                users_with_name.append((user_id, user_data))
+        users_with_name = cache.find_users_by_name(name)
         
         if not users_with_name:
             return f"User not found: {name}\n\nAvailable users:\n{self.list_user_names(cache)}"
@@ -503,9 +499,7 @@ Created: {created_at}
             if not user_data:
                 return False, f"User with ID {user_id} not found"
             
-            old_balance = user_data.get('balance', 0)
-            new_balance = old_balance + amount
-            user_manager.cache.update_user(user_id, balance=new_balance)
+            new_balance = user_manager.cache.update_balance(user_id, amount)
             
             user_name = user_data.get('name', str(user_id))
             return True, f"Added ${amount} to user {user_name} (ID: {user_id}). New balance: ${new_balance}"
@@ -521,10 +515,7 @@ Created: {created_at}
             return False, f"Multiple users found with name '{name_or_id}'. Please use ID:\n{users_list}"
         
         user_id, user_data = users_with_same_name[0]
-        old_balance = user_data.get('balance', 0)
-        new_balance = old_balance + amount
-        
-        user_manager.cache.update_user(user_id, balance=new_balance)
+        new_balance = user_manager.cache.update_balance(user_id, amount)
         
         logger.info(f"[Admin] Added {amount} balance to {name_or_id}")
 
@@ -541,8 +532,7 @@ Created: {created_at}
             coins_to_add = int(amount_pln * 1000)
             
             old_balance = user_data.get('balance', 0)
-            new_balance = old_balance + coins_to_add
-            user_manager.cache.update_user(user_id, balance=new_balance)
+            new_balance = user_manager.cache.update_balance(user_id, coins_to_add)
             
             pool_pln = amount_pln * (pool_percent / 100.0)
             
@@ -596,5 +586,6 @@ def register():
                     "/admin buycoins <user_id> <amount_pln> <pool_percent> - Manual coin purchase\n" \
                     "/admin kill - Stop the bot\n" \
                     "/admin restart - Restart the bot",
-        "execute": plugin.execute
+        "execute": plugin.execute,
+        "exclusive": True
     }
\ No newline at end of file
@@ -8,6 +8,7 @@ from collections import defaultdict
 from PIL import Image, ImageDraw
 from base_game_plugin import BaseGamePlugin
 from logger import logger
+from media_encoder import save_image, reencode
 
 try:
     import google.generativeai as genai
@@ -676,7 +677,7 @@ class AskPlugin(BaseGamePlugin):
             if answer and self.text_renderer:
                 text_img = self._create_text_image(answer, is_error=False)
                 if text_img:
-                    text_img.save(img_path)
+                    save_image(text_img, img_path, "intermediate")
                     
                     overlay_path, error = self.apply_user_overlay(
                         img_path, user_id, sender, 0, 0, user["balance"], user,
@@ -686,13 +687,14 @@ class AskPlugin(BaseGamePlugin):
                     if overlay_path:
                         file_queue.put(overlay_path)
                     else:
+                        reencode(img_path, "card")
                         file_queue.put(img_path)
             else:
                 error_text = f"Error: {error_msg}"
                 if self.text_renderer:
                     text_img = self._create_text_image(error_text, is_error=True)
                     if text_img:
-                        text_img.save(img_path)
+                        save_image(text_img, img_path, "intermediate")
                         
                         overlay_path, error = self.apply_user_overlay(
                             img_path, user_id, sender, 0, 0, user["balance"], user,
@@ -702,6 +704,7 @@ class AskPlugin(BaseGamePlugin):
                         if overlay_path:
                             file_queue.put(overlay_path)
                         else:
+                            reencode(img_path, "card")
                             file_queue.put(img_path)
         
         except Exception as e:
@@ -726,7 +729,7 @@ class AskPlugin(BaseGamePlugin):
                 text_img = self._create_text_image(limit_msg, is_error=True)
                 
                 if text_img:
-                    text_img.save(img_path)
+                    save_image(text_img, img_path, "intermediate")
                     overlay_path, error = self.apply_user_overlay(
                         img_path, user_id, sender, 0, 0, user["balance"], user,
                         show_win_text=False, font_scale=0.9, avatar_size=60
@@ -735,6 +738,7 @@ class AskPlugin(BaseGamePlugin):
                     if overlay_path:
                         file_queue.put(overlay_path)
                     else:
+                        reencode(img_path, "card")
                         file_queue.put(img_path)
             return ""
         
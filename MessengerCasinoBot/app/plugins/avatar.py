@@ -5,6 +5,7 @@ from PIL import Image, ImageDraw
 from datetime import datetime
 from base_game_plugin import BaseGamePlugin
 from logger import logger
+from media_encoder import save_image, save_animation
 
 class AvatarPlugin(BaseGamePlugin):
     def __init__(self):
@@ -470,15 +471,12 @@ class AvatarPlugin(BaseGamePlugin):
 
             output = os.path.join(self.results_folder, f"roll_{user_id}.webp")
 
-            frames[0].save(
+            save_animation(
+                frames,
                 output,
-                format="WEBP",
-                save_all=True,
-                append_images=frames[1:],
+                "animation",
                 duration=durations,
-                loop=0,
-                quality=80,
-                method=6
+                loop=0
             )
 
             del frames, durations, winner_img, bg_with_title
@@ -635,7 +633,7 @@ class AvatarPlugin(BaseGamePlugin):
             collection_img = self.create_collection_image(user_avatars, current_avatar, user_id, 1)
             
             if collection_img:
-                collection_img.save(img_path, format='WEBP', quality=85, optimize=True)
+                save_image(collection_img, img_path, "card", format="WEBP")
                 
                 overlay_path, error = self.apply_user_overlay(
                     img_path, user_id, sender, 0, 0, user["balance"], user, show_win_text=False, show_bet_amount=False
@@ -694,7 +692,7 @@ class AvatarPlugin(BaseGamePlugin):
                     
                     if collection_img:
                         img_path = os.path.join(self.results_folder, f"collection_after_quicksell_{user_id}.webp")
-                        collection_img.save(img_path, format='WEBP', quality=85, optimize=True)
+                        save_image(collection_img, img_path, "card", format="WEBP")
                         
                         overlay_path, error = self.apply_user_overlay(
                             img_path, user_id, sender, self.quick_sell_price, self.quick_sell_price, 
@@ -781,7 +779,7 @@ class AvatarPlugin(BaseGamePlugin):
                 
                 if collection_img:
                     img_path = os.path.join(self.results_folder, f"collection_after_set_{user_id}.webp")
-                    collection_img.save(img_path, format='WEBP', quality=85, optimize=True)
+                    save_image(collection_img, img_path, "card", format="WEBP")
                     
                     overlay_path, error = self.apply_user_overlay(
                         img_path, user_id, sender, 0, 0, user["balance"], user,
@@ -975,7 +973,7 @@ class AvatarPlugin(BaseGamePlugin):
             
             if collection_img:
                 img_path = os.path.join(self.results_folder, f"collection_{user_id}_page{page}.webp")
-                collection_img.save(img_path, format='WEBP', quality=85, optimize=True)
+                save_image(collection_img, img_path, "card", format="WEBP")
                 
                 overlay_path, error = self.apply_user_overlay(
                     img_path, user_id, sender, 0, 0, user["balance"], user, show_win_text=False, show_bet_amount=False
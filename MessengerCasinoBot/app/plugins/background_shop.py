@@ -5,6 +5,7 @@ from PIL import Image, ImageDraw
 from datetime import datetime
 from base_game_plugin import BaseGamePlugin
 from logger import logger
+from media_encoder import save_image, save_animation
 
 class BackgroundShopPlugin(BaseGamePlugin):
     def __init__(self):
@@ -577,7 +578,7 @@ class BackgroundShopPlugin(BaseGamePlugin):
                 
                 item_counter += 1
         
-        img.save(output_path, format='WEBP', quality=85, optimize=True)
+        save_image(img, output_path, "card", format="WEBP")
         return output_path
     
     def quick_sell_background(self, user_id, background_file):
@@ -772,15 +773,12 @@ class BackgroundShopPlugin(BaseGamePlugin):
 
             output = os.path.join(self.results_folder, f"craft_bg_{user_id}_{int(time.time())}.webp")
 
-            frames[0].save(
+            save_animation(
+                frames,
                 output,
-                format="WEBP",
-                save_all=True,
-                append_images=frames[1:],
+                "animation",
                 duration=durations,
-                loop=0,
-                quality=80,
-                method=6
+                loop=0
             )
 
             del frames, durations, winner, base
@@ -971,7 +969,7 @@ class BackgroundShopPlugin(BaseGamePlugin):
                     
                     if collection_img:
                         img_path = os.path.join(self.results_folder, f"collection_after_quicksell_{user_id}.webp")
-                        collection_img.save(img_path, format='WEBP', quality=85, optimize=True)
+                        save_image(collection_img, img_path, "card", format="WEBP")
                         
                         overlay_path, error = self.apply_user_overlay(
                             img_path, user_id, sender, price, price, 
@@ -1213,7 +1211,7 @@ class BackgroundShopPlugin(BaseGamePlugin):
             
             if collection_img:
                 img_path = os.path.join(self.results_folder, f"collection_{user_id}_page{page}.webp")
-                collection_img.save(img_path, format='WEBP', quality=85, optimize=True)
+                save_image(collection_img, img_path, "card", format="WEBP")
                 
                 overlay_path, error = self.apply_user_overlay(
                     img_path, user_id, sender, 0, 0, user["balance"], user, show_win_text=False, show_bet_amount=False
@@ -1234,7 +1232,7 @@ class BackgroundShopPlugin(BaseGamePlugin):
             self.create_shop_image(img_path, user_id, user_backgrounds, nickname)
             
             shop_img = Image.open(img_path).convert('RGBA')
-            shop_img.save(img_path, format='WEBP', quality=85, optimize=True)
+            save_image(shop_img, img_path, "card", format="WEBP")
             
             overlay_path, error = self.apply_user_overlay(
                 img_path, user_id, sender, 0, 0, user["balance"], user, show_win_text=False, show_bet_amount=False
@@ -1289,21 +1287,17 @@ class BackgroundShopPlugin(BaseGamePlugin):
                 self.send_message_image(sender, file_queue, f"Need: {price} coins\nYou have: {user['balance']} coins", "Insufficient Funds", cache, user_id)
                 return ""
             
-            new_balance = user["balance"] - price
-            self.update_user_balance(user_id, new_balance)
+            self.cache.update_balance(user_id, -price)
             self.add_user_background(user_id, offer["file"])
             self.set_user_current_background(user_id, offer["file"])
             
-            user["balance"] = new_balance
-            user["background"] = offer["file"]
-            
             user_backgrounds = self.get_user_backgrounds_for_display(user_id)
             
             shop_img_path = os.path.join(self.results_folder, f"shop_after_buy_{user_id}.webp")
             self.create_shop_image(shop_img_path, user_id, user_backgrounds, nickname)
             
             shop_img = Image.open(shop_img_path).convert('RGBA')
-            shop_img.save(shop_img_path, format='WEBP', quality=85, optimize=True)
+            save_image(shop_img, shop_img_path, "card", format="WEBP")
             
             overlay_path, error = self.apply_user_overlay(
                 shop_img_path, user_id, sender, -price, 0, user["balance"], user, show_win_text=False
@@ -1351,7 +1345,7 @@ class BackgroundShopPlugin(BaseGamePlugin):
                 
                 if collection_img:
                     img_path = os.path.join(self.results_folder, f"collection_after_set_{user_id}.webp")
-                    collection_img.save(img_path, format='WEBP', quality=85, optimize=True)
+                    save_image(collection_img, img_path, "card", format="WEBP")
                     
                     overlay_path, error = self.apply_user_overlay(
                         img_path, user_id, sender, 0, 0, user["balance"], user
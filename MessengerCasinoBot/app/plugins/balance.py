@@ -2,6 +2,7 @@ import os
 from PIL import Image, ImageDraw
 from base_game_plugin import BaseGamePlugin
 from logger import logger
+from media_encoder import save_image
 from utils import _get_unique_id
 
 class BalancePlugin(BaseGamePlugin):
@@ -284,7 +285,7 @@ class BalancePlugin(BaseGamePlugin):
                                  level_progress, 
                                  progress_text)
             
-            result.save(output_path, format="WEBP", quality=90, optimize=True)
+            save_image(result, output_path, "card", format="WEBP")
             
             return output_path
             
@@ -3,6 +3,7 @@ import random
 from PIL import Image, ImageDraw
 from base_game_plugin import BaseGamePlugin
 from logger import logger
+from media_encoder import save_image
 import time
 from plugins.monthly import record_monthly_win
 from plugins.weekly import record_weekly_win
@@ -466,7 +467,7 @@ class BlackjackTableGenerator:
                 table_img.alpha_composite(result_img, (result_x, result_y))
                     
         table_img_rgb = table_img.convert('RGB')
-        table_img_rgb.save(output_path, format='PNG')        
+        save_image(table_img_rgb, output_path, "intermediate", format="PNG")        
         
     def _draw_cards(self, table_img, cards, center_x, center_y):
         CARD_WIDTH = 112
@@ -1236,8 +1237,7 @@ class BlackjackPlugin(BaseGamePlugin):
             game.deal_initial_cards()
             self.active_games[user_id] = game
             
-            new_balance = balance_before - bet
-            self.update_user_balance(user_id, new_balance)
+            new_balance = self.cache.update_balance(user_id, -bet)
             
             logger.info(f"[BlackJack] New blackjack game started for {sender}, bet: {bet}, balance: {balance_before} -> {new_balance}")
             
@@ -1248,12 +1248,9 @@ class BlackjackPlugin(BaseGamePlugin):
             if is_game_finished:
                 win_amount = game.calculate_win_amount()
                 if win_amount > 0:
-                    final_balance = new_balance + win_amount
-                    self.update_user_balance(user_id, final_balance)
+                    final_balance = self.cache.update_balance(user_id, win_amount)
                 
-                newLevel, newLevelProgress = self.cache.add_experience(user_id, win_amount, sender, file_queue)
-                user["level"] = newLevel
-                user["level_progress"] = newLevelProgress
+                self.cache.add_experience(user_id, win_amount, sender, file_queue)
                 
                 net_profit = win_amount - bet
                 if net_profit > 0:
@@ -1304,9 +1301,7 @@ class BlackjackPlugin(BaseGamePlugin):
                 self.send_message_image(sender, file_queue, "Cannot split this hand!", "Blackjack Error", cache, user_id)
                 return ""
             
-            new_balance = user["balance"] - game.bet
-            self.update_user_balance(user_id, new_balance)
-            user["balance"] = new_balance
+            self.cache.update_balance(user_id, -game.bet)
             
             self.save_game_state(user_id, game)
             
@@ -1368,9 +1363,7 @@ class BlackjackPlugin(BaseGamePlugin):
                 
                 action_completed = game.double()
                 if action_completed:
-                    new_balance = user["balance"] - additional_bet
-                    self.update_user_balance(user_id, new_balance)
-                    user["balance"] = new_balance
+                    self.cache.update_balance(user_id, -additional_bet)
                 action_msg = "Double"
             
             if not action_completed:
@@ -1387,12 +1380,9 @@ class BlackjackPlugin(BaseGamePlugin):
                 win_amount = game.calculate_win_amount()
                 user = self.cache.get_user(user_id)
                 if user:
-                    final_balance = user["balance"] + win_amount
-                    self.update_user_balance(user_id, final_balance)
+                    final_balance = self.cache.update_balance(user_id, win_amount)
                     
-                    new_level, new_progress = self.cache.add_experience(user_id, win_amount, sender, file_queue)
-                    user["level"] = new_level
-                    user["level_progress"] = new_progress
+                    self.cache.add_experience(user_id, win_amount, sender, file_queue)
                     
                     total_bets = sum(game.hand_bets) if getattr(game, "hand_bets", None) else game.bet
                     net_profit = win_amount - total_bets
@@ -2,12 +2,19 @@ import os
 import random
 import re
 import time
+from animation_generator import FrameStream
 from base_game_plugin import BaseGamePlugin
 from logger import logger
+from media_encoder import save_image, save_animation
 from PIL import Image, ImageDraw, ImageFont
 from plugins.monthly import record_monthly_win
 from plugins.weekly import record_weekly_win
 
+BATTLE_BASE_DURATION = 70
+BATTLE_LAST_FRAME_MULTIPLIER = 30
+BATTLE_MAX_PIXELS = 1000000
+BATTLE_MAX_WIDTH = 800
+
 class CaseBattle:
     def __init__(self, plugin_instance):
         self.plugin = plugin_instance
@@ -245,92 +252,58 @@ class CasePlugin(BaseGamePlugin):
         
         return animation_path, win_amount
             
-    def _combine_two_animations(self, animation1_path, animation2_path, battle_id):
-        try:
-            if hasattr(self.generator, '_load_animation_frames'):
-                frames1 = self.generator._load_animation_frames(animation1_path)
-                frames2 = self.generator._load_animation_frames(animation2_path)
-            else:
-                logger.error(f"[Case] Error loading animation {e}")
-                return None, "Failed to load animation frames"
-            
-            if not frames1 or not frames2:
-                return None, "Failed to load animation frames"
+    def _compose_battle_animation(self, animation1_path, animation2_path, output_path):
+        with Image.open(animation1_path) as anim1, Image.open(animation2_path) as anim2:
+            count1 = getattr(anim1, "n_frames", 1)
+            count2 = getattr(anim2, "n_frames", 1)
             
-            width1, height1 = frames1[0].size
-            width2, height2 = frames2[0].size
+            width1, height1 = anim1.size
+            width2, height2 = anim2.size
             
             combined_width = max(width1, width2)
             combined_height = height1 + height2
+            frame_count = max(count1, count2)
             
-            frame_count = max(len(frames1), len(frames2))
+            scaled_size = None
+            if combined_width * combined_height > BATTLE_MAX_PIXELS and combined_width > BATTLE_MAX_WIDTH:
+                scaled_size = (BATTLE_MAX_WIDTH, int(combined_height * BATTLE_MAX_WIDTH / combined_width))
             
-            combined_frames = []
-            frame_durations = []
+            canvas = Image.new('RGBA', (combined_width, combined_height), (0, 0, 0, 0))
             
-            BASE_DURATION = 70
-            LAST_FRAME_MULTIPLIER = 30
-            
-            for i in range(frame_count):
-                combined_frame = Image.new('RGBA', (combined_width, combined_height), (0, 0, 0, 0))
-                
-                if i < len(frames1):
-                    frame1 = frames1[i]
-                else:
-                    frame1 = frames1[-1]
-                
-                combined_frame.paste(frame1, ((combined_width - width1) // 2, 0))
-                
-                if i < len(frames2):
-                    frame2 = frames2[i]
-                else:
-                    frame2 = frames2[-1]
-                
-                combined_frame.paste(frame2, ((combined_width - width2) // 2, height1))
+            def render_frame(i):
+                for anim, count, position in (
+                    (anim1, count1, ((combined_width - width1) // 2, 0)),
+                    (anim2, count2, ((combined_width - width2) // 2, height1))
+                ):
+                    anim.seek(min(i, count - 1))
+                    canvas.paste(anim if anim.mode == 'RGBA' else anim.convert('RGBA'), position)
                 
-                combined_frame_rgb = combined_frame.convert('RGB')
-                combined_frames.append(combined_frame_rgb)
-                
-                if i == frame_count - 1:
-                    duration = BASE_DURATION * LAST_FRAME_MULTIPLIER
-                else:
-                    duration = BASE_DURATION
-                
-                frame_durations.append(duration)
-            
-            if len(combined_frames) > 0 and combined_frames[0].size[0] * combined_frames[0].size[1] > 1000000:
-                MAX_WIDTH = 800
-                if combined_frames[0].size[0] > MAX_WIDTH:
-                    scale_factor = MAX_WIDTH / combined_frames[0].size[0]
-                    new_width = MAX_WIDTH
-                    new_height = int(combined_frames[0].size[1] * scale_factor)
-                    
-                    scaled_frames = []
-                    for frame in combined_frames:
-                        scaled_frame = frame.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                        scaled_frames.append(scaled_frame)
-                    
-                    combined_frames = scaled_frames
+                frame = canvas.convert('RGB')
+                if scaled_size:
+                    frame = frame.resize(scaled_size, Image.Resampling.LANCZOS)
+                return frame
+            
+            if frame_count > 1:
+                frame_durations = [BATTLE_BASE_DURATION] * (frame_count - 1)
+                frame_durations.append(BATTLE_BASE_DURATION * BATTLE_LAST_FRAME_MULTIPLIER)
+                save_animation(FrameStream(frame_count, render_frame), output_path, "animation",
+                               duration=frame_durations, loop=0)
+            else:
+                save_image(render_frame(0), output_path, "animation", format="WEBP")
+        
+        return output_path
+
+    def _combine_two_animations(self, animation1_path, animation2_path, battle_id):
+        try:
+            if not os.path.exists(animation1_path) or not os.path.exists(animation2_path):
+                return None, "Failed to load animation frames"
             
             temp_dir = self.get_app_path("temp", "battles")
             os.makedirs(temp_dir, exist_ok=True)
             
             timestamp = int(time.time() * 1000)
             output_path = os.path.join(temp_dir, f"case_battle_{battle_id}_{timestamp}.webp")
-            
-            if len(combined_frames) > 1:
-                save_kwargs = {
-                    'save_all': True,
-                    'append_images': combined_frames[1:],
-                    'duration': frame_durations,
-                    'loop': 0,
-                    'quality': 80,
-                    'method': 0,
-                }
-                
-                combined_frames[0].save(output_path, format='WEBP', **save_kwargs)
-            else:
-                combined_frames[0].save(output_path, format='WEBP', quality=80)
+            self._compose_battle_animation(animation1_path, animation2_path, output_path)
                         
             try:
                 if os.path.exists(animation1_path):
@@ -487,7 +460,7 @@ class CasePlugin(BaseGamePlugin):
             timestamp = int(time.time())
             output_path = os.path.join(temp_dir, f"battle_list_{user_id}_{timestamp}.png")
             
-            bg.save(output_path, format='PNG', optimize=True, quality=95)
+            save_image(bg, output_path, "card", format="PNG")
             
             return output_path
             
@@ -700,8 +673,7 @@ class CasePlugin(BaseGamePlugin):
             creator_user = cache.get_user(user_id)
             if creator_user:
                 refund_amount = battle.get('case_price', 0)
-                new_balance = creator_user.get('balance', 0) + refund_amount
-                self.update_user_balance(user_id, new_balance)
+                self.cache.update_balance(user_id, refund_amount)
             
             self.send_message_image(
                 sender, file_queue,
@@ -773,9 +745,7 @@ class CasePlugin(BaseGamePlugin):
             )
             return ""
         
-        creator_balance_before = user.get('balance', 0)
-        creator_new_balance = creator_balance_before - case_price
-        self.update_user_balance(user_id, creator_new_balance)
+        self.cache.update_balance(user_id, -case_price)
         
         battle_id = self.battle_manager.create_battle(user_id, sender, case_price, file_queue, cache)
         
@@ -855,15 +825,13 @@ class CasePlugin(BaseGamePlugin):
             )
             return ""
         
-        acceptor_balance_before = acceptor_user.get('balance', 0)
-        acceptor_new_balance = acceptor_balance_before - case_price
-        self.update_user_balance(acceptor_id, acceptor_new_balance)
+        self.cache.update_balance(acceptor_id, -case_price)
         acceptor_user = cache.get_user(acceptor_id)
         
         creator_user_id = battle.get('creator_id')
         if not creator_user_id:
             logger.error(f"[Case] Battle #{battle_id} has no creator_id")
-            self.update_user_balance(acceptor_id, acceptor_balance_before)
+            self.cache.update_balance(acceptor_id, case_price)
             self.send_message_image(
                 sender, file_queue,
                 "Battle data corrupted. Bet refunded.",
@@ -874,7 +842,7 @@ class CasePlugin(BaseGamePlugin):
         creator_user = cache.get_user(creator_user_id)
         
         if not creator_user:
-            self.update_user_balance(acceptor_id, acceptor_balance_before)
+            self.cache.update_balance(acceptor_id, case_price)
             self.send_message_image(
                 sender, file_queue,
                 "Creator no longer exists. Battle cancelled and bet refunded.",
@@ -885,7 +853,7 @@ class CasePlugin(BaseGamePlugin):
         success, message = self.battle_manager.accept_battle(battle_id, acceptor_id, sender)
         
         if not success:
-            self.update_user_balance(acceptor_id, acceptor_balance_before)
+            self.cache.update_balance(acceptor_id, case_price)
             logger.info(f"[Case] Refunded ${case_price} to {sender} after failed acceptance")
             
             self.send_message_image(
@@ -902,8 +870,7 @@ class CasePlugin(BaseGamePlugin):
         
         if not success:
             logger.error(f"[Case] Failed to complete battle #{battle_id}: {completed_battle}")
-            self.update_user_balance(creator_user_id, creator_user.get('balance', 0))
-            self.update_user_balance(acceptor_id, acceptor_balance_before)
+            self.cache.update_balance(acceptor_id, case_price)
             
             self.send_message_image(
                 sender, file_queue,
@@ -922,19 +889,19 @@ class CasePlugin(BaseGamePlugin):
         battle_result = battle.get('result')
         
         if battle_result == 'creator_wins':
-            creator_final_balance = creator_current_balance + total_pot
-            acceptor_final_balance = acceptor_current_balance
+            creator_net_win = total_pot
+            acceptor_net_win = 0
         
         elif battle_result == 'acceptor_wins':
-            creator_final_balance = creator_current_balance
-            acceptor_final_balance = acceptor_current_balance + total_pot
+            creator_net_win = 0
+            acceptor_net_win = total_pot
         
         else:
-            creator_final_balance = creator_current_balance + creator_win
-            acceptor_final_balance = acceptor_current_balance + acceptor_win
+            creator_net_win = creator_win
+            acceptor_net_win = acceptor_win
         
-        self.update_user_balance(creator_user_id, creator_final_balance)
-        self.update_user_balance(acceptor_id, acceptor_final_balance)
+        creator_final_balance = self.cache.update_balance(creator_user_id, creator_net_win)
+        acceptor_final_balance = self.cache.update_balance(acceptor_id, acceptor_net_win)
         
         try:
             creator_exp_amount = creator_win - case_price
@@ -945,9 +912,6 @@ class CasePlugin(BaseGamePlugin):
                         
         except Exception as e:
             logger.error(f"[Case] Error adding experience: {e}")
-        
-        creator_net_win = creator_final_balance - creator_current_balance
-        acceptor_net_win = acceptor_final_balance - acceptor_current_balance
 
         if creator_net_win > 0:
             record_weekly_win(self.cache, creator_user_id, "case", creator_net_win)
@@ -995,6 +959,7 @@ class CasePlugin(BaseGamePlugin):
             animated=True,
             frame_duration=70,
             last_frame_multiplier=30,
+            use_source_durations=True,
             show_win_text=False,
             font_scale=0.8,
             avatar_size=75,
@@ -1010,6 +975,7 @@ class CasePlugin(BaseGamePlugin):
             animated=True,
             frame_duration=70,
             last_frame_multiplier=30,
+            use_source_durations=True,
             show_win_text=False,
             font_scale=0.8,
             avatar_size=75,
@@ -1196,10 +1162,9 @@ class CasePlugin(BaseGamePlugin):
         
         final_win = win_amount
         net_win = final_win - case_price
-        new_balance = balance_before - case_price + final_win
         
         try:
-            self.update_user_balance(user_id, new_balance)
+            new_balance = self.cache.update_balance(user_id, final_win - case_price)
         except Exception as e:
             logger.error(f"[Case] Error updating balance for user {user_id}: {e}")
             self.send_message_image(sender, file_queue, 
@@ -1210,14 +1175,10 @@ class CasePlugin(BaseGamePlugin):
         user_info_before = self.create_user_info(sender, case_price, 0, balance_before, user)
         
         try:
-            newLevel, newLevelProgress = self.cache.add_experience(user_id, win_amount - case_price + final_win, sender, file_queue)
+            self.cache.add_experience(user_id, win_amount - case_price + final_win, sender, file_queue)
         except Exception as e:
             logger.error(f"[Case] Error adding experience: {e}")
-            newLevel = user.get("level", 1)
-            newLevelProgress = user.get("level_progress", 0.1)
 
-        user["level"] = newLevel
-        user["level_progress"] = newLevelProgress
         user_info_after = self.create_user_info(sender, case_price, net_win, new_balance, user)
         
         result_path, error = self.generate_animation(
@@ -1225,7 +1186,8 @@ class CasePlugin(BaseGamePlugin):
             animated=animated,
             frame_duration=70,
             show_win_text=False,
-            last_frame_multiplier=30
+            last_frame_multiplier=30,
+            use_source_durations=True
         )
         
         if error:
@@ -1346,7 +1308,7 @@ class CasePlugin(BaseGamePlugin):
             timestamp = int(time.time())
             output_path = os.path.join(temp_dir, f"case_showcase_{timestamp}.png")
             
-            bg.save(output_path, format='PNG', optimize=True, quality=95)
+            save_image(bg, output_path, "card", format="PNG")
             
             return output_path
             
@@ -1361,5 +1323,6 @@ def register():
         "name": "case",
         "description": "Open mystery cases: /case 10, /case 50, /case 100, /case 500, /case 1000, /case 2500, /case 5000, /case 10000,\nCase Battle PVP: /case battle help",
         "aliases": ["/cs"],
-        "execute": plugin.execute_game
+        "execute": plugin.execute_game,
+        "exclusive": True
     }
@@ -470,10 +470,8 @@ class ColorsPlugin(BaseGamePlugin):
             else:
                 net_win = -amount
 
-        new_balance = balance_before + net_win
-
         try:
-            self.update_user_balance(user_id, new_balance)
+            new_balance = self.cache.update_balance(user_id, net_win)
         except Exception as e:
             logger.error(f"[Colors] Error updating balance: {e}")
             self.send_message_image(sender, file_queue,
@@ -489,9 +487,7 @@ class ColorsPlugin(BaseGamePlugin):
         
         try:
             exp_amount = net_win if net_win > 0 else -amount
-            newLevel, newLevelProgress = self.cache.add_experience(user_id, exp_amount, sender, file_queue)
-            user["level"] = newLevel
-            user["level_progress"] = newLevelProgress
+            self.cache.add_experience(user_id, exp_amount, sender, file_queue)
         except Exception as e:
             logger.error(f"[Colors] Error adding experience: {e}")
         
@@ -71,6 +71,7 @@ class CrashPlugin(BaseGamePlugin):
         ]
         
         self.crash_animation_path = self.get_asset_path("crash", "crash_animation.webp")
+        self.crash_frame_count = None
         self.house_edge = 0.01
         self.max_history = 20
 
@@ -156,9 +157,19 @@ class CrashPlugin(BaseGamePlugin):
         
         return total_payout, net_win, cashouts, did_win
 
-    def _get_frame_for_multiplier(self, img, multiplier):
-        n_frames = getattr(img, "n_frames", 1)
-        
+    def _get_crash_frame_count(self):
+        try:
+            mtime = os.path.getmtime(self.crash_animation_path)
+        except OSError:
+            return 1
+
+        if self.crash_frame_count is None or self.crash_frame_count[0] != mtime:
+            with Image.open(self.crash_animation_path) as img:
+                self.crash_frame_count = (mtime, getattr(img, "n_frames", 1))
+
+        return self.crash_frame_count[1]
+
+    def _get_frame_for_multiplier(self, n_frames, multiplier):
         if n_frames == 1:
             return 0
         
@@ -573,44 +584,6 @@ class CrashPlugin(BaseGamePlugin):
             logger.error(f"[Crash] Error in get_custom_overlay: {e}", exc_info=True)
             return None
 
-    def _trim_animation_to_frame(self, animation_path, target_frame_idx, output_path=None):
-        try:
-            if output_path is None:
-                output_path = os.path.join(self.get_app_path("temp"), f"trimmed_crash_{int(time.time()*1000)}.webp")
-            
-            with Image.open(animation_path) as img:
-                n_frames = getattr(img, "n_frames", 1)
-                
-                if n_frames == 1:
-                    img.save(output_path, format='WEBP', save_all=True, quality=80)
-                    return output_path
-                
-                target_frame_idx = min(target_frame_idx, n_frames - 1)
-                
-                frames = []
-                for i in range(target_frame_idx + 1):
-                    img.seek(i)
-                    frames.append(img.copy().convert("RGBA"))
-                
-                if len(frames) > 0:
-                    frames[0].save(
-                        output_path,
-                        format='WEBP',
-                        save_all=True,
-                        append_images=frames[1:] if len(frames) > 1 else [],
-                        duration=50,
-                        loop=0,
-                        quality=80
-                    )
-                    
-                    return output_path
-                else:
-                    return None
-                    
-        except Exception as e:
-            logger.error(f"[Crash] Error trimming animation: {e}")
-            return None
-
     def create_animation_with_custom_frames(self, crash_multiplier, cashout_multiplier, 
                                         user_info_before, user_info_after, 
                                         avatar_path, bg_path, animated=True,
@@ -634,36 +607,25 @@ class CrashPlugin(BaseGamePlugin):
                 'wins': wins
             }
             
-            with Image.open(self.crash_animation_path) as img:
-                if split_bet and cashouts:
-                    cashout1, cashout2 = cashouts
-                    if cashout1 and cashout2:
-                        final_multiplier = cashout2
-                    elif cashout1:
-                        final_multiplier = crash_multiplier
-                    else:
-                        final_multiplier = crash_multiplier
+            if split_bet and cashouts:
+                cashout1, cashout2 = cashouts
+                if cashout1 and cashout2:
+                    final_multiplier = cashout2
+                elif cashout1:
+                    final_multiplier = crash_multiplier
                 else:
-                    if did_win:
-                        final_multiplier = cashout_multiplier
-                    else:
-                        final_multiplier = crash_multiplier
-                
-                final_frame = self._get_frame_for_multiplier(img, final_multiplier)
+                    final_multiplier = crash_multiplier
+            else:
+                if did_win:
+                    final_multiplier = cashout_multiplier
+                else:
+                    final_multiplier = crash_multiplier
+            
+            final_frame = self._get_frame_for_multiplier(self._get_crash_frame_count(), final_multiplier)
 
             if not animated:
-                temp_dir = self.get_app_path("temp")
-                temp_path = os.path.join(temp_dir, f"temp_crash_{time.time_ns()}.webp")
-                
-                with Image.open(self.crash_animation_path) as img:
-                    img.seek(final_frame)
-                    frame = img.convert("RGBA")
-                    frame.save(temp_path, format='WEBP', quality=80)
-                
-                user_id = user_info_after.get('user_id', '')
-                
                 final_path = self.generate_static(
-                    image_path=temp_path,
+                    image_path=self.crash_animation_path,
                     avatar_path=avatar_path,
                     bg_path=bg_path,
                     user_info=user_info_after,
@@ -672,28 +634,15 @@ class CrashPlugin(BaseGamePlugin):
                     show_win_text=False,
                     font_scale=0.8,
                     avatar_size=90,
-                    win_text_scale=1.0
+                    win_text_scale=1.0,
+                    frame_limit=final_frame + 1
                 )
                 
-                try:
-                    os.remove(temp_path)
-                except:
-                    pass
-                
                 if final_path:
                     return final_path, None
                 else:
                     return None, "Failed to generate static image"
             
-            temp_animation_path = self._trim_animation_to_frame(
-                self.crash_animation_path,
-                final_frame,
-                os.path.join(self.get_app_path("temp"), f"trimmed_anim_{int(time.time()*1000)}.webp")
-            )
-            
-            if not temp_animation_path:
-                return None, "Failed to trim animation"
-            
             user_id = user_info_after.get('user_id', '')
             user = {
                 'id': user_id,
@@ -702,7 +651,7 @@ class CrashPlugin(BaseGamePlugin):
             }
             
             output_path, error = self.generate_animation(
-                base_animation_path=temp_animation_path,
+                base_animation_path=self.crash_animation_path,
                 user_id=user_id,
                 user=user,
                 user_info_before=user_info_before,
@@ -715,14 +664,10 @@ class CrashPlugin(BaseGamePlugin):
                 font_scale=0.8,
                 avatar_size=90,
                 show_bet_amount=True,
-                win_text_height=80
+                win_text_height=80,
+                frame_limit=final_frame + 1
             )
             
-            try:
-                os.remove(temp_animation_path)
-            except:
-                pass
-            
             if error:
                 return None, error
             return output_path, None
@@ -803,20 +748,14 @@ class CrashPlugin(BaseGamePlugin):
             did_win = cashout_multiplier is not None and cashout_multiplier < crash_multiplier
             cashouts = [cashout_multiplier] if cashout_multiplier else [None]
         
-        new_balance = balance_before + net_win
-        self.update_user_balance(user_id, new_balance)
+        new_balance = self.cache.update_balance(user_id, net_win)
         
         user_info_before = self.create_user_info(sender, amount, 0, balance_before, user.copy())
         
         try:
-            newLevel, newLevelProgress = self.cache.add_experience(user_id, net_win, sender, file_queue)
+            self.cache.add_experience(user_id, net_win, sender, file_queue)
         except Exception as e:
             logger.error(f"[Crash] Error adding experience: {e}")
-            newLevel = user.get("level", 1)
-            newLevelProgress = user.get("level_progress", 0.1)
-        
-        user["level"] = newLevel
-        user["level_progress"] = newLevelProgress
         
         if net_win > 0:
             user_info_after = self.create_user_info(sender, amount, payout, new_balance, user)
@@ -5,6 +5,7 @@ from PIL import Image, ImageDraw
 from dataclasses import dataclass
 from typing import Tuple, List
 from base_game_plugin import BaseGamePlugin
+from media_encoder import save_image
 
 @dataclass
 class DailyConfig:
@@ -415,7 +416,7 @@ class DailyPlugin(BaseGamePlugin):
                 
                 if img:
                     img_path = os.path.join(self.results_folder, f"daily_{user_id}_{int(time.time())}.webp")
-                    img.save(img_path, format='WEBP', quality=self.image_generator.config.webp_quality)
+                    save_image(img, img_path, "card", format="WEBP")
                     
                     overlay_path, _ = self.apply_user_overlay(
                         img_path, user_id, nickname, 0, 0, 
@@ -453,7 +454,7 @@ class DailyPlugin(BaseGamePlugin):
         
         if img:
             img_path = os.path.join(self.results_folder, f"daily_{user_id}_{int(time.time())}.webp")
-            img.save(img_path, format='WEBP', quality=self.image_generator.config.webp_quality)
+            save_image(img, img_path, "card", format="WEBP")
             
             user = self.cache.get_user(user_id)
             balance = user.get("balance", 0) if user else 0
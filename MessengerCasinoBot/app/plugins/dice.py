@@ -6,6 +6,7 @@ from typing import List, Dict, Optional
 from PIL import Image, ImageDraw, ImageSequence
 from base_game_plugin import BaseGamePlugin
 from logger import logger
+from media_encoder import save_animation
 from plugins.monthly import record_monthly_win
 from plugins.weekly import record_weekly_win
 
@@ -686,14 +687,12 @@ class DiceAnimationGenerator:
             try:
                 os.makedirs(os.path.dirname(temp_path), exist_ok=True)
                 
-                frames[0].save(
+                save_animation(
+                    frames,
                     temp_path,
-                    format='WEBP',
-                    save_all=True,
-                    append_images=frames[1:],
+                    "intermediate",
                     duration=50,
-                    loop=0,
-                    quality=90
+                    loop=0
                 )
                 return temp_path
             except Exception as e:
@@ -894,14 +893,14 @@ class DicePlugin(BaseGamePlugin):
             win_amount = 0
         
         if game.winner == "player":
-            self.update_user_balance(user_id, final_balance)
+            final_balance = self.cache.update_balance(user_id, 2 * win_amount)
             if win_amount < 0:
                 self.cache.add_experience(user_id, win_amount, sender, file_queue)
             record_weekly_win(self.cache, user_id, "dice", win_amount)
             record_weekly_win(self.cache, user_id, "dice", win_amount)
             record_monthly_win(self.cache, user_id, "dice", win_amount)
         elif game.winner == "tie":
-            self.update_user_balance(user_id, final_balance)
+            final_balance = self.cache.update_balance(user_id, game.bet)
         
         fresh_user = cache.get_user(user_id)
         if fresh_user:
@@ -987,11 +986,11 @@ class DicePlugin(BaseGamePlugin):
             win_amount = 0
         
         if game.winner == "player":
-            self.update_user_balance(user_id, final_balance)
+            final_balance = self.cache.update_balance(user_id, 2 * win_amount)
             if win_amount < 0:
                 self.cache.add_experience(user_id, win_amount, sender, file_queue)
         elif game.winner == "tie":
-            self.update_user_balance(user_id, final_balance)
+            final_balance = self.cache.update_balance(user_id, game.bet)
         
         fresh_user = cache.get_user(user_id)
         if fresh_user:
@@ -1082,9 +1081,7 @@ class DicePlugin(BaseGamePlugin):
                                 "Dice Error", cache, user_id)
             return ""
         
-        balance_before = user["balance"]
-        new_balance = balance_before - bet
-        self.update_user_balance(user_id, new_balance)
+        new_balance = self.cache.update_balance(user_id, -bet)
         
         game = DiceGame(user_id, sender, bet)
         game.max_rerolls = 1
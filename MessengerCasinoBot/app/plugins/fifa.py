@@ -7,6 +7,7 @@ from PIL import Image, ImageDraw, ImageSequence
 
 from base_game_plugin import BaseGamePlugin
 from logger import logger
+from media_encoder import save_animation, reencode
 from plugins.monthly import record_monthly_win
 
 
@@ -345,14 +346,12 @@ class FifaPackOpeningPlugin(BaseGamePlugin):
         out_dir.mkdir(parents=True, exist_ok=True)
         out_path = out_dir / f"fifa_pack_{pack_name}_{random.randint(1000, 9999)}.webp"
         try:
-            frames[0].save(
+            save_animation(
+                frames,
                 out_path,
-                format="WEBP",
-                save_all=True,
-                append_images=frames[1:],
+                "intermediate",
                 duration=100,
-                loop=0,
-                quality=85,
+                loop=0
             )
             return str(out_path)
         except Exception:
@@ -390,9 +389,7 @@ class FifaPackOpeningPlugin(BaseGamePlugin):
             return ""
 
         balance_before = int(user.get("balance", 0))
-        balance_after_bet = balance_before - pack_cost
-        self.update_user_balance(user_id, balance_after_bet)
-        user["balance"] = balance_after_bet
+        self.cache.update_balance(user_id, -pack_cost)
 
         picks = self._pick_cards(count)
         if not picks:
@@ -401,14 +398,10 @@ class FifaPackOpeningPlugin(BaseGamePlugin):
 
         total_value = sum(self._extract_price(p) for p in picks)
         net = int(total_value - pack_cost)
-        new_balance = balance_after_bet + int(total_value)
-        self.update_user_balance(user_id, new_balance)
-        user["balance"] = new_balance
+        new_balance = self.cache.update_balance(user_id, int(total_value))
 
         try:
-            new_level, new_progress = self.cache.add_experience(user_id, net, sender, file_queue)
-            user["level"] = new_level
-            user["level_progress"] = new_progress
+            self.cache.add_experience(user_id, net, sender, file_queue)
         except Exception as e:
             logger.warning(f"[Fifa] add_experience failed: {e}")
 
@@ -442,6 +435,7 @@ class FifaPackOpeningPlugin(BaseGamePlugin):
             return ""
 
         logger.error(f"[FIFA] Overlay generation failed: {error}")
+        reencode(out, "animation")
         file_queue.put(out)
         return ""
 
@@ -6,6 +6,7 @@ from dataclasses import dataclass
 from typing import Tuple, Optional
 from base_game_plugin import BaseGamePlugin
 from logger import logger
+from media_encoder import save_image
 from utils import _get_unique_id
 
 @dataclass
@@ -359,26 +360,7 @@ class GiftPlugin(BaseGamePlugin):
         if search_name.startswith('@'):
             search_name = search_name[1:].strip()
         
-        exact_matches = []
-        partial_matches = []
-        name_lower = search_name.lower().strip()
-        
-        for user_id, user_data in cache.users.items():
-            if not isinstance(user_data, dict):
-                continue
-            
-            user_name = user_data.get('name', '')
-            if not user_name:
-                continue
-            
-            user_name_lower = user_name.lower()
-            
-            if user_name_lower == name_lower:
-                exact_matches.append((user_id, user_data))
-            elif user_name_lower.startswith(name_lower):
-                partial_matches.append((user_id, user_data))
-        
-        return exact_matches + partial_matches
+        return cache.find_users_by_name_prefix(search_name.strip())
     
     def _format_multiple_recipients_error(self, recipients, searched_name):
         error_msg = "MULTIPLE USERS FOUND\n\n"
@@ -402,17 +384,12 @@ class GiftPlugin(BaseGamePlugin):
         if not sender or not recipient:
             return None, "User not found"
         
-        recipient_balance_before = recipient.get("balance", 0)
-        
-        recipient_balance_after = recipient_balance_before + self.GIFT_AMOUNT
-        
         today_str = datetime.now().date().isoformat()
         if not self.cache.update_user(sender_id, last_gift_time=today_str):
             return None, "Failed to update sender"
         
-        if not self.cache.update_user(recipient_id, balance=recipient_balance_after):
-            self.cache.update_user(sender_id, last_gift_time=None)
-            return None, "Failed to update recipient"
+        recipient_balance_after = self.cache.update_balance(recipient_id, self.GIFT_AMOUNT)
+        recipient_balance_before = recipient_balance_after - self.GIFT_AMOUNT
         
         return {
             'recipient_balance_before': recipient_balance_before,
@@ -605,7 +582,7 @@ class GiftPlugin(BaseGamePlugin):
     def _save_and_queue_image(self, img, user_id, file_queue):
         timestamp = _get_unique_id()
         img_path = os.path.join(self.results_folder, f"gift_{user_id}_{timestamp}.webp")
-        img.save(img_path, format='WEBP', quality=90)
+        save_image(img, img_path, "card", format="WEBP")
         file_queue.put(img_path)
 
 def register():
@@ -624,5 +601,6 @@ def register():
             "  /gift 123456        (using user ID)\n"
             "  /gift @John         (ignores @ symbol)"
         ),
-        "execute": plugin.execute_game
+        "execute": plugin.execute_game,
+        "exclusive": True
     }
\ No newline at end of file
@@ -9,6 +9,7 @@ from PIL import Image, ImageDraw
 
 from base_game_plugin import BaseGamePlugin
 from logger import logger
+from media_encoder import save_image
 from plugins.monthly import record_monthly_win
 from plugins.weekly import record_weekly_win
 
@@ -781,7 +782,7 @@ class HiLoCardRenderer:
             message_y += img.height + 4
 
         try:
-            table_img.save(output_path, "PNG")
+            save_image(table_img, output_path, "intermediate", format="PNG")
             hilo_logger.debug(f"Image saved to {output_path}")
         except Exception as exc:
             logger.error(f"[HiLo] Failed to save table image: {exc}")
@@ -980,9 +981,7 @@ class HiLoPlugin(BaseGamePlugin):
                 self.send_message_image(sender, file_queue, " Finish your current Hi-Lo streak before starting a new game!", "Hi-Lo", cache, user_id)
                 return ""
 
-            new_balance = user["balance"] - bet
-            self.update_user_balance(user_id, new_balance)
-            user["balance"] = new_balance
+            self.cache.update_balance(user_id, -bet)
 
             game = HiLoGame(user_id, sender, bet)
             self.active_games[user_id] = game
@@ -1006,11 +1005,9 @@ class HiLoPlugin(BaseGamePlugin):
                 return ""
 
             if result.get("result") in ("loss", "tie"):
-                new_level, new_progress = self.cache.add_experience(
+                self.cache.add_experience(
                     user_id, -game.bet, sender, file_queue
                 )
-                user["level"] = new_level
-                user["level_progress"] = new_progress
                 
                 self._clear_game(user_id)
                 final_balance = user["balance"]
@@ -1046,11 +1043,9 @@ class HiLoPlugin(BaseGamePlugin):
                 return ""
 
             if result.get("result") in ("loss", "tie"):
-                new_level, new_progress = self.cache.add_experience(
+                self.cache.add_experience(
                     user_id, -game.bet, sender, file_queue
                 )
-                user["level"] = new_level
-                user["level_progress"] = new_progress
                 
                 self._clear_game(user_id)
                 final_balance = user["balance"]
@@ -1081,11 +1076,9 @@ class HiLoPlugin(BaseGamePlugin):
                 return ""
 
             if result.get("result") in ("loss", "tie"):
-                new_level, new_progress = self.cache.add_experience(
+                self.cache.add_experience(
                     user_id, -game.bet, sender, file_queue
                 )
-                user["level"] = new_level
-                user["level_progress"] = new_progress
                 
                 self._clear_game(user_id)
                 final_balance = user["balance"]
@@ -1116,15 +1109,11 @@ class HiLoPlugin(BaseGamePlugin):
                 return ""
 
         net_win = payout - game.bet 
-        new_balance = user["balance"] + net_win
-        self.update_user_balance(user_id, new_balance)
-        user["balance"] = new_balance
+        new_balance = self.cache.update_balance(user_id, net_win)
         
-        new_level, new_progress = self.cache.add_experience(
+        self.cache.add_experience(
             user_id, net_win, sender, file_queue
         )
-        user["level"] = new_level
-        user["level_progress"] = new_progress
         if net_win > 0:
             record_weekly_win(self.cache, user_id, "hilo", net_win)
             record_monthly_win(self.cache, user_id, "hilo", net_win)
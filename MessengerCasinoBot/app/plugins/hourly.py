@@ -90,10 +90,6 @@ class HourlyPlugin(BaseGamePlugin):
 
     def _update_claim_time(self, user_id, claim_time):
         self.cache.update_user(user_id, last_hourly_claim=claim_time.isoformat())
-        
-        user = self.cache.get_user(user_id)
-        if user:
-            user["last_hourly_claim"] = claim_time.isoformat()
 
     def _claim_hourly_reward(self, user_id):
         user = self.cache.get_user(user_id)
@@ -110,8 +106,6 @@ class HourlyPlugin(BaseGamePlugin):
         
         self.cache.update_balance(user_id, reward_amount)
         
-        user["balance"] = user.get("balance", 0) + reward_amount
-        
         return reward_amount
 
     def execute_game(self, command_name, args, file_queue, cache=None, sender=None, avatar_url=None):
@@ -142,13 +136,6 @@ class HourlyPlugin(BaseGamePlugin):
         user = self.cache.get_user(user_id)
         balance_after = user["balance"]
         
-        if balance_after > balance_before + reward_amount:
-            logger.warning(f"Correcting double reward: {balance_after} -> {balance_before + reward_amount}")
-            correct_balance = balance_before + reward_amount
-            self.cache.update_user(user_id, balance=correct_balance)
-            user["balance"] = correct_balance
-            balance_after = correct_balance
-        
         user_info_before = self.create_user_info(
             nickname, 0, 0, balance_before, user
         )
@@ -5,7 +5,9 @@ import threading
 from datetime import datetime
 from base_game_plugin import BaseGamePlugin
 from logger import logger
+from media_encoder import save_image, save_animation
 from plugins.monthly import record_monthly_win
+from send_queue import with_priority, PRIORITY_BROADCAST
 from PIL import Image, ImageDraw
 class JackpotGame:
     ACTIVE_KEY = "active_jackpot"
@@ -91,8 +93,7 @@ class JackpotGame:
                 if winner_id and self.plugin.cache:
                     winner_user = self.plugin.cache.get_user(winner_id)
                     if winner_user:
-                        new_balance = winner_user.get('balance', 0) + total_pot
-                        self.plugin.update_user_balance(winner_id, new_balance)
+                        self.plugin.cache.update_balance(winner_id, total_pot)
                         
                         logger.info(f"[Jackpot] {winner.get('username')} won ${total_pot}!")
 
@@ -115,7 +116,7 @@ class JackpotGame:
                         self.plugin.file_queue
                     )
                 self._save_pending_result(jackpot_result)
-                sent = self.try_send_pending_animation(self.plugin.file_queue)
+                sent = self.try_send_pending_animation(with_priority(self.plugin.file_queue, PRIORITY_BROADCAST))
                 if sent:
                     logger.info("[Jackpot] Pending jackpot animation sent during draw")
                 
@@ -637,7 +638,7 @@ class JackpotPlugin(BaseGamePlugin):
                 filename = f"jackpot_info_{user_id}_{timestamp}.png"
             
             output_path = os.path.join(temp_dir, filename)
-            img.save(output_path, format='PNG', optimize=True, quality=95)
+            save_image(img, output_path, "card", format="PNG")
             
             return output_path, None
             
@@ -683,7 +684,7 @@ class JackpotPlugin(BaseGamePlugin):
             
             temp_dir = self.get_app_path("temp")
             path = os.path.join(temp_dir, f"no_jackpot_{int(time.time()*1000)}.png")
-            img.save(path, format='PNG', optimize=True, quality=95)
+            save_image(img, path, "card", format="PNG")
             return path, None
             
         except Exception as e:
@@ -804,14 +805,12 @@ class JackpotPlugin(BaseGamePlugin):
                 "Jackpot - Error", cache, user_id)
             return ""
         
-        balance_before = user.get('balance', 0)
-        new_balance = balance_before - bet_amount
-        self.update_user_balance(user_id, new_balance)
+        self.cache.update_balance(user_id, -bet_amount)
         
         success, message = self.jackpot_manager.create_or_join_jackpot(user_id, sender, bet_amount)
         
         if not success:
-            self.update_user_balance(user_id, balance_before)
+            self.cache.update_balance(user_id, bet_amount)
             self.send_message_image(sender, file_queue, message, 
                                   "Jackpot - Error", cache, user_id)
             return ""
@@ -1095,15 +1094,12 @@ class JackpotPlugin(BaseGamePlugin):
 
             path = os.path.join(out_dir, f"jackpot_{int(time.time()*1000)}.webp")
 
-            frames[0].save(
+            save_animation(
+                frames,
                 path,
-                save_all=True,
-                append_images=frames[1:],
+                "animation",
                 duration=durations,
-                loop=0,
-                format='WEBP',
-                quality=70,
-                method=4
+                loop=0
             )
 
             return path, None
@@ -1124,5 +1120,6 @@ def register():
         "description": "Jackpot game - everyone puts in money, one wins all!\n\nCommands:\n/jackpot - Show current jackpot\n/jackpot <amount> - Join jackpot\n/jackpot bet <amount> - Join jackpot\n/jackpot help - Detailed info",
         "aliases": ["/jp"],
         "execute": plugin.execute_game,
+        "exclusive": True,
         "set_file_queue": plugin.set_file_queue
     }
@@ -4,6 +4,7 @@ import time
 from PIL import Image, ImageDraw
 from base_game_plugin import BaseGamePlugin
 from logger import logger
+from media_encoder import save_image, save_animation, reencode
 from plugins.monthly import record_monthly_win
 from plugins.weekly import record_weekly_win
 
@@ -378,12 +379,11 @@ class KenoPlugin(BaseGamePlugin):
         
         try:
             if static:
-                frames[0].save(
+                save_image(
+                    frames[0],
                     path,
-                    format='WEBP',
-                    quality=85,
-                    method=4,
-                    optimize=True
+                    "intermediate",
+                    format="WEBP"
                 )
             else:
                 frame_count = len(frames)
@@ -392,16 +392,12 @@ class KenoPlugin(BaseGamePlugin):
                 if frame_count > 0:
                     frame_durations[-1] = 800
                 
-                frames[0].save(
+                save_animation(
+                    frames,
                     path,
-                    format='WEBP',
-                    save_all=True,
-                    append_images=frames[1:],
+                    "intermediate",
                     duration=frame_durations,
-                    loop=0,
-                    quality=70,
-                    method=3,
-                    optimize=True
+                    loop=0
                 )
             return path
         except Exception as e:
@@ -519,7 +515,7 @@ class KenoPlugin(BaseGamePlugin):
             return ""
         
         try:
-            self.update_user_balance(user_id, balance - bet)
+            self.cache.update_balance(user_id, -bet)
         except Exception as e:
             logger.error(f"[Keno] Error updating balance: {e}")
             self.send_message_image(
@@ -539,7 +535,7 @@ class KenoPlugin(BaseGamePlugin):
         
         if game.win_amount > 0:
             try:
-                self.update_user_balance(user_id, new_balance)
+                new_balance = self.cache.update_balance(user_id, game.win_amount)
             except Exception as e:
                 logger.error(f"[Keno] Error updating balance with winnings: {e}")
         
@@ -596,6 +592,7 @@ class KenoPlugin(BaseGamePlugin):
                     logger.info(f"[Keno] {sender} - {'Static' if static else 'Animated'} - Bet: ${bet}, Picks: {picks}, Hits: {game.hits}, Win: ${game.win_amount}, Net: ${net_win}")
                     return ""
                 else:
+                    reencode(anim_path, "card" if static else "animation")
                     file_queue.put(anim_path)
                     logger.warning(f"[Keno] Overlay generation failed: {error}")
                     return ""
@@ -5,6 +5,7 @@ from datetime import datetime
 from PIL import Image
 from base_game_plugin import BaseGamePlugin
 from logger import logger
+from media_encoder import save_image
 from plugins.monthly import record_monthly_win
 from plugins.weekly import record_weekly_win
 
@@ -176,7 +177,7 @@ class LottoPlugin(BaseGamePlugin):
                 y_offset += game_img.height
             
             temp_path = os.path.join(self.results_folder, f"temp_multi_{user_id}_{int(datetime.now().timestamp())}.webp")
-            result_img.save(temp_path, format='WEBP', quality=95)
+            save_image(result_img, temp_path, "intermediate", format="WEBP")
             
             overlay_path, overlay_error = self.apply_user_overlay(
                 base_image_path=temp_path,
@@ -290,10 +291,8 @@ class LottoPlugin(BaseGamePlugin):
                 'net_win': net_win
             })
         
-        new_balance = balance_before + total_net_win
-        
         try:
-            self.update_user_balance(user_id, new_balance)
+            new_balance = self.cache.update_balance(user_id, total_net_win)
         except Exception as e:
             logger.error(f"[Lotto] Error updating balance for user {user_id}: {e}")
             self.send_message_image(sender, file_queue, 
@@ -304,14 +303,10 @@ class LottoPlugin(BaseGamePlugin):
         user_info_before = self.create_user_info(sender, total_bet, 0, balance_before, user.copy())
         
         try:
-            newLevel, newLevelProgress = self.cache.add_experience(user_id, total_net_win, sender, file_queue)
+            self.cache.add_experience(user_id, total_net_win, sender, file_queue)
         except Exception as e:
             logger.error(f"[Lotto] Error adding experience: {e}")
-            newLevel = user.get("level", 1)
-            newLevelProgress = user.get("level_progress", 0.1)
         
-        user["level"] = newLevel
-        user["level_progress"] = newLevelProgress
         if total_net_win > 0:
             record_weekly_win(self.cache, user_id, "lotto", total_net_win)
             record_monthly_win(self.cache, user_id, "lotto", total_net_win)
@@ -3,6 +3,7 @@ import time
 from PIL import Image, ImageDraw
 from datetime import datetime
 from base_game_plugin import BaseGamePlugin
+from media_encoder import save_image
 
 _market_instance = None
 
@@ -642,7 +643,7 @@ class BackgroundMarketPlugin(BaseGamePlugin):
             legend_x = (total_width - legend_img.width) // 2
             img.paste(legend_img, (legend_x, legend_y), legend_img)
         
-        img.save(output_path, format='WEBP', quality=100, optimize=True)
+        save_image(img, output_path, "card", format="WEBP")
         return output_path
 
     def _create_empty_market_image(self, output_path, title, message, show_type):
@@ -692,7 +693,7 @@ class BackgroundMarketPlugin(BaseGamePlugin):
                 line_x = (total_width - line_img.width) // 2
                 img.paste(line_img, (line_x, start_y + i * line_height), line_img)
         
-        img.save(output_path, format='WEBP', quality=100, optimize=True)
+        save_image(img, output_path, "card", format="WEBP")
         return output_path
 
     def cancel_market_listing(self, user_id, market_index):
@@ -1044,5 +1045,6 @@ Trade avatars and backgrounds with other players! Buy, sell, or bid in auctions.
 **Sell Items With:**
 • `/bg quicksell/sellprice/auction` - Backgrounds
 • `/avatar quicksell/sellprice/auction` - Avatars""",
-        "execute": plugin.execute_game
+        "execute": plugin.execute_game,
+        "exclusive": True
     }
\ No newline at end of file
@@ -3,8 +3,10 @@ import random
 from datetime import datetime, timedelta
 from base_game_plugin import BaseGamePlugin
 from logger import logger
+from media_encoder import save_image
 from PIL import Image
 from utils import _get_unique_id
+from send_queue import with_priority, PRIORITY_BROADCAST
 import threading
 import time
 from queue import Queue, Empty
@@ -157,7 +159,7 @@ class MathChallengePlugin(BaseGamePlugin):
             bg_img.alpha_composite(question_img, (text_x, text_y))
             
             output_path = os.path.join(self.results_folder, f"math_question_{question_id}.png")
-            bg_img.save(output_path, 'PNG', quality=95)
+            save_image(bg_img, output_path, "card", format="PNG")
             logger.info(f"[MathChallenge] Image saved to {output_path}")
             
             return output_path
@@ -299,7 +301,7 @@ class MathChallengePlugin(BaseGamePlugin):
                 )
                 if image_path:
                     logger.info(f"[MathChallenge] Queueing image: {image_path}")
-                    self.file_queue.put(image_path)
+                    with_priority(self.file_queue, PRIORITY_BROADCAST).put(image_path)
                     challenge["image_generated"] = True
                     self.cache.set_active_math_challenge(challenge)
                 else:
@@ -667,6 +669,7 @@ def register():
         "name": "answer",
         "aliases": ["/answer", "/a"],
         "description": "Answer math challenge - appears randomly once per hour\nUse: /answer <number> or /a <number>",
-        "execute": plugin.execute_game
+        "execute": plugin.execute_game,
+        "exclusive": True
     }
     return result
\ No newline at end of file
@@ -5,6 +5,7 @@ from datetime import datetime
 from PIL import Image, ImageDraw, ImageFont
 from base_game_plugin import BaseGamePlugin
 from logger import logger
+from media_encoder import save_image
 from plugins.monthly import record_monthly_win
 from plugins.weekly import record_weekly_win
 
@@ -396,7 +397,7 @@ class MinesGame:
                     img.paste(cell_img, (int(x), int(y)), cell_img)
                     cells_with_images += 1
                 
-        img.save(output_path, format='WEBP', quality=90, optimize=True)
+        save_image(img, output_path, "intermediate", format="WEBP")
 
 
 class MinesPlugin(BaseGamePlugin):
@@ -581,9 +582,8 @@ class MinesPlugin(BaseGamePlugin):
             
             self._save_active_games_to_cache()
             
-            new_balance = balance_before - bet
             try:
-                self.update_user_balance(user_id, new_balance)
+                new_balance = self.cache.update_balance(user_id, -bet)
             except Exception as e:
                 self.send_message_image(sender, file_queue,
                                       "Error updating balance!\n\n"
@@ -624,19 +624,16 @@ class MinesPlugin(BaseGamePlugin):
             mult = game.get_current_multiplier()
             win_amount = int(bet * mult)
             net_win = win_amount - bet
-            new_balance = balance_before + win_amount
             
             logger.info(f"[Mines] Cashout for {sender}: bet={bet}, multiplier=x{mult:.2f}, win={win_amount}, net={net_win}")
             
             try:
-                newLevel, newLevelProgress = self.cache.add_experience(user_id, net_win, sender, file_queue)
-                user["level"] = newLevel
-                user["level_progress"] = newLevelProgress
+                self.cache.add_experience(user_id, net_win, sender, file_queue)
             except Exception as e:
                 logger.error(f"[Mines] Error adding experience for {sender}: {e}")
             
             try:
-                self.update_user_balance(user_id, new_balance)
+                new_balance = self.cache.update_balance(user_id, win_amount)
             except Exception as e:
                 logger.error(f"[Mines] Error updating balance for {sender}: {e}")
                 self.send_message_image(sender, file_queue,
@@ -708,17 +705,14 @@ class MinesPlugin(BaseGamePlugin):
                     mult = game.get_current_multiplier()
                     win_amount = int(bet * mult)
                     net_win = win_amount - bet
-                    new_balance = balance_before + win_amount
                     
                     try:
-                        newLevel, newLevelProgress = self.cache.add_experience(user_id, net_win, sender, file_queue)
-                        user["level"] = newLevel
-                        user["level_progress"] = newLevelProgress
+                        self.cache.add_experience(user_id, net_win, sender, file_queue)
                     except Exception as e:
                         logger.error(f"[Mines] Error adding experience for win: {e}")
                     
                     try:
-                        self.update_user_balance(user_id, new_balance)
+                        new_balance = self.cache.update_balance(user_id, win_amount)
                     except Exception as e:
                         logger.error(f"[Mines] Error updating balance for auto-win: {e}")
                         self.send_message_image(sender, file_queue,
@@ -753,9 +747,7 @@ class MinesPlugin(BaseGamePlugin):
                         self._save_active_games_to_cache()
                     
                     try:
-                        newLevel, newLevelProgress = self.cache.add_experience(user_id, -bet, sender, file_queue)
-                        user["level"] = newLevel
-                        user["level_progress"] = newLevelProgress
+                        self.cache.add_experience(user_id, -bet, sender, file_queue)
                     except Exception as e:
                         logger.error(f"[Mines] Error adding experience for loss: {e}")
 
@@ -5,6 +5,7 @@ from datetime import date, datetime
 from PIL import Image, ImageDraw
 
 from base_game_plugin import BaseGamePlugin
+from media_encoder import save_image
 from utils import _get_unique_id
 
 
@@ -173,10 +174,9 @@ class MonthlyQuestManager:
             if int(progress.get(game_key, 0) or 0) < int(entry["target"]):
                 return False, "Complete all monthly tasks first"
 
-        balance = user.get("balance", 0) + self.REWARD
         monthly["claimed"] = True
-        user["monthly_quests"] = monthly
-        cache.update_user(user_id, balance=balance, monthly_quests=monthly)
+        cache.update_user(user_id, monthly_quests=monthly)
+        cache.update_balance(user_id, self.REWARD)
         return True, self.REWARD
 
 
@@ -494,7 +494,7 @@ class MonthlyPlugin(BaseGamePlugin):
 
             os.makedirs(output_folder, exist_ok=True)
             output_path = os.path.join(output_folder, f"monthly_{username}_{_get_unique_id()}.png")
-            canvas.convert("RGB").save(output_path, "PNG", quality=95)
+            save_image(canvas.convert("RGB"), output_path, "card", format="PNG")
             return output_path
         except Exception:
             return None
@@ -7,6 +7,7 @@ from PIL import Image, ImageDraw
 
 from base_game_plugin import BaseGamePlugin
 from logger import logger
+from media_encoder import save_image
 from plugins.monthly import record_monthly_win
 
 
@@ -292,8 +293,7 @@ class PiggyPlugin(BaseGamePlugin):
                 return
 
             amount = int(info["claimed_amount"])
-            new_balance = self.cache.update_balance(user_id, amount)
-            user["balance"] = new_balance
+            self.cache.update_balance(user_id, amount)
             record_monthly_win(self.cache, user_id, "piggy", amount)
 
             logger.info(f"[Piggy] {sender} smashed piggy for {amount} coins")
@@ -367,7 +367,7 @@ class PiggyPlugin(BaseGamePlugin):
             output_dir = self.get_app_path("temp", "piggy")
             os.makedirs(output_dir, exist_ok=True)
             path = os.path.join(output_dir, f"piggy_{int(time.time() * 1000)}.png")
-            img.convert("RGB").save(path, format="PNG", optimize=True)
+            save_image(img.convert("RGB"), path, "card", format="PNG")
             return path, None
         except Exception as e:
             logger.error(f"[Piggy] Error creating status image: {e}", exc_info=True)
@@ -1,12 +1,123 @@
 import os
 import random
+import threading
 import time
+from collections import OrderedDict
 from PIL import Image, ImageDraw, ImageSequence
 from base_game_plugin import BaseGamePlugin
 from logger import logger
 from plugins.monthly import record_monthly_win
 from plugins.weekly import record_weekly_win
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError as e:
+    NUMPY_AVAILABLE = False
+    logger.warning(f"[Plinko] numpy not installed, multi-ball animations use the PIL compositor: {e}")
+
+PLINKO_TRACK_CACHE_SIZE = 64
+# 0 rolls every ball from all variants; N > 0 reuses cached tracks once N variants of a bucket are cached
+PLINKO_VARIANTS_PER_BUCKET = 0
+PLINKO_STATIC_TOLERANCE = 48
+
+
+def _alpha_over(dst, src):
+    src_alpha = src[:, 3:4].astype(np.float32) / 255
+    dst_alpha = dst[:, 3:4].astype(np.float32) / 255
+    out_alpha = src_alpha + dst_alpha * (1 - src_alpha)
+    rgb = src[:, :3] * src_alpha + dst[:, :3] * dst_alpha * (1 - src_alpha)
+    rgb = np.divide(rgb, out_alpha, out=np.zeros_like(rgb), where=out_alpha > 0)
+    return np.concatenate([rgb, out_alpha * 255], axis=1).round().clip(0, 255).astype(np.uint8)
+
+
+def _paste_over(canvas, index, values, opaque):
+    canvas[index[opaque]] = values[opaque]
+    blended = ~opaque
+    if blended.any():
+        blended_index = index[blended]
+        canvas[blended_index] = _alpha_over(canvas[blended_index], values[blended])
+
+
+class BallTrack:
+
+    def __init__(self, path):
+        frames = []
+        with Image.open(path) as img:
+            self.size = img.size
+            for index in range(getattr(img, "n_frames", 1)):
+                img.seek(index)
+                frames.append(np.asarray(img.convert("RGBA")).reshape(-1, 4))
+
+        stack = np.stack(frames)
+        alpha_min = stack[:, :, 3].min(axis=0)
+
+        self.static_index = np.flatnonzero(alpha_min > 0)
+        self.static = np.zeros((stack.shape[1], 4), np.uint8)
+        self.static[self.static_index] = np.median(stack[:, self.static_index], axis=0).round().astype(np.uint8)
+        static_values = self.static[self.static_index].astype(np.int16)
+
+        self.sprites = []
+        for frame in stack:
+            changed = frame[:, 3] != self.static[:, 3]
+            drift = np.abs(frame[self.static_index].astype(np.int16) - static_values).max(axis=1)
+            changed[self.static_index[drift > PLINKO_STATIC_TOLERANCE]] = True
+            index = np.flatnonzero(changed).astype(np.int32)
+            values = frame[index].copy()
+            self.sprites.append((index, values, values[:, 3] == 255))
+
+        self.nbytes = self.static.nbytes + sum(index.nbytes + values.nbytes for index, values, _ in self.sprites)
+
+    @property
+    def frame_count(self):
+        return len(self.sprites)
+
+    def sprite(self, frame_index):
+        return self.sprites[min(frame_index, len(self.sprites) - 1)]
+
+
+def composite_ball_tracks(tracks, frame_index):
+    base = tracks[0]
+    canvas = base.static.copy()
+    dirty = None
+
+    for track in tracks:
+        index, values, opaque = track.sprite(frame_index)
+        if dirty is None:
+            canvas[index] = values
+            dirty = index
+            continue
+
+        below = canvas[index]
+        covered = dirty[track.static[dirty, 3] > 0]
+        static_values = track.static[covered]
+        _paste_over(canvas, covered, static_values, static_values[:, 3] == 255)
+        canvas[index] = below
+        _paste_over(canvas, index, values, opaque)
+        dirty = np.concatenate([dirty, index])
+
+    return Image.fromarray(canvas.reshape(base.size[1], base.size[0], 4), "RGBA")
+
+
+class BallFrames:
+
+    def __init__(self, tracks):
+        self.tracks = tracks
+        self.frame_count = max(track.frame_count for track in tracks)
+
+    def __len__(self):
+        return self.frame_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.frame_count))]
+        if index < 0:
+            index += self.frame_count
+        if not 0 <= index < self.frame_count:
+            raise IndexError(index)
+        return composite_ball_tracks(self.tracks, index)
+
+
 class PlinkoPlugin(BaseGamePlugin):
     def __init__(self):
         super().__init__(
@@ -69,6 +180,10 @@ class PlinkoPlugin(BaseGamePlugin):
         
         self.max_balls = 5
         
+        self.ball_tracks = OrderedDict()
+        self.ball_tracks_lock = threading.Lock()
+        self.ball_track_stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'decode_ms': 0.0}
+        
     def _calculate_fixed_probabilities(self):
         probabilities_percent = [
             0.0190,
@@ -128,14 +243,102 @@ class PlinkoPlugin(BaseGamePlugin):
         
         return animation_path
     
+    def get_ball_track(self, animation_path, bucket):
+        mtime = os.path.getmtime(animation_path)
+        
+        with self.ball_tracks_lock:
+            entry = self.ball_tracks.get(animation_path)
+            if entry and entry[0] == mtime:
+                self.ball_tracks.move_to_end(animation_path)
+                self.ball_track_stats['hits'] += 1
+                return entry[2]
+        
+        start_time = time.perf_counter()
+        track = BallTrack(animation_path)
+        decode_ms = (time.perf_counter() - start_time) * 1000
+        
+        with self.ball_tracks_lock:
+            self.ball_tracks[animation_path] = (mtime, bucket, track)
+            self.ball_tracks.move_to_end(animation_path)
+            self.ball_track_stats['misses'] += 1
+            self.ball_track_stats['decode_ms'] += decode_ms
+            while len(self.ball_tracks) > PLINKO_TRACK_CACHE_SIZE:
+                self.ball_tracks.popitem(last=False)
+                self.ball_track_stats['evictions'] += 1
+        
+        return track
+    
+    def _pick_ball_animation(self, bucket, used_paths):
+        if PLINKO_VARIANTS_PER_BUCKET <= 0:
+            return self.get_base_animation_path(result_position=bucket)
+        
+        start, end = self.bucket_file_ranges.get(bucket, (1, 1))
+        wanted_variants = min(PLINKO_VARIANTS_PER_BUCKET, end - start + 1)
+        
+        with self.ball_tracks_lock:
+            cached = [
+                path for path, (_, track_bucket, _) in self.ball_tracks.items()
+                if track_bucket == bucket
+            ]
+        
+        unused = [path for path in cached if path not in used_paths and os.path.exists(path)]
+        if len(cached) >= wanted_variants and unused:
+            return random.choice(unused)
+        
+        return self.get_base_animation_path(result_position=bucket)
+    
     def get_multiple_balls_animation(self, buckets):
+        if not NUMPY_AVAILABLE:
+            return self._get_multiple_balls_animation_pil(buckets)
+        
+        try:
+            used_paths = set()
+            tracks = []
+            first_animation_path = None
+            
+            for i, bucket in enumerate(buckets):
+                anim_path = self._pick_ball_animation(bucket, used_paths)
+                
+                if not anim_path:
+                    if i == 0:
+                        return None
+                    continue
+                
+                track = self.get_ball_track(anim_path, bucket)
+                if tracks and track.size != tracks[0].size:
+                    logger.warning(f"[Plinko] Skipping ball animation with mismatched size: {anim_path}")
+                    continue
+                
+                if i == 0:
+                    first_animation_path = anim_path
+                used_paths.add(anim_path)
+                tracks.append(track)
+            
+            if len(tracks) == 1:
+                return first_animation_path, None
+            
+            return first_animation_path, BallFrames(tracks)
+            
+        except Exception as e:
+            logger.error(f"[Plinko] Error creating multi-ball animation: {e}", exc_info=True)
+            return None, None
+    
+    def get_ball_track_stats(self):
+        with self.ball_tracks_lock:
+            return {
+                **self.ball_track_stats,
+                'tracks': len(self.ball_tracks),
+                'bytes': sum(track.nbytes for _, _, track in self.ball_tracks.values()),
+            }
+    
+    def _get_multiple_balls_animation_pil(self, buckets):
         try:
             first_animation_path = self.get_base_animation_path(
                 result_position=buckets[0]
             )
             
             if not first_animation_path:
-                return None
+                return None, None
             
             animation_frames_list = []
             for i, bucket in enumerate(buckets):
@@ -152,7 +355,7 @@ class PlinkoPlugin(BaseGamePlugin):
                         animation_frames_list.append(frames)
             
             if len(animation_frames_list) == 0:
-                return first_animation_path
+                return first_animation_path, None
             
             first_frames = self._load_animation_frames(first_animation_path)
             max_frames = len(first_frames)
@@ -181,27 +384,11 @@ class PlinkoPlugin(BaseGamePlugin):
                 
                 combined_frames.append(combined_frame)
             
-            timestamp = int(time.time())
-            temp_path = os.path.join(self.get_app_path("temp"), f"plinko_multi_{timestamp}.webp")
-            
-            if len(combined_frames) > 1:
-                combined_frames[0].save(
-                    temp_path,
-                    format='WEBP',
-                    save_all=True,
-                    append_images=combined_frames[1:],
-                    duration=40,
-                    loop=0,
-                    quality=90
-                )
-            else:
-                combined_frames[0].save(temp_path, format='WEBP', quality=90)
-            
-            return temp_path
+            return first_animation_path, combined_frames
             
         except Exception as e:
             logger.error(f"[Plinko] Error creating multi-ball animation: {e}")
-            return None
+            return None, None
     
     def _load_animation_frames(self, animation_path):
         try:
@@ -501,10 +688,9 @@ class PlinkoPlugin(BaseGamePlugin):
         
         total_win, individual_wins = self.calculate_win(bet_amount, risk_level, buckets)
         net_win = total_win - total_bet
-        new_balance = balance_before + net_win
         
         try:
-            self.update_user_balance(user_id, new_balance)
+            new_balance = self.cache.update_balance(user_id, net_win)
         except Exception as e:
             logger.error(f"[Plinko] Error updating balance: {e}")
             self.send_message_image(sender, file_queue,
@@ -519,18 +705,17 @@ class PlinkoPlugin(BaseGamePlugin):
         user_info_before = self.create_user_info(sender, total_bet, 0, balance_before, user.copy())
         
         try:
-            newLevel, newLevelProgress = self.cache.add_experience(user_id, net_win, sender, file_queue)
-            user["level"] = newLevel
-            user["level_progress"] = newLevelProgress
+            self.cache.add_experience(user_id, net_win, sender, file_queue)
         except Exception as e:
             logger.error(f"[Plinko] Error adding experience: {e}")
         
+        base_frames = None
         if ball_count == 1:
             base_animation_path = self.get_base_animation_path(
                 result_position=buckets[0]
             )
         else:
-            base_animation_path = self.get_multiple_balls_animation(buckets)
+            base_animation_path, base_frames = self.get_multiple_balls_animation(buckets)
         
         if not base_animation_path:
             self.send_message_image(sender, file_queue,
@@ -561,7 +746,8 @@ class PlinkoPlugin(BaseGamePlugin):
             win_text_scale=0.7,
             avatar_size=65,
             win_text_height=150,
-            overlay_position = 'top'
+            overlay_position = 'top',
+            base_frames=base_frames
         )
         
         if error or not result_path:
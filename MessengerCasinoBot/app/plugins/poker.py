@@ -9,6 +9,7 @@ from PIL import Image, ImageDraw
 
 from base_game_plugin import BaseGamePlugin
 from logger import logger
+from media_encoder import save_image, reencode
 from plugins.monthly import record_monthly_win
 from plugins.weekly import record_weekly_win
 
@@ -801,7 +802,7 @@ class PokerTableRenderer:
                 action = f"LOST {abs(game.net_win)}"
         self._draw_centered_bottom(canvas, action, 17, status_color, bottom_padding=0)
 
-        canvas.convert("RGB").save(output_path, "PNG", quality=95)
+        save_image(canvas.convert("RGB"), output_path, "intermediate", format="PNG")
 
 
 class PokerPlugin(BaseGamePlugin):
@@ -931,6 +932,7 @@ class PokerPlugin(BaseGamePlugin):
             or not os.path.exists(avatar_path)
             or not os.path.exists(background_path)
         ):
+            reencode(table_path, "card")
             file_queue.put(table_path)
             return True
 
@@ -953,6 +955,7 @@ class PokerPlugin(BaseGamePlugin):
         except Exception as exc:
             logger.error(f"[Poker] Could not apply user overlay: {exc}", exc_info=True)
 
+        reencode(table_path, "card")
         file_queue.put(table_path)
         return True
 
@@ -963,14 +966,10 @@ class PokerPlugin(BaseGamePlugin):
 
         final_balance = user.get("balance", 0)
         if game.payout > 0:
-            final_balance += game.payout
-            self.update_user_balance(user_id, final_balance)
-            user["balance"] = final_balance
+            final_balance = self.cache.update_balance(user_id, game.payout)
 
         try:
-            new_level, new_progress = self.cache.add_experience(user_id, game.net_win, sender, file_queue)
-            user["level"] = new_level
-            user["level_progress"] = new_progress
+            self.cache.add_experience(user_id, game.net_win, sender, file_queue)
         except Exception as exc:
             logger.error(f"[Poker] Could not add experience: {exc}", exc_info=True)
 
@@ -986,9 +985,7 @@ class PokerPlugin(BaseGamePlugin):
             return True
         if user.get("balance", 0) < amount:
             return False
-        new_balance = user["balance"] - amount
-        self.update_user_balance(user_id, new_balance)
-        user["balance"] = new_balance
+        self.cache.update_balance(user_id, -amount)
         return True
 
     def _pending_player_cost(self, game: TexasHoldemGame, cmd: str, amount: int = 0) -> int:
@@ -1098,8 +1095,7 @@ class PokerPlugin(BaseGamePlugin):
                 return ""
             success, message = game.player_bet(amount)
             if not success:
-                user["balance"] += cost
-                self.update_user_balance(user_id, user["balance"])
+                self.cache.update_balance(user_id, cost)
             elif self._force_showdown_if_broke(user, game):
                 message = game.message
 
@@ -1114,8 +1110,7 @@ class PokerPlugin(BaseGamePlugin):
                 return ""
             success, message = game.player_raise(amount)
             if not success:
-                user["balance"] += cost
-                self.update_user_balance(user_id, user["balance"])
+                self.cache.update_balance(user_id, cost)
             elif self._force_showdown_if_broke(user, game):
                 message = game.message
 
@@ -3,6 +3,7 @@ import time
 from PIL import Image, ImageFont, ImageDraw
 from base_game_plugin import BaseGamePlugin
 from logger import logger
+from media_encoder import save_image
 
 class RankingPlugin(BaseGamePlugin):
     def __init__(self):
@@ -129,43 +130,32 @@ class RankingPlugin(BaseGamePlugin):
         
         return leader_time, leader_record
     
-    def get_sorted_ranking(self, cache, ranking_type="balance", max_users=None):
-        if not hasattr(cache, 'users'):
+    def _ranking_entry(self, user_id, user_data):
+        return {
+            **user_data,
+            'id': user_id,
+            'balance': user_data.get('balance', 0),
+            'level': user_data.get('level', 1),
+            'level_progress': user_data.get('level_progress', 0.0),
+            'name': user_data.get('name', f'User {user_id}'),
+            'avatar': user_data.get('avatar', 'default-avatar.png')
+        }
+
+    def get_sorted_ranking(self, cache, ranking_type="balance", max_users=None, offset=0):
+        if not hasattr(cache, 'get_leaderboard'):
             return []
         
-        users = cache.users
-        user_list = []
-        
-        for user_id, user_data in users.items():
-            if isinstance(user_data, dict):
-                user_data['id'] = user_id
-                user_data['balance'] = user_data.get('balance', 0)
-                user_data['level'] = user_data.get('level', 1)
-                user_data['level_progress'] = user_data.get('level_progress', 0.0)
-                user_data['name'] = user_data.get('name', f'User {user_id}')
-                user_data['avatar'] = user_data.get('avatar', 'default-avatar.png')
-                
-                user_list.append(user_data)
-        
-        if ranking_type == "level":
-            sorted_users = sorted(
-                user_list, 
-                key=lambda x: (x['level'], x['level_progress']), 
-                reverse=True
-            )
-        else:
-            sorted_users = sorted(user_list, key=lambda x: x['balance'], reverse=True)
-        
-        if max_users:
-            return sorted_users[:max_users]
-        return sorted_users
+        return [
+            self._ranking_entry(user_id, user_data)
+            for user_id, user_data in cache.get_leaderboard(ranking_type, offset, max_users)
+        ]
     
     def get_user_position(self, cache, user_id, ranking_type="balance"):
-        ranking = self.get_sorted_ranking(cache, ranking_type)
+        position = cache.get_leaderboard_rank(ranking_type, user_id)
+        user_data = cache.get_user(user_id)
         
-        for i, user in enumerate(ranking, 1):
-            if user['id'] == str(user_id):
-                return i, user
+        if position and user_data:
+            return position, self._ranking_entry(str(user_id), user_data)
         
         return None, None
 
@@ -204,15 +194,15 @@ class RankingPlugin(BaseGamePlugin):
 
         return ranking_type, max(1, page)
 
-    def _get_ranking_page(self, ranking, requested_page=1, page_size=10):
+    def _get_ranking_page(self, cache, ranking_type, requested_page=1, page_size=10):
         page_size = max(1, int(page_size or 10))
-        total_users = len(ranking)
+        total_users = cache.get_leaderboard_size(ranking_type)
         total_pages = max(1, (total_users + page_size - 1) // page_size)
         page = min(max(1, int(requested_page or 1)), total_pages)
 
         start_index = (page - 1) * page_size
         end_index = min(start_index + page_size, total_users)
-        page_users = ranking[start_index:end_index]
+        page_users = self.get_sorted_ranking(cache, ranking_type, max_users=page_size, offset=start_index)
 
         if not page_users:
             return page_users, page, total_pages, 0, 0
@@ -231,18 +221,46 @@ class RankingPlugin(BaseGamePlugin):
             shadow_offset=(2, 2)
         )
 
-    def create_ranking_image(self, output_path, cache, user_id=None, ranking_type="balance", page=1, page_size=10):
+    def create_ranking_image(self, cache, user_id=None, ranking_type="balance", page=1, page_size=10):
         for rt in ["balance", "level"]:
-            ranking = self.get_sorted_ranking(cache, rt)
-            leader_id = ranking[0]['id'] if ranking else None
+            leaders = self.get_sorted_ranking(cache, rt, max_users=1)
+            leader_id = leaders[0]['id'] if leaders else None
             self._update_leader_record(cache, leader_id, rt)
 
-        ranking = self.get_sorted_ranking(cache, ranking_type)
-        page_users, page, total_pages, start_rank, end_rank = self._get_ranking_page(ranking, page, page_size)
+        page_users, page, total_pages, start_rank, end_rank = self._get_ranking_page(cache, ranking_type, page, page_size)
+        total_users = cache.get_leaderboard_size(ranking_type)
 
-        leader_id = ranking[0]['id'] if ranking else None
+        leaders = self.get_sorted_ranking(cache, ranking_type, max_users=1)
+        leader_id = leaders[0]['id'] if leaders else None
         leader_time, leader_record = self._update_leader_record(cache, leader_id, ranking_type)
-        
+
+        position = None
+        if user_id and total_users:
+            position, user_data = self.get_user_position(cache, user_id, ranking_type)
+
+        files = []
+        rows = []
+        for user in page_users:
+            avatar_file = user.get('avatar')
+            files.append(os.path.join(self.avatars_folder, avatar_file) if avatar_file else None)
+            files.append(cache.get_background_path(user['id']) if hasattr(cache, 'get_background_path') else None)
+            rows.append((user['id'], user['name'], user['balance'], user['level'], user['level_progress'], avatar_file))
+
+        key = self.render_cache.make_key(
+            "ranking", ranking_type, page, page_size, total_pages, total_users, position,
+            self._format_duration(leader_time) if leader_time > 0 else "", rows,
+            files=files
+        )
+        return self.render_cache.get_or_render(
+            key, ".webp",
+            lambda output_path: self._render_ranking_image(
+                output_path, cache, total_users, ranking_type, page_users, page, total_pages,
+                start_rank, end_rank, leader_time, position, page_size
+            )
+        )
+
+    def _render_ranking_image(self, output_path, cache, total_users, ranking_type, page_users, page, total_pages,
+                              start_rank, end_rank, leader_time, position, page_size):
         AVATAR_SIZE = 70
         ROW_HEIGHT = 100
         MARGIN = 20
@@ -519,7 +537,6 @@ class RankingPlugin(BaseGamePlugin):
                 fill=(100, 100, 120, 180), width=2)
 
         footer_lines = []
-        total_users = len(ranking)
         if total_users:
             footer_lines.append(f"Page {page}/{total_pages} | Players {start_rank}-{end_rank} of {total_users}")
         else:
@@ -534,14 +551,12 @@ class RankingPlugin(BaseGamePlugin):
         if page_hints:
             footer_lines.append(" | ".join(page_hints))
 
-        if user_id and total_users:
-            position, user_data = self.get_user_position(cache, user_id, ranking_type)
-            if position:
-                user_page = ((position - 1) // max(1, page_size)) + 1
-                if start_rank <= position <= end_rank:
-                    footer_lines.append(f"Your position: #{position}/{total_users}")
-                else:
-                    footer_lines.append(f"Your position: #{position}/{total_users} (page {user_page})")
+        if position and total_users:
+            user_page = ((position - 1) // max(1, page_size)) + 1
+            if start_rank <= position <= end_rank:
+                footer_lines.append(f"Your position: #{position}/{total_users}")
+            else:
+                footer_lines.append(f"Your position: #{position}/{total_users} (page {user_page})")
 
         for line_index, footer_text in enumerate(footer_lines[:3]):
             footer_img = self.text_renderer.render_text(
@@ -557,9 +572,8 @@ class RankingPlugin(BaseGamePlugin):
             footer_x = (total_width - footer_img.width) // 2
             img.alpha_composite(footer_img, (footer_x, footer_y + line_index * 28))
         
-        img.save(output_path, format='WEBP', quality=90, optimize=True)
+        save_image(img, output_path, "card", format="WEBP")
         logger.info(f"[Ranking] Ranking image saved to: {output_path}")
-        return output_path
 
     def execute_game(self, command_name, args, file_queue, cache=None, sender=None, avatar_url=None):
         self.cache = cache
@@ -578,8 +592,7 @@ class RankingPlugin(BaseGamePlugin):
         
         ranking_type, page = self._parse_ranking_args(args)
         
-        img_path = os.path.join(self.results_folder, f"ranking_{ranking_type}_p{page}_{user_id}.webp")
-        self.create_ranking_image(img_path, cache, user_id, ranking_type, page=page)
+        img_path = self.create_ranking_image(cache, user_id, ranking_type, page=page)
         
         file_queue.put(img_path)
         
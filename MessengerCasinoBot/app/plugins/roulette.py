@@ -4,6 +4,7 @@ import time
 from typing import Dict, Optional, Any
 from base_game_plugin import BaseGamePlugin
 from logger import logger
+from media_encoder import save_image
 from plugins.monthly import record_monthly_win
 from plugins.weekly import record_weekly_win
 from PIL import Image, ImageDraw
@@ -318,7 +319,7 @@ class RoulettePlugin(BaseGamePlugin):
                     help_img.paste(overlay_img, position, overlay_img)
                     
                     temp_path = os.path.join(self.get_asset_path("temp"), f"roulette_help_with_history_{int(time.time())}.png")
-                    help_img.save(temp_path, "PNG")
+                    save_image(help_img, temp_path, "card", format="PNG")
                     
                     file_queue.put(temp_path)
                 except Exception as e:
@@ -395,10 +396,9 @@ class RoulettePlugin(BaseGamePlugin):
 
         result_number = random.randint(0, 36)
         win = self.calculate_win(bet_type, amount, result_number)
-        new_balance = balance_before + win
         
         try:
-            self.update_user_balance(user_id, new_balance)
+            new_balance = self.cache.update_balance(user_id, win - amount)
         except Exception as e:
             logger.error(f"[Roulette] Error updating balance for user {user_id}: {e}")
             self.send_message_image(sender, file_queue, 
@@ -413,11 +413,9 @@ class RoulettePlugin(BaseGamePlugin):
         
         try:
             exp_amount = net_win if net_win > 0 else -amount
-            newLevel, newLevelProgress = self.cache.add_experience(user_id, exp_amount, sender, file_queue)
+            self.cache.add_experience(user_id, exp_amount, sender, file_queue)
         except Exception as e:
             logger.error(f"[Roulette] Error adding experience: {e}")
-            newLevel = user.get("level", 1)
-            newLevelProgress = user.get("level_progress", 0.1)
 
         base_animation_path = self.get_base_animation_path(result_number)
         if not base_animation_path:
@@ -427,8 +425,6 @@ class RoulettePlugin(BaseGamePlugin):
                 "Roulette - Animation Error", cache, user_id)
             return None
         
-        user["level"] = newLevel
-        user["level_progress"] = newLevelProgress
         if net_win > 0:
             record_weekly_win(self.cache, user_id, "roulette", net_win)
             record_monthly_win(self.cache, user_id, "roulette", net_win)
@@ -8,6 +8,7 @@ from PIL import Image, ImageDraw
 
 from base_game_plugin import BaseGamePlugin
 from logger import logger
+from media_encoder import save_image, save_animation
 from plugins.monthly import record_monthly_win
 from plugins.weekly import record_weekly_win
 
@@ -201,10 +202,9 @@ class Roulette2Plugin(BaseGamePlugin):
         result = random.choice(self.fields)
         win = self.calculate_win(bet_type, amount, result)
         net_win = win - amount
-        new_balance = balance_before - amount + win
 
         try:
-            self.update_user_balance(user_id, new_balance)
+            new_balance = self.cache.update_balance(user_id, win - amount)
         except Exception as e:
             logger.error(f"[Roulette2] Error updating balance for user {user_id}: {e}")
             self.send_message_image(sender, file_queue, "Error updating balance!", "Roulette2 - Error", cache, user_id)
@@ -212,9 +212,7 @@ class Roulette2Plugin(BaseGamePlugin):
 
         try:
             exp_amount = net_win if net_win > 0 else -amount
-            new_level, new_progress = self.cache.add_experience(user_id, exp_amount, sender, file_queue)
-            user["level"] = new_level
-            user["level_progress"] = new_progress
+            self.cache.add_experience(user_id, exp_amount, sender, file_queue)
         except Exception as e:
             logger.error(f"[Roulette2] Error adding experience: {e}")
 
@@ -301,15 +299,12 @@ class Roulette2Plugin(BaseGamePlugin):
                     durations.append(img.info.get('duration', 50))
                 
                 temp_path = self.get_temp_path(f"cropped_{os.path.basename(animation_path)}")
-                frames[0].save(
+                save_animation(
+                    frames,
                     temp_path,
-                    save_all=True,
-                    append_images=frames[1:],
+                    "intermediate",
                     duration=durations,
-                    loop=0,
-                    format="WEBP",
-                    quality=68,
-                    method=4,
+                    loop=0
                 )
                 return temp_path
             else:
@@ -321,7 +316,7 @@ class Roulette2Plugin(BaseGamePlugin):
                     height
                 ))
                 temp_path = self.get_temp_path(f"cropped_{os.path.basename(animation_path)}")
-                cropped.save(temp_path, "WEBP", quality=68)
+                save_image(cropped, temp_path, "intermediate", format="WEBP")
                 return temp_path
                 
         except Exception as e:
@@ -4,6 +4,7 @@ import configparser
 from PIL import Image, ImageDraw
 from base_game_plugin import BaseGamePlugin
 from logger import logger
+from media_encoder import save_image
 
 
 class ShopPlugin(BaseGamePlugin):
@@ -390,136 +391,143 @@ class ShopPlugin(BaseGamePlugin):
 
     def _create_shop_image(self, user_id, user_name):
         try:
-            width, height = 600, 650
-            img = self._load_background(user_id, width, height)
-            draw = ImageDraw.Draw(img)
-            
-            overlay = Image.new("RGBA", (width, height), (0, 0, 0, 130))
-            img = Image.alpha_composite(img.convert("RGBA"), overlay)
-            draw = ImageDraw.Draw(img)
-            
-            title = self._render_text(
-                "COIN SHOP", 
-                38, 
-                self.colors["gold"],
-                stroke=3
-            )
-            img.paste(title, ((width - title.width) // 2, 20), title)
-            
-            draw.line([(40, 75), (width - 40, 75)], fill=self.colors["gold"], width=2)
-            
-            info_y = 110
-            
-            box_x1 = 40
-            box_x2 = width - 40
-            box_y1 = info_y
-            box_y2 = info_y + 180
-            
-            draw.rounded_rectangle(
-                [box_x1, box_y1, box_x2, box_y2],
-                radius=15,
-                fill=(self.colors["panel"][0], self.colors["panel"][1], self.colors["panel"][2], 200),
-                outline=self.colors["gold"],
-                width=2
-            )
-            
-            line1 = "Send a BLIK transfer to:"
-            line1_img = self._render_text(line1, 22, self.colors["text"], stroke=1)
-            img.paste(line1_img, ((width - line1_img.width) // 2, box_y1 + 15), line1_img)
-            
-            blik_img = self._render_text(
-                self.BLIK_NUMBER, 
-                40, 
-                self.colors["pink"],
-                stroke=3
-            )
-            img.paste(blik_img, ((width - blik_img.width) // 2, box_y1 + 45), blik_img)
-            
-            line2 = "In the TRANSFER TITLE enter your ID:"
-            line2_img = self._render_text(line2, 22, self.colors["text"], stroke=1)
-            img.paste(line2_img, ((width - line2_img.width) // 2, box_y1 + 95), line2_img)
-            
-            id_big_img = self._render_text(
-                f">>> {user_id} <<<", 
-                36, 
-                self.colors["green"],
-                stroke=3
-            )
-            img.paste(id_big_img, ((width - id_big_img.width) // 2, box_y1 + 125), id_big_img)
-            
-            rate_y = box_y2 + 25
-            
-            rate_box_y1 = rate_y
-            rate_box_y2 = rate_y + 70
+            bg_path = self._get_background_path(user_id)
+            pool_info = self.get_pool_info()
             
-            draw.rounded_rectangle(
-                [box_x1, rate_box_y1, box_x2, rate_box_y2],
-                radius=15,
-                fill=(self.colors["panel"][0], self.colors["panel"][1], self.colors["panel"][2], 200),
-                outline=self.colors["orange"],
-                width=2
+            key = self.render_cache.make_key(
+                "shop", user_id, self.BLIK_NUMBER, self.MIN_EXCHANGE_RATE,
+                f"{pool_info['available_pln']:.2f}", f"{pool_info['rate']:.0f}",
+                files=[bg_path]
             )
-            
-            rate_text = f"1 PLN = {self.MIN_EXCHANGE_RATE} COINS"
-            rate_img = self._render_text(rate_text, 28, self.colors["orange"], stroke=2)
-            img.paste(rate_img, ((width - rate_img.width) // 2, rate_box_y1 + 20), rate_img)
-            
-            pool_y = rate_box_y2 + 25
-            
-            pool_box_y1 = pool_y
-            pool_box_y2 = pool_y + 180
-            
-            draw.rounded_rectangle(
-                [box_x1, pool_box_y1, box_x2, pool_box_y2],
-                radius=15,
-                fill=(self.colors["panel"][0], self.colors["panel"][1], self.colors["panel"][2], 200),
-                outline=self.colors["green"],
-                width=2
+            return self.render_cache.get_or_render(
+                key, ".png",
+                lambda path: self._render_shop_image(path, user_id, bg_path, pool_info)
             )
             
-            pool_line1 = "50% OF AMOUNT GOES TO WITHDRAWAL POOL"
-            pool_line1_img = self._render_text(pool_line1, 22, self.colors["green"], stroke=2)
-            img.paste(pool_line1_img, ((width - pool_line1_img.width) // 2, pool_box_y1 + 8), pool_line1_img)
-            
-            pool_line2 = "ANYONE CAN WITHDRAW IT"
-            pool_line2_img = self._render_text(pool_line2, 20, self.colors["gold"], stroke=2)
-            img.paste(pool_line2_img, ((width - pool_line2_img.width) // 2, pool_box_y1 + 38), pool_line2_img)
-            
-            pool_info = self.get_pool_info()
-            
-            pool_status = f"Available: {pool_info['available_pln']:.2f} PLN"
-            pool_status_img = self._render_text(pool_status, 20, self.colors["muted"], stroke=1)
-            img.paste(pool_status_img, ((width - pool_status_img.width) // 2, pool_box_y1 + 72), pool_status_img)
-            
-            pool_rate = f"Withdrawal rate: {pool_info['rate']:.0f} coins/PLN"
-            pool_rate_img = self._render_text(pool_rate, 18, self.colors["blue"], stroke=1)
-            img.paste(pool_rate_img, ((width - pool_rate_img.width) // 2, pool_box_y1 + 100), pool_rate_img)
-            
-            pool_cmds1 = "/shop pool - status"
-            pool_cmds1_img = self._render_text(pool_cmds1, 16, self.colors["muted"], stroke=1)
-            img.paste(pool_cmds1_img, ((width - pool_cmds1_img.width) // 2, pool_box_y1 + 128), pool_cmds1_img)
-            
-            pool_cmds2 = "/shop withdraw [amount] - withdraw"
-            pool_cmds2_img = self._render_text(pool_cmds2, 16, self.colors["muted"], stroke=1)
-            img.paste(pool_cmds2_img, ((width - pool_cmds2_img.width) // 2, pool_box_y1 + 148), pool_cmds2_img)
-            
-            footer_y = pool_box_y2 + 15
-            footer_text = "Coins are added automatically after receiving the transfer"
-            footer_img = self._render_text(footer_text, 16, self.colors["muted"], stroke=1)
-            img.paste(footer_img, ((width - footer_img.width) // 2, footer_y), footer_img)
-            
-            output_dir = self.get_app_path("temp", "shop")
-            os.makedirs(output_dir, exist_ok=True)
-            path = os.path.join(output_dir, f"shop_{user_id}_{int(time.time() * 1000)}.png")
-            img.convert("RGB").save(path, format="PNG", optimize=True)
-            
-            return path
-            
         except Exception as e:
             logger.error(f"[Shop] Error creating shop image: {e}", exc_info=True)
             return None
 
-    def _load_background(self, user_id, width, height):
+    def _render_shop_image(self, path, user_id, bg_path, pool_info):
+        width, height = 600, 650
+        img = self._load_background(bg_path, width, height)
+        draw = ImageDraw.Draw(img)
+        
+        overlay = Image.new("RGBA", (width, height), (0, 0, 0, 130))
+        img = Image.alpha_composite(img.convert("RGBA"), overlay)
+        draw = ImageDraw.Draw(img)
+        
+        title = self._render_text(
+            "COIN SHOP", 
+            38, 
+            self.colors["gold"],
+            stroke=3
+        )
+        img.paste(title, ((width - title.width) // 2, 20), title)
+        
+        draw.line([(40, 75), (width - 40, 75)], fill=self.colors["gold"], width=2)
+        
+        info_y = 110
+        
+        box_x1 = 40
+        box_x2 = width - 40
+        box_y1 = info_y
+        box_y2 = info_y + 180
+        
+        draw.rounded_rectangle(
+            [box_x1, box_y1, box_x2, box_y2],
+            radius=15,
+            fill=(self.colors["panel"][0], self.colors["panel"][1], self.colors["panel"][2], 200),
+            outline=self.colors["gold"],
+            width=2
+        )
+        
+        line1 = "Send a BLIK transfer to:"
+        line1_img = self._render_text(line1, 22, self.colors["text"], stroke=1)
+        img.paste(line1_img, ((width - line1_img.width) // 2, box_y1 + 15), line1_img)
+        
+        blik_img = self._render_text(
+            self.BLIK_NUMBER, 
+            40, 
+            self.colors["pink"],
+            stroke=3
+        )
+        img.paste(blik_img, ((width - blik_img.width) // 2, box_y1 + 45), blik_img)
+        
+        line2 = "In the TRANSFER TITLE enter your ID:"
+        line2_img = self._render_text(line2, 22, self.colors["text"], stroke=1)
+        img.paste(line2_img, ((width - line2_img.width) // 2, box_y1 + 95), line2_img)
+        
+        id_big_img = self._render_text(
+            f">>> {user_id} <<<", 
+            36, 
+            self.colors["green"],
+            stroke=3
+        )
+        img.paste(id_big_img, ((width - id_big_img.width) // 2, box_y1 + 125), id_big_img)
+        
+        rate_y = box_y2 + 25
+        
+        rate_box_y1 = rate_y
+        rate_box_y2 = rate_y + 70
+        
+        draw.rounded_rectangle(
+            [box_x1, rate_box_y1, box_x2, rate_box_y2],
+            radius=15,
+            fill=(self.colors["panel"][0], self.colors["panel"][1], self.colors["panel"][2], 200),
+            outline=self.colors["orange"],
+            width=2
+        )
+        
+        rate_text = f"1 PLN = {self.MIN_EXCHANGE_RATE} COINS"
+        rate_img = self._render_text(rate_text, 28, self.colors["orange"], stroke=2)
+        img.paste(rate_img, ((width - rate_img.width) // 2, rate_box_y1 + 20), rate_img)
+        
+        pool_y = rate_box_y2 + 25
+        
+        pool_box_y1 = pool_y
+        pool_box_y2 = pool_y + 180
+        
+        draw.rounded_rectangle(
+            [box_x1, pool_box_y1, box_x2, pool_box_y2],
+            radius=15,
+            fill=(self.colors["panel"][0], self.colors["panel"][1], self.colors["panel"][2], 200),
+            outline=self.colors["green"],
+            width=2
+        )
+        
+        pool_line1 = "50% OF AMOUNT GOES TO WITHDRAWAL POOL"
+        pool_line1_img = self._render_text(pool_line1, 22, self.colors["green"], stroke=2)
+        img.paste(pool_line1_img, ((width - pool_line1_img.width) // 2, pool_box_y1 + 8), pool_line1_img)
+        
+        pool_line2 = "ANYONE CAN WITHDRAW IT"
+        pool_line2_img = self._render_text(pool_line2, 20, self.colors["gold"], stroke=2)
+        img.paste(pool_line2_img, ((width - pool_line2_img.width) // 2, pool_box_y1 + 38), pool_line2_img)
+        
+        pool_status = f"Available: {pool_info['available_pln']:.2f} PLN"
+        pool_status_img = self._render_text(pool_status, 20, self.colors["muted"], stroke=1)
+        img.paste(pool_status_img, ((width - pool_status_img.width) // 2, pool_box_y1 + 72), pool_status_img)
+        
+        pool_rate = f"Withdrawal rate: {pool_info['rate']:.0f} coins/PLN"
+        pool_rate_img = self._render_text(pool_rate, 18, self.colors["blue"], stroke=1)
+        img.paste(pool_rate_img, ((width - pool_rate_img.width) // 2, pool_box_y1 + 100), pool_rate_img)
+        
+        pool_cmds1 = "/shop pool - status"
+        pool_cmds1_img = self._render_text(pool_cmds1, 16, self.colors["muted"], stroke=1)
+        img.paste(pool_cmds1_img, ((width - pool_cmds1_img.width) // 2, pool_box_y1 + 128), pool_cmds1_img)
+        
+        pool_cmds2 = "/shop withdraw [amount] - withdraw"
+        pool_cmds2_img = self._render_text(pool_cmds2, 16, self.colors["muted"], stroke=1)
+        img.paste(pool_cmds2_img, ((width - pool_cmds2_img.width) // 2, pool_box_y1 + 148), pool_cmds2_img)
+        
+        footer_y = pool_box_y2 + 15
+        footer_text = "Coins are added automatically after receiving the transfer"
+        footer_img = self._render_text(footer_text, 16, self.colors["muted"], stroke=1)
+        img.paste(footer_img, ((width - footer_img.width) // 2, footer_y), footer_img)
+        
+        save_image(img.convert("RGB"), path, "card", format="PNG")
+
+    def _get_background_path(self, user_id):
         bg_path = None
         cache = getattr(self, "cache", None)
         
@@ -529,6 +537,9 @@ class ShopPlugin(BaseGamePlugin):
         if not bg_path or not os.path.exists(bg_path):
             bg_path = self.get_asset_path("backgrounds", "default-bg.png")
         
+        return bg_path
+
+    def _load_background(self, bg_path, width, height):
         try:
             bg = Image.open(bg_path).convert("RGB")
         except Exception:
@@ -199,10 +199,9 @@ class SlotsPlugin(BaseGamePlugin):
         
         win_amount = self.calculate_win(bet_amount, win_multiplier)
         net_win = win_amount - bet_amount
-        new_balance = balance_before + net_win
         
         try:
-            self.update_user_balance(user_id, new_balance)
+            new_balance = self.cache.update_balance(user_id, net_win)
         except Exception as e:
             logger.error(f"Error updating balance for user {user_id}: {e}")
             self.send_message_image(sender, file_queue, 
@@ -214,14 +213,10 @@ class SlotsPlugin(BaseGamePlugin):
         user_info_before = self.create_user_info(sender, bet_amount, 0, balance_before, user.copy())
         
         try:
-            newLevel, newLevelProgress = self.cache.add_experience(user_id, net_win, sender, file_queue)
+            self.cache.add_experience(user_id, net_win, sender, file_queue)
         except Exception as e:
             logger.error(f"Error adding experience: {e}")
-            newLevel = user.get("level", 1)
-            newLevelProgress = user.get("level_progress", 0.1)
         
-        user["level"] = newLevel
-        user["level_progress"] = newLevelProgress
         if net_win > 0:
             record_weekly_win(self.cache, user_id, "slots", net_win)
             record_monthly_win(self.cache, user_id, "slots", net_win)
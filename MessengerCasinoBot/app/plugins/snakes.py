@@ -462,7 +462,7 @@ class SnakesPlugin(BaseGamePlugin):
                 net_win = payout - bet
                 new_balance = balance_after_bet + payout
                 try:
-                    self.update_user_balance(user_id, new_balance)
+                    new_balance = self.cache.update_balance(user_id, payout)
                 except Exception as e:
                     logger.error(f"[Snakes] Balance update failed: {e}")
                 if net_win > 0:
@@ -557,7 +557,7 @@ class SnakesPlugin(BaseGamePlugin):
             net_win = payout - bet
             new_balance = balance_after_bet + payout
             try:
-                self.update_user_balance(user_id, new_balance)
+                new_balance = self.cache.update_balance(user_id, payout)
             except Exception as e:
                 logger.error(f"[Snakes] Balance update failed: {e}")
 
@@ -649,9 +649,8 @@ class SnakesPlugin(BaseGamePlugin):
         difficulty = self._parse_difficulty(args[1] if len(args) > 1 else None)
         game = SnakesGame(bet=bet, difficulty=difficulty)
 
-        balance_after_bet = balance_before - bet
         try:
-            self.update_user_balance(user_id, balance_after_bet)
+            balance_after_bet = self.cache.update_balance(user_id, -bet)
         except Exception as e:
             logger.error(f"[Snakes] Balance update failed: {e}")
             self.send_message_image(
@@ -737,7 +736,7 @@ class SnakesPlugin(BaseGamePlugin):
             net_win = payout - bet
             new_balance = balance_after_bet + payout
             try:
-                self.update_user_balance(user_id, new_balance)
+                new_balance = self.cache.update_balance(user_id, payout)
             except:
                 pass
             if net_win > 0:
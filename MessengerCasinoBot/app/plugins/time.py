@@ -5,6 +5,7 @@ from datetime import datetime
 from PIL import Image, ImageDraw
 from base_game_plugin import BaseGamePlugin
 from logger import logger
+from media_encoder import save_image
 
 class TimePlugin(BaseGamePlugin):
     def __init__(self):
@@ -261,7 +262,7 @@ class TimePlugin(BaseGamePlugin):
             win_x = center_x - win_img.width // 2
             img.alpha_composite(win_img, (win_x, win_y))
         
-        img.save(output_path, format='WEBP', quality=90, optimize=True)
+        save_image(img, output_path, "card", format="WEBP")
         return output_path
     
     def execute_game(self, command_name, args, file_queue, cache=None, sender=None, avatar_url=None):
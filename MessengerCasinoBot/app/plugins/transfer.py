@@ -1,5 +1,6 @@
 from base_game_plugin import BaseGamePlugin
 from logger import logger
+from media_encoder import save_image
 from PIL import Image, ImageDraw
 import os
 from utils import _get_unique_id
@@ -167,7 +168,7 @@ class TransferPlugin(BaseGamePlugin):
             
             timestamp = _get_unique_id()
             output_path = os.path.join(self.get_app_path("temp"), f"transfer_{timestamp}.webp")
-            composite.save(output_path, format="WEBP", quality=90, method=4)
+            save_image(composite, output_path, "card", format="WEBP")
             
             logger.info(f"Transfer image created: {output_path}")
             return output_path
@@ -350,17 +351,15 @@ class TransferPlugin(BaseGamePlugin):
             return None
 
         recipient_balance_before = recipient_data.get("balance", 0)
+        applied = []
 
         try:
-            sender_balance_new = sender_balance_before - amount
-            recipient_balance_new = recipient_balance_before + amount
-            
-            if not cache.update_user(sender_id, balance=sender_balance_new):
-                raise RuntimeError("Failed to update sender balance")
-
-            if not cache.update_user(recipient_id, balance=recipient_balance_new):
-                cache.update_user(sender_id, balance=sender_balance_before)
-                raise RuntimeError("Failed to update recipient balance")
+            sender_balance_new = cache.update_balance(sender_id, -amount)
+            applied.append((sender_id, -amount))
+            recipient_balance_new = cache.update_balance(recipient_id, amount)
+            applied.append((recipient_id, amount))
+            sender_balance_before = sender_balance_new + amount
+            recipient_balance_before = recipient_balance_new - amount
 
             transfer_image_path = self._create_transfer_image(
                 sender_id=sender_id,
@@ -397,8 +396,8 @@ class TransferPlugin(BaseGamePlugin):
         except Exception as e:
             logger.error("[Transfer] Transfer failed", exc_info=True)
             try:
-                cache.update_user(sender_id, balance=sender_balance_before)
-                cache.update_user(recipient_id, balance=recipient_balance_before)
+                for user_id, delta in applied:
+                    cache.update_balance(user_id, -delta)
             except Exception:
                 pass
 
@@ -422,26 +421,7 @@ class TransferPlugin(BaseGamePlugin):
         if search_name.startswith('@'):
             search_name = search_name[1:].strip()
             
-        exact_matches = []
-        partial_matches = []
-        name_lower = search_name.lower().strip()
-        
-        for user_id, user_data in cache.users.items():
-            if not isinstance(user_data, dict):
-                continue
-                
-            user_name = user_data.get('name', '')
-            if not user_name:
-                continue
-                
-            user_name_lower = user_name.lower()
-            
-            if user_name_lower == name_lower:
-                exact_matches.append((user_id, user_data))
-            elif user_name_lower.startswith(name_lower):
-                partial_matches.append((user_id, user_data))
-        
-        return exact_matches + partial_matches
+        return cache.find_users_by_name_prefix(search_name.strip())
     
     def _format_multiple_recipients_error(self, recipients, searched_name):
         if not recipients:
@@ -485,5 +465,6 @@ def register():
             "- /transfer 100 @John  (ignores @ symbol)\n\n"
             "Creates a visual representation of the transfer with avatars!"
         ),
-        "execute": plugin.execute_game
+        "execute": plugin.execute_game,
+        "exclusive": True
     }
\ No newline at end of file
@@ -4,6 +4,7 @@ import time
 from PIL import Image, ImageDraw
 from base_game_plugin import BaseGamePlugin
 from logger import logger
+from media_encoder import save_image
 
 class TreeGame:
     
@@ -529,7 +530,7 @@ class TreeTableGenerator:
                 else:
                     logger.error(f"[Tree] Plant image not found: {plant_filename}")
         
-        table_img.save(output_path, format='PNG')
+        save_image(table_img, output_path, "intermediate", format="PNG")
 
 class TreePlugin(BaseGamePlugin):
     
@@ -590,7 +591,7 @@ class TreePlugin(BaseGamePlugin):
             
             resized_img = padded_img.resize((800, 550), Image.Resampling.LANCZOS)
             
-            resized_img.save(img_path)
+            save_image(resized_img, img_path, "intermediate")
         
         current_balance = user["balance"] if user else 0
         overlay_path, error = self.apply_user_overlay(
@@ -798,9 +799,7 @@ class TreePlugin(BaseGamePlugin):
             planted_count += 1
             results.append(f"Planted x{TreeGame.TREES[tree_id]['multiplier']} in slot {slot_num}")
         
-        new_balance = user["balance"] - total_cost
-        self.update_user_balance(user_id, new_balance)
-        user["balance"] = new_balance
+        self.cache.update_balance(user_id, -total_cost)
         self.save_game_state(user_id)
         
         result_msg = "\n".join(results)
@@ -840,16 +839,12 @@ class TreePlugin(BaseGamePlugin):
                 results.append(f"Slot {slot+1}: {message}")
         
         if total_win > 0:
-            new_balance = user["balance"] + total_win
-            self.update_user_balance(user_id, new_balance)
-            user["balance"] = new_balance
+            self.cache.update_balance(user_id, total_win)
         
         if total_loss < 0:
-            new_level, new_progress = self.cache.add_experience(
+            self.cache.add_experience(
                 user_id, total_loss, sender, file_queue
             )
-            user["level"] = new_level
-            user["level_progress"] = new_progress
         
         self.save_game_state(user_id)
         
@@ -936,16 +931,12 @@ class TreePlugin(BaseGamePlugin):
             else:
                 plant_results.append(f"Slot {slot_index+1}: ❌ Failed to plant: {result}")
         
-        new_balance = user["balance"] - total_cost + total_win
-        self.update_user_balance(user_id, new_balance)
-        user["balance"] = new_balance
+        self.cache.update_balance(user_id, total_win - total_cost)
         
         if total_loss > 0:
-            new_level, new_progress = self.cache.add_experience(
+            self.cache.add_experience(
                 user_id, total_loss, sender, file_queue
             )
-            user["level"] = new_level
-            user["level_progress"] = new_progress
         
         self.save_game_state(user_id)
         
@@ -1159,9 +1150,7 @@ class TreePlugin(BaseGamePlugin):
                     return ""
                 
                 game.unlock_slot(slot)
-                new_balance = user["balance"] - cost
-                self.update_user_balance(user_id, new_balance)
-                user["balance"] = new_balance
+                self.cache.update_balance(user_id, -cost)
                 self.save_game_state(user_id)
                 
                 self.send_message_image(sender, file_queue,
@@ -5,6 +5,7 @@ import os
 from PIL import Image, ImageDraw
 
 from base_game_plugin import BaseGamePlugin
+from media_encoder import save_image
 from utils import _get_unique_id
 
 
@@ -282,10 +283,9 @@ class WeeklyQuestManager:
             if progress.get(base, 0) < target:
                 return False, "Complete all weekly tasks first"
 
-        balance = user.get("balance", 0) + self.REWARD
         weekly["claimed"] = True
-        user["weekly_quests"] = weekly
-        cache.update_user(user_id, balance=balance, weekly_quests=weekly)
+        cache.update_user(user_id, weekly_quests=weekly)
+        cache.update_balance(user_id, self.REWARD)
         return True, self.REWARD
 
     def rotate_one_quest(self, cache, user_id, slot_index=None):
@@ -708,7 +708,7 @@ class WeeklyPlugin(BaseGamePlugin):
                     canvas.alpha_composite(subline_img, ((IMAGE_WIDTH - subline_img.width) // 2, cur_y))
 
             output_path = os.path.join(output_folder, f"weekly_{username}_{_get_unique_id()}.png")
-            canvas.convert("RGB").save(output_path, "PNG", quality=95)
+            save_image(canvas.convert("RGB"), output_path, "card", format="PNG")
             return output_path
         except Exception:
             return None
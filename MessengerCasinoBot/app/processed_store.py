@@ -0,0 +1,100 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from logger import logger
+
+class ProcessedMessageStore:
+
+    def __init__(self, store_file="processed_messages.json", max_size=5000, save_interval=5):
+        self.store_file = store_file
+        self.max_size = max_size
+        self.save_interval = save_interval
+        self.ids = OrderedDict()
+        self.cursor = None
+        self.lock = threading.RLock()
+        self.dirty = False
+        self.last_save = 0
+        self.stats = {'added': 0, 'evictions': 0, 'saves': 0}
+
+    def __contains__(self, message_id):
+        with self.lock:
+            return message_id in self.ids
+
+    def __len__(self):
+        with self.lock:
+            return len(self.ids)
+
+    def add(self, message_id):
+        if not message_id:
+            return
+        with self.lock:
+            if message_id in self.ids:
+                self.ids.move_to_end(message_id)
+                return
+            self.ids[message_id] = None
+            self.stats['added'] += 1
+            self.dirty = True
+            while len(self.ids) > self.max_size:
+                self.ids.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def set_cursor(self, message_id):
+        with self.lock:
+            if message_id and message_id != self.cursor:
+                self.cursor = message_id
+                self.dirty = True
+
+    def load(self):
+        if not os.path.exists(self.store_file):
+            logger.info(f"[ProcessedStore] No store file found at {self.store_file}")
+            return False
+
+        try:
+            with open(self.store_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+
+            with self.lock:
+                self.ids = OrderedDict((message_id, None) for message_id in data.get("ids", [])[-self.max_size:])
+                self.cursor = data.get("cursor")
+                self.dirty = False
+
+            logger.info(f"[ProcessedStore] Loaded {len(self.ids)} processed IDs, cursor={self.cursor}")
+            return True
+        except Exception as e:
+            logger.error(f"[ProcessedStore] Store load error: {e}", exc_info=True)
+            return False
+
+    def save(self, force=False):
+        with self.lock:
+            if not self.dirty:
+                return False
+            if not force and time.time() - self.last_save < self.save_interval:
+                return False
+            data = {"cursor": self.cursor, "ids": list(self.ids.keys())}
+            self.dirty = False
+            self.last_save = time.time()
+
+        tmp_file = f"{self.store_file}.tmp"
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_file, self.store_file)
+            with self.lock:
+                self.stats['saves'] += 1
+            return True
+        except Exception as e:
+            with self.lock:
+                self.dirty = True
+            logger.error(f"[ProcessedStore] Store save error: {e}", exc_info=True)
+            return False
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                'items': len(self.ids),
+                'max_size': self.max_size,
+                'cursor': self.cursor,
+                **self.stats
+            }
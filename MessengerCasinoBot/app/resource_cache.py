@@ -1,9 +1,16 @@
 import os
-from PIL import Image
+import time
+import hashlib
+from PIL import Image, ImageSequence
 from collections import OrderedDict
 import threading
 from logger import logger
 
+RENDER_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "temp", "render_cache")
+RENDER_CACHE_MAX_ENTRIES = 300
+RENDER_CACHE_TTL_SECONDS = 6 * 3600
+RENDER_CACHE_PIN_SECONDS = 1800
+
 class ResourceCache:
     
     def __init__(self, max_size_mb=100):
@@ -84,4 +91,284 @@ class ResourceCache:
                 'items': len(self.cache),
                 'hit_rate': self.stats['hits'] / max(1, self.stats['hits'] + self.stats['misses']),
                 **self.stats
-            }
\ No newline at end of file
+            }
+
+class FrameCache:
+
+    def __init__(self, max_size_mb=256):
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.cache = OrderedDict()
+        self.current_size = 0
+        self.lock = threading.RLock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'uncacheable': 0}
+
+    def _get_frames_size(self, frames):
+        return sum(frame.width * frame.height * len(frame.getbands()) for frame in frames)
+
+    def _decode_frames(self, path):
+        frames = []
+        with Image.open(path) as img:
+            if getattr(img, 'n_frames', 1) > 1:
+                for frame in ImageSequence.Iterator(img):
+                    frames.append(frame.copy().convert("RGBA"))
+            else:
+                frames.append(img.copy().convert("RGBA"))
+        return frames
+
+    def get_frames(self, path):
+        if not os.path.exists(path):
+            return []
+
+        key = (os.path.abspath(path), os.stat(path).st_mtime)
+
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                self.stats['hits'] += 1
+                return list(self.cache[key][0])
+
+        try:
+            frames = self._decode_frames(path)
+        except Exception as e:
+            logger.error(f"[FrameCache] Error decoding animation {path}: {e}")
+            return []
+
+        frames_size = self._get_frames_size(frames)
+
+        with self.lock:
+            self.stats['misses'] += 1
+
+            if frames_size > self.max_size_bytes * 0.5:
+                self.stats['uncacheable'] += 1
+                return frames
+
+            if key not in self.cache:
+                while self.current_size + frames_size > self.max_size_bytes and self.cache:
+                    self._evict_oldest()
+
+                self.cache[key] = (frames, frames_size)
+                self.current_size += frames_size
+
+        return list(frames)
+
+    def preload(self, paths):
+        loaded = 0
+        for path in paths:
+            if self.get_frames(path):
+                loaded += 1
+        logger.info(f"[FrameCache] Preloaded {loaded} animations, {self.current_size / (1024 * 1024):.1f} MB")
+        return loaded
+
+    def _evict_oldest(self):
+        if self.cache:
+            key, (frames, frames_size) = self.cache.popitem(last=False)
+            self.current_size -= frames_size
+            self.stats['evictions'] += 1
+
+    def clear(self):
+        with self.lock:
+            self.cache.clear()
+            self.current_size = 0
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                'size_mb': self.current_size / (1024 * 1024),
+                'bytes': self.current_size,
+                'items': len(self.cache),
+                'hit_rate': self.stats['hits'] / max(1, self.stats['hits'] + self.stats['misses']),
+                **self.stats
+            }
+
+class RenderCache:
+
+    _instance = None
+
+    def __init__(self, cache_dir=RENDER_CACHE_DIR, max_entries=RENDER_CACHE_MAX_ENTRIES, ttl_seconds=RENDER_CACHE_TTL_SECONDS):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.cache = OrderedDict()
+        self.pinned = {}
+        self.retired = set()
+        self.lock = threading.RLock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expired': 0, 'render_errors': 0, 'deferred_deletes': 0}
+        self._load_index()
+
+    def _load_index(self):
+        if not os.path.isdir(self.cache_dir):
+            return
+
+        entries = []
+        for file_name in os.listdir(self.cache_dir):
+            file_path = os.path.join(self.cache_dir, file_name)
+            if ".tmp" in file_name or not os.path.isfile(file_path):
+                continue
+            entries.append((os.path.getmtime(file_path), os.path.splitext(file_name)[0], file_path))
+
+        with self.lock:
+            for created, key, file_path in sorted(entries):
+                self.cache[key] = (file_path, created)
+            while len(self.cache) > self.max_entries:
+                self._evict_oldest()
+
+        if entries:
+            logger.info(f"[RenderCache] Indexed {len(self.cache)} cached files from {self.cache_dir}")
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def make_key(self, kind, *parts, files=()):
+        digest = hashlib.sha256(kind.encode("utf-8"))
+        for part in parts:
+            digest.update(b"\0")
+            digest.update(repr(part).encode("utf-8"))
+        for path in files:
+            digest.update(b"\0")
+            if path and os.path.exists(path):
+                file_stat = os.stat(path)
+                digest.update(f"{os.path.abspath(path)}:{file_stat.st_mtime_ns}:{file_stat.st_size}".encode("utf-8"))
+            else:
+                digest.update(repr(path).encode("utf-8"))
+        return f"{kind}_{digest.hexdigest()[:32]}"
+
+    def get(self, key):
+        with self.lock:
+            entry = self.cache.get(key)
+            if entry:
+                path, created = entry
+                if time.time() - created <= self.ttl_seconds and os.path.exists(path):
+                    self.cache.move_to_end(key)
+                    self.stats['hits'] += 1
+                    self._pin(path)
+                    return path
+                self._remove(key)
+                self.stats['expired'] += 1
+            self.stats['misses'] += 1
+            return None
+
+    def get_or_render(self, key, extension, render_func):
+        path = self.get(key)
+        if path:
+            return path
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        output_path = os.path.join(self.cache_dir, f"{key}{extension}")
+        tmp_path = os.path.join(self.cache_dir, f"{key}.{threading.get_ident()}.tmp{extension}")
+
+        try:
+            render_func(tmp_path)
+            os.replace(tmp_path, output_path)
+        except Exception:
+            with self.lock:
+                self.stats['render_errors'] += 1
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with self.lock:
+            self.cache[key] = (output_path, time.time())
+            self.cache.move_to_end(key)
+            self.retired.discard(output_path)
+            self._pin(output_path)
+            while len(self.cache) > self.max_entries:
+                self._evict_oldest()
+
+        return output_path
+
+    def _pin(self, path):
+        count, expires = self.pinned.get(path, (0, 0))
+        self.pinned[path] = (count + 1, max(expires, time.time() + RENDER_CACHE_PIN_SECONDS))
+
+    def _is_pinned(self, path):
+        pin = self.pinned.get(path)
+        if pin and pin[1] < time.time():
+            del self.pinned[path]
+            return False
+        return pin is not None
+
+    def release(self, path):
+        with self.lock:
+            pin = self.pinned.get(path)
+            if not pin:
+                return
+            if pin[0] > 1:
+                self.pinned[path] = (pin[0] - 1, pin[1])
+                return
+            del self.pinned[path]
+            if path in self.retired:
+                self.retired.discard(path)
+                self._delete(path)
+
+    def _remove(self, key):
+        path, created = self.cache.pop(key)
+        if self._is_pinned(path):
+            self.retired.add(path)
+            self.stats['deferred_deletes'] += 1
+            return
+        self._delete(path)
+
+    def _delete(self, path):
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except OSError as e:
+            logger.debug(f"[RenderCache] Could not delete {path}: {e}")
+
+    def _evict_oldest(self):
+        if self.cache:
+            self._remove(next(iter(self.cache)))
+            self.stats['evictions'] += 1
+
+    def cleanup(self):
+        removed = 0
+        now = time.time()
+
+        with self.lock:
+            for key, (path, created) in list(self.cache.items()):
+                if now - created > self.ttl_seconds:
+                    self._remove(key)
+                    self.stats['expired'] += 1
+                    removed += 1
+
+            for path in list(self.retired):
+                if not self._is_pinned(path):
+                    self.retired.discard(path)
+                    self._delete(path)
+                    removed += 1
+
+            known_paths = {path for path, created in self.cache.values()} | self.retired
+
+        if os.path.isdir(self.cache_dir):
+            for file_name in os.listdir(self.cache_dir):
+                file_path = os.path.join(self.cache_dir, file_name)
+                if file_path in known_paths or not os.path.isfile(file_path):
+                    continue
+                if now - os.path.getmtime(file_path) < 60:
+                    continue
+                try:
+                    os.remove(file_path)
+                    removed += 1
+                except OSError as e:
+                    logger.debug(f"[RenderCache] Could not delete {file_path}: {e}")
+
+        return removed
+
+    def clear(self):
+        with self.lock:
+            while self.cache:
+                self._remove(next(iter(self.cache)))
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                'items': len(self.cache),
+                'max_entries': self.max_entries,
+                'pinned': len(self.pinned),
+                'retired': len(self.retired),
+                'hit_rate': self.stats['hits'] / max(1, self.stats['hits'] + self.stats['misses']),
+                **self.stats
+            }
@@ -0,0 +1,177 @@
+import heapq
+import itertools
+import os
+import threading
+import time
+from queue import Empty
+from logger import logger
+from resource_cache import RenderCache
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BROADCAST = "broadcast"
+PRIORITY_COSMETIC = "cosmetic"
+
+SEND_CLASSES = {
+    PRIORITY_INTERACTIVE: {'rank': 0, 'ttl': 600},
+    PRIORITY_BROADCAST: {'rank': 1, 'ttl': 1800},
+    PRIORITY_COSMETIC: {'rank': 2, 'ttl': 300},
+}
+SHUTDOWN_RANK = 99
+
+
+class SendChannel:
+
+    def __init__(self, send_queue, priority):
+        self.send_queue = send_queue
+        self.priority = priority
+
+    def put(self, item, block=True, timeout=None, ttl=None):
+        return self.send_queue.put(item, block, timeout, priority=self.priority, ttl=ttl)
+
+    def __getattr__(self, name):
+        return getattr(self.send_queue, name)
+
+
+def with_priority(file_queue, priority):
+    if hasattr(file_queue, "channel"):
+        return file_queue.channel(priority)
+    return file_queue
+
+
+class SendQueue:
+
+    def __init__(self):
+        self.mutex = threading.Lock()
+        self.not_empty = threading.Condition(self.mutex)
+        self.all_tasks_done = threading.Condition(self.mutex)
+        self.unfinished_tasks = 0
+        self.heap = []
+        self.pending_keys = {}
+        self.counter = itertools.count()
+        self.stats = {
+            name: {'enqueued': 0, 'dequeued': 0, 'deduplicated': 0, 'dropped_stale': 0, 'total_wait_ms': 0.0, 'max_wait_ms': 0.0}
+            for name in SEND_CLASSES
+        }
+
+    def channel(self, priority):
+        return SendChannel(self, priority)
+
+    def _dedup_key(self, item):
+        return os.path.realpath(item)
+
+    def _release(self, item):
+        RenderCache.get_instance().release(item)
+
+    def put(self, item, block=True, timeout=None, priority=PRIORITY_INTERACTIVE, ttl=None):
+        now = time.perf_counter()
+
+        if item is None:
+            entry = (SHUTDOWN_RANK, next(self.counter), None, None, now, None, None)
+        else:
+            if priority not in SEND_CLASSES:
+                logger.warning(f"[SendQueue] Unknown priority '{priority}', using {PRIORITY_INTERACTIVE}")
+                priority = PRIORITY_INTERACTIVE
+            send_class = SEND_CLASSES[priority]
+            ttl = send_class['ttl'] if ttl is None else ttl
+            key = self._dedup_key(item)
+            entry = (send_class['rank'], next(self.counter), item, priority, now, now + ttl if ttl else None, key)
+
+        with self.not_empty:
+            queued = self.pending_keys.get(key) if item is not None else None
+            if queued is None:
+                if item is not None:
+                    self.pending_keys[key] = item
+                    self.stats[priority]['enqueued'] += 1
+
+                heapq.heappush(self.heap, entry)
+                self.unfinished_tasks += 1
+                self.not_empty.notify()
+                return True
+
+            self.stats[priority]['deduplicated'] += 1
+
+        logger.info(f"[SendQueue] Skipping duplicate {os.path.basename(item)}, already queued as {os.path.basename(queued)}")
+        self._release(item)
+        return False
+
+    def _finish_locked(self):
+        self.unfinished_tasks -= 1
+        if self.unfinished_tasks <= 0:
+            self.all_tasks_done.notify_all()
+
+    def get_timed(self, block=True, timeout=None):
+        with self.not_empty:
+            end_time = None if timeout is None else time.perf_counter() + timeout
+
+            while True:
+                while not self.heap:
+                    if not block:
+                        raise Empty
+                    if end_time is None:
+                        self.not_empty.wait()
+                    else:
+                        remaining = end_time - time.perf_counter()
+                        if remaining <= 0:
+                            raise Empty
+                        self.not_empty.wait(remaining)
+
+                rank, _, item, priority, queued_at, deadline, key = heapq.heappop(self.heap)
+                now = time.perf_counter()
+                wait_ms = round((now - queued_at) * 1000, 1)
+
+                if item is None:
+                    return None, wait_ms
+
+                self.pending_keys.pop(key, None)
+                stats = self.stats[priority]
+
+                if deadline is not None and now > deadline:
+                    stats['dropped_stale'] += 1
+                    self._finish_locked()
+                    self._release(item)
+                    logger.warning(f"[SendQueue] Dropping stale {priority} item after {wait_ms} ms: {os.path.basename(item)}")
+                    continue
+
+                stats['dequeued'] += 1
+                stats['total_wait_ms'] += wait_ms
+                stats['max_wait_ms'] = max(stats['max_wait_ms'], wait_ms)
+                return item, wait_ms
+
+    def get(self, block=True, timeout=None):
+        return self.get_timed(block, timeout)[0]
+
+    def task_done(self):
+        with self.all_tasks_done:
+            if self.unfinished_tasks <= 0:
+                raise ValueError("task_done() called too many times")
+            self._finish_locked()
+
+    def join(self):
+        with self.all_tasks_done:
+            while self.unfinished_tasks:
+                self.all_tasks_done.wait()
+
+    def qsize(self):
+        with self.mutex:
+            return len(self.heap)
+
+    def empty(self):
+        return self.qsize() == 0
+
+    def get_stats(self):
+        now = time.perf_counter()
+        with self.mutex:
+            classes = {
+                name: {'depth': 0, 'oldest_age_ms': 0.0, **stats}
+                for name, stats in self.stats.items()
+            }
+            for _, _, item, priority, queued_at, _, _ in self.heap:
+                if item is None:
+                    continue
+                class_stats = classes[priority]
+                class_stats['depth'] += 1
+                class_stats['oldest_age_ms'] = max(class_stats['oldest_age_ms'], round((now - queued_at) * 1000, 1))
+
+        for class_stats in classes.values():
+            class_stats['avg_wait_ms'] = round(class_stats['total_wait_ms'] / max(1, class_stats['dequeued']), 1)
+        return classes
@@ -0,0 +1,114 @@
+import json
+import os
+import shutil
+import threading
+import time
+from logger import logger
+
+class ShardStore:
+
+    def __init__(self, root_dir="cache_backup_shards"):
+        self.root_dir = root_dir
+        self.users_dir = os.path.join(root_dir, "users")
+        self.manifest_file = os.path.join(root_dir, "manifest.json")
+        self.globals_file = os.path.join(root_dir, "globals.json")
+        self.lock = threading.Lock()
+        self.stats = {'flushes': 0, 'shards_written': 0, 'shards_removed': 0, 'bytes_written': 0, 'last_flush_shards': 0}
+
+    def exists(self):
+        return os.path.exists(self.manifest_file)
+
+    def _shard_path(self, user_id):
+        return os.path.join(self.users_dir, f"{user_id}.json")
+
+    def _write_atomic(self, path, data):
+        tmp_file = f"{path}.tmp"
+        payload = json.dumps(data, ensure_ascii=False, indent=2)
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+        return len(payload)
+
+    def load(self):
+        with open(self.manifest_file, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        data = {"users": {}, "games": {}, "journal_seq": manifest.get("journal_seq", 0)}
+
+        if os.path.exists(self.globals_file):
+            with open(self.globals_file, "r", encoding="utf-8") as f:
+                data.update(json.load(f))
+
+        if os.path.isdir(self.users_dir):
+            for file_name in os.listdir(self.users_dir):
+                if not file_name.endswith(".json"):
+                    continue
+                user_id = file_name[:-5]
+                try:
+                    with open(os.path.join(self.users_dir, file_name), "r", encoding="utf-8") as f:
+                        shard = json.load(f)
+                except Exception as e:
+                    logger.critical(f"[ShardStore] Could not read shard {file_name}: {e}")
+                    continue
+                if shard.get("user") is not None:
+                    data["users"][user_id] = shard["user"]
+                if shard.get("games"):
+                    data["games"][user_id] = shard["games"]
+
+        return data
+
+    def flush(self, user_shards, globals_data, journal_seq):
+        with self.lock:
+            os.makedirs(self.users_dir, exist_ok=True)
+            written = 0
+
+            for user_id, shard in user_shards.items():
+                path = self._shard_path(user_id)
+                if shard.get("user") is None and not shard.get("games"):
+                    if os.path.exists(path):
+                        os.remove(path)
+                        self.stats['shards_removed'] += 1
+                    continue
+                self.stats['bytes_written'] += self._write_atomic(path, shard)
+                written += 1
+
+            if globals_data is not None:
+                self.stats['bytes_written'] += self._write_atomic(self.globals_file, globals_data)
+                written += 1
+
+            self._write_atomic(self.manifest_file, {"journal_seq": journal_seq, "saved_at": time.time()})
+
+            self.stats['flushes'] += 1
+            self.stats['shards_written'] += written
+            self.stats['last_flush_shards'] = written
+            return written
+
+    def link_to(self, target_dir):
+        with self.lock:
+            tmp_dir = f"{target_dir}.tmp"
+            if os.path.exists(tmp_dir):
+                shutil.rmtree(tmp_dir)
+            os.makedirs(tmp_dir)
+
+            for root, dirs, files in os.walk(self.root_dir):
+                relative_root = os.path.relpath(root, self.root_dir)
+                os.makedirs(os.path.join(tmp_dir, relative_root), exist_ok=True)
+                for file_name in files:
+                    if file_name.endswith(".tmp"):
+                        continue
+                    source = os.path.join(root, file_name)
+                    target = os.path.join(tmp_dir, relative_root, file_name)
+                    try:
+                        os.link(source, target)
+                    except OSError:
+                        shutil.copy2(source, target)
+
+            if os.path.exists(target_dir):
+                shutil.rmtree(target_dir)
+            os.replace(tmp_dir, target_dir)
+
+    def get_stats(self):
+        with self.lock:
+            return {'root_dir': self.root_dir, **self.stats}
@@ -0,0 +1,228 @@
+import json
+import marshal
+import os
+import sqlite3
+import sys
+import threading
+import time
+from logger import logger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (id TEXT PRIMARY KEY, data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS game_states (user_id TEXT NOT NULL, game_name TEXT NOT NULL, data TEXT NOT NULL, PRIMARY KEY (user_id, game_name));
+CREATE TABLE IF NOT EXISTS market_items (position INTEGER PRIMARY KEY, data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS auctions (position INTEGER PRIMARY KEY, data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, data TEXT NOT NULL);
+"""
+
+class SqliteCacheStore:
+
+    def __init__(self, db_file="cache_backup.db"):
+        self.db_file = db_file
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(db_file, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=FULL")
+        self.conn.executescript(SCHEMA)
+        self.queue = []
+        self.queue_lock = threading.Lock()
+        self.stats = {'writes': 0, 'commits': 0, 'errors': 0, 'backups': 0, 'write_ms': 0.0}
+
+    def is_empty(self):
+        with self.lock:
+            for table in ("users", "game_states", "market_items", "auctions", "settings"):
+                if self.conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone():
+                    return False
+            return True
+
+    def load(self):
+        with self.lock:
+            users = {row[0]: json.loads(row[1]) for row in self.conn.execute("SELECT id, data FROM users")}
+
+            games = {}
+            for user_id, game_name, data in self.conn.execute("SELECT user_id, game_name, data FROM game_states"):
+                games.setdefault(user_id, {})[game_name] = json.loads(data)
+
+            market_items = [json.loads(row[0]) for row in self.conn.execute("SELECT data FROM market_items ORDER BY position")]
+            auctions = [json.loads(row[0]) for row in self.conn.execute("SELECT data FROM auctions ORDER BY position")]
+            settings = {row[0]: json.loads(row[1]) for row in self.conn.execute("SELECT key, data FROM settings")}
+
+            row = self.conn.execute("SELECT data FROM meta WHERE key = 'active_math_challenge'").fetchone()
+            active_math_challenge = json.loads(row[0]) if row else None
+
+        return {
+            "users": users,
+            "games": games,
+            "settings": settings,
+            "market_items": market_items,
+            "auctions": auctions,
+            "active_math_challenge": active_math_challenge
+        }
+
+    def _encode(self, op, value):
+        if op == "snapshot":
+            return value
+        if op in ("market_items", "auctions"):
+            return [json.dumps(item, ensure_ascii=False) for item in value]
+        if op == "game_delete":
+            return None
+        return json.dumps(value, ensure_ascii=False)
+
+    def _replace_list(self, table, encoded_items):
+        self.conn.execute(f"DELETE FROM {table}")
+        self.conn.executemany(
+            f"INSERT INTO {table} (position, data) VALUES (?, ?)",
+            list(enumerate(encoded_items))
+        )
+
+    def _write_snapshot(self, snapshot):
+        if isinstance(snapshot, bytes):
+            snapshot = marshal.loads(snapshot)
+
+        for user_id, entry in snapshot.get("users", {}).items():
+            if entry.get("user") is not None:
+                self._write("user", user_id, entry["user"])
+            self.conn.execute("DELETE FROM game_states WHERE user_id = ?", (user_id,))
+            for game_name, game_state in (entry.get("games") or {}).items():
+                self._write("game", [user_id, game_name], game_state)
+
+        globals_data = snapshot.get("globals")
+        if globals_data:
+            for key, value in globals_data.get("settings", {}).items():
+                self._write("setting", key, value)
+            self._write("market_items", None, globals_data.get("market_items", []))
+            self._write("auctions", None, globals_data.get("auctions", []))
+            self._write("math_challenge", None, globals_data.get("active_math_challenge"))
+
+    def _write_encoded(self, op, key, data):
+        if op == "user":
+            self.conn.execute("INSERT OR REPLACE INTO users (id, data) VALUES (?, ?)", (key, data))
+        elif op == "game":
+            self.conn.execute("INSERT OR REPLACE INTO game_states (user_id, game_name, data) VALUES (?, ?, ?)", (key[0], key[1], data))
+        elif op == "game_delete":
+            self.conn.execute("DELETE FROM game_states WHERE user_id = ? AND game_name = ?", (key[0], key[1]))
+        elif op == "setting":
+            self.conn.execute("INSERT OR REPLACE INTO settings (key, data) VALUES (?, ?)", (key, data))
+        elif op == "market_items":
+            self._replace_list("market_items", data)
+        elif op == "auctions":
+            self._replace_list("auctions", data)
+        elif op == "math_challenge":
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, data) VALUES ('active_math_challenge', ?)", (data,))
+        elif op == "snapshot":
+            self._write_snapshot(data)
+        else:
+            raise ValueError(f"Unknown op: {op}")
+
+    def _write(self, op, key, value):
+        self._write_encoded(op, key, self._encode(op, value))
+
+    def append(self, op, key, value):
+        try:
+            data = self._encode(op, value)
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.critical(f"[SqliteStore] Encode error ({op}): {e}", exc_info=True)
+            return False
+
+        with self.queue_lock:
+            self.queue.append((op, key, data))
+        return True
+
+    def flush(self):
+        with self.lock:
+            with self.queue_lock:
+                writes, self.queue = self.queue, []
+            if not writes:
+                return True
+
+            start = time.perf_counter()
+            try:
+                self.conn.execute("BEGIN IMMEDIATE")
+                for op, key, data in writes:
+                    self._write_encoded(op, key, data)
+                self.conn.execute("COMMIT")
+            except Exception as e:
+                if self.conn.in_transaction:
+                    self.conn.execute("ROLLBACK")
+                self.stats['errors'] += 1
+                logger.critical(f"[SqliteStore] Write error ({len(writes)} queued writes): {e}", exc_info=True)
+                return False
+
+            self.stats['writes'] += len(writes)
+            self.stats['commits'] += 1
+            self.stats['write_ms'] += (time.perf_counter() - start) * 1000
+            return True
+
+    def import_data(self, data):
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                for table in ("users", "game_states", "market_items", "auctions", "settings", "meta"):
+                    self.conn.execute(f"DELETE FROM {table}")
+                for user_id, user_data in data.get("users", {}).items():
+                    self._write("user", str(user_id), user_data)
+                for user_id, games in data.get("games", {}).items():
+                    for game_name, game_state in games.items():
+                        self._write("game", [str(user_id), game_name], game_state)
+                for key, value in data.get("settings", {}).items():
+                    self._write("setting", key, value)
+                self._write("market_items", None, data.get("market_items", []))
+                self._write("auctions", None, data.get("auctions", []))
+                self._write("math_challenge", None, data.get("active_math_challenge"))
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+        logger.info(f"[SqliteStore] Imported {len(data.get('users', {}))} users, {len(data.get('games', {}))} game states into {self.db_file}")
+
+    def checkpoint(self):
+        with self.lock:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def backup(self, backup_path):
+        tmp_path = f"{backup_path}.tmp"
+        target = sqlite3.connect(tmp_path)
+        try:
+            with self.lock:
+                self.conn.backup(target)
+        finally:
+            target.close()
+        os.replace(tmp_path, backup_path)
+        self.stats['backups'] += 1
+
+    def close(self):
+        self.flush()
+        with self.lock:
+            self.conn.close()
+
+    def get_stats(self):
+        with self.queue_lock:
+            return {
+                'db_file': self.db_file,
+                'queued': len(self.queue),
+                'avg_write_ms': self.stats['write_ms'] / max(1, self.stats['commits']),
+                **self.stats
+            }
+
+
+def migrate_json_backup(json_file="cache_backup.json", db_file="cache_backup.db"):
+    with open(json_file, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    store = SqliteCacheStore(db_file)
+    try:
+        store.import_data(data)
+        store.checkpoint()
+    finally:
+        store.close()
+    return data
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else "cache_backup.json"
+    target = sys.argv[2] if len(sys.argv) > 2 else f"{os.path.splitext(source)[0]}.db"
+    data = migrate_json_backup(source, target)
+    print(f"Migrated {len(data.get('users', {}))} users from {source} to {target}")
@@ -1,6 +1,6 @@
-import requests
 import os
 from logger import logger
+from avatar_fetcher import AvatarFetcher
 from urllib.parse import urlparse
 from PIL import Image
 
@@ -13,19 +13,13 @@ os.makedirs(AVATARS_FOLDER, exist_ok=True)
 class UserManager:
     def __init__(self, cache):
         self.cache = cache
+        self.avatar_fetcher = AvatarFetcher.get_instance(AVATARS_FOLDER)
         self.next_user_id = self._get_next_user_id()
     
     def _get_next_user_id(self):
-        max_id = 0
-        if hasattr(self.cache, 'users'):
-            for user_id in self.cache.users.keys():
-                try:
-                    user_id_num = int(user_id)
-                    if user_id_num > max_id:
-                        max_id = user_id_num
-                except ValueError:
-                    continue
-        return max_id + 1
+        if hasattr(self.cache, 'next_user_id'):
+            return self.cache.next_user_id
+        return 1
     
     def _extract_filename_from_url(self, url):
         if not url:
@@ -35,25 +29,30 @@ class UserManager:
         return filename.lower()
     
     def download_avatar(self, avatar_url):
-        try:
-            filename = self._extract_filename_from_url(avatar_url)
-            filepath = os.path.join(AVATARS_FOLDER, filename)
-            
-            if os.path.exists(filepath):
-                return filename
-            
-            response = requests.get(avatar_url, timeout=10)
-            response.raise_for_status()
-            
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
-            
+        filename = self._extract_filename_from_url(avatar_url)
+        if not filename:
+            logger.error(f"[UserManager] Avatar URL has no file name: {avatar_url}")
+            return None
+
+        if os.path.exists(os.path.join(AVATARS_FOLDER, filename)):
+            self.avatar_fetcher.revalidate(avatar_url, filename)
             return filename
-            
-        except Exception as e:
-            logger.error(f"[UserManager] Error downloading avatar from {avatar_url}: {e}", exc_info=True)
+
+        return self.avatar_fetcher.fetch(avatar_url, filename)
+
+    def queue_avatar_download(self, avatar_url):
+        filename = self._extract_filename_from_url(avatar_url)
+        if not filename:
+            logger.error(f"[UserManager] Avatar URL has no file name: {avatar_url}")
             return None
 
+        if os.path.exists(os.path.join(AVATARS_FOLDER, filename)):
+            self.avatar_fetcher.revalidate(avatar_url, filename)
+        else:
+            self.avatar_fetcher.prefetch(avatar_url, filename)
+
+        return filename
+
     def _is_url(self, value):
         if not value:
             return False
@@ -61,19 +60,7 @@ class UserManager:
         return parsed.scheme in ("http", "https") and bool(parsed.netloc)
 
     def _remote_image_available(self, avatar_url):
-        try:
-            response = requests.get(avatar_url, timeout=5, stream=True)
-            response.raise_for_status()
-
-            content_type = response.headers.get("content-type", "").lower()
-            if content_type and not content_type.startswith("image/"):
-                logger.warning(f"[UserManager] Avatar URL is not an image: {avatar_url} ({content_type})")
-                return False
-
-            return True
-        except Exception as e:
-            logger.info(f"[UserManager] Stored avatar URL is not reachable: {avatar_url} ({e})")
-            return False
+        return self.avatar_fetcher.is_available(avatar_url, wait=0)
 
     def _local_avatar_available(self, avatar_filename):
         if not avatar_filename or avatar_filename == "TO_BE_UPDATED":
@@ -105,7 +92,7 @@ class UserManager:
     def _update_user_avatar(self, user_id, user_data, name, avatar_url):
         logger.info(f"[UserManager] Updating avatar for user '{name}' (ID: {user_id}) to {avatar_url}")
 
-        new_avatar_filename = self.download_avatar(avatar_url)
+        new_avatar_filename = self.queue_avatar_download(avatar_url)
         if not new_avatar_filename:
             return False, f"Failed to download new avatar for user {name}"
 
@@ -130,9 +117,9 @@ class UserManager:
         
         avatar_filename = self._extract_filename_from_url(avatar_url)
         
-        for user_id, user_data in self.cache.users.items():
-            if user_data.get("name") == name and user_data.get("avatar_url") == avatar_filename:
-                return user_id, user_data
+        user_id, user_data = self.cache.find_user_by_identity(name, avatar_filename)
+        if user_data:
+            return user_id, user_data
         
         logger.warning(f"[UserManager] No user found with name {name} and avatar {avatar_filename}")
         return None, None
@@ -141,25 +128,23 @@ class UserManager:
         if not self.cache:
             return []
 
-        users_with_same_name = []
+        users_with_same_name = self.cache.find_users_by_name(name)
         
-        for user_id, user_data in self.cache.users.items():
-            if user_data.get("name") == name:
-                if exclude_avatar_filename:
-                    if user_data.get("avatar_url") != exclude_avatar_filename:
-                        users_with_same_name.append((user_id, user_data))
-                else:
-                    users_with_same_name.append((user_id, user_data))
+        if exclude_avatar_filename:
+            return [
+                (user_id, user_data) for user_id, user_data in users_with_same_name
+                if user_data.get("avatar_url") != exclude_avatar_filename
+            ]
         
         return users_with_same_name
 
     def _create_new_user(self, name, avatar_url, is_admin=False):
-        avatar_filename = self.download_avatar(avatar_url)
+        avatar_filename = self.queue_avatar_download(avatar_url)
         
         if not avatar_filename:
             return False, f"Failed to download avatar for {name}"
         
-        user_id = str(self.next_user_id)
+        user_id = self.cache.allocate_user_id()
         
         self.cache.set_user(
             user_id,
@@ -175,7 +160,7 @@ class UserManager:
             is_admin=is_admin
         )
         
-        self.next_user_id += 1
+        self.next_user_id = self.cache.next_user_id
         
         logger.info(f"[UserManager] User created successfully")
         return True, "User created successfully"
@@ -190,6 +175,7 @@ class UserManager:
         try:
             existing_user_id, existing_user = self.find_user_by_name_avatar(name, avatar_url)
             if existing_user:
+                self.queue_avatar_download(avatar_url)
                 return True, "User exists"
             
             existing_users_with_same_name = self.find_users_by_name(name)
@@ -214,10 +200,23 @@ class UserManager:
                     return self._update_user_avatar(user_id, user_data, name, avatar_url)
                 else:
                     stale_avatar_users = []
+                    unknown_avatar_users = []
                     for user_id, user_data in existing_users_with_same_name:
-                        if not self._stored_avatar_available(user_data):
+                        available = self._stored_avatar_available(user_data)
+                        if available is None:
+                            unknown_avatar_users.append(user_id)
+                        elif not available:
                             stale_avatar_users.append((user_id, user_data))
 
+                    if unknown_avatar_users:
+                        unknown_ids = ", ".join(unknown_avatar_users)
+                        logger.info(
+                            f"[UserManager] Avatar check for '{name}' (IDs: {unknown_ids}) still pending; "
+                            "keeping existing users until the probe answers"
+                        )
+                        self.queue_avatar_download(avatar_url)
+                        return True, "User exists"
+
                     if len(stale_avatar_users) == 1:
                         user_id, user_data = stale_avatar_users[0]
                         logger.info(
@@ -252,13 +251,7 @@ class UserManager:
         return None
 
     def admin_set_avatar(self, name, old_avatar_filename, new_avatar_url):
-        user_id = None
-        user_data = None
-        
-        for uid, data in self.cache.users.items():
-            if data.get("name") == name and data.get("avatar_url") == old_avatar_filename:
-                user_id, user_data = uid, data
-                break
+        user_id, user_data = self.cache.find_user_by_identity(name, old_avatar_filename)
         
         if not user_data:
             logger.warning(f"[UserManager] No user found with name: {name} and avatar: {old_avatar_filename}")